@@ -17,6 +17,7 @@ from searchProblems import PositionSearchProblem
 import util
 import time
 import search
+import nearestTarget
 
 """
 IMPORTANT
@@ -58,25 +59,24 @@ search.py and searchProblems.py. (ClosestDotAgent as an example below)
 
 class ClosestDotAgent(Agent):
 
+    def initialize(self):
+        self.targetFinder = None
+
     def findPathToClosestDot(self, gameState):
         """
         Returns a path (a list of actions) to the closest dot, starting from
         gameState.
 
-        Only recompute closest food if the closest food is gone.
+        The food is tracked by a NearestTargetFinder that lives across moves, so
+        eaten food (by any pacman) only repairs the distance field around it.
         """
-        try:
-            closest_food = gameState.closest_food
-        except AttributeError:
-            closest_food = None
-        if closest_food is None or closest_food not in gameState.getFood.asList():
-            # Here are some useful elements of the startState
-            startPosition = gameState.getPacmanPosition(self.index)
-            problem = AnyFoodSearchProblem(gameState, self.index)
-            res = search.breadthFirstSearch(problem)
+        walls = gameState.getWalls()
+        if self.targetFinder is None or self.targetFinder.walls is not walls:
+            self.targetFinder = nearestTarget.NearestTargetFinder(walls, gameState.getFood().asList(), cacheDistances=True)
         else:
-            return self.closest_actions
-        return res
+            self.targetFinder.pruneTargets(gameState.getFood())
+        startPosition = gameState.getPacmanPosition(self.index)
+        return self.targetFinder.findPathToNearest(startPosition)
 
     def getAction(self, state):
         return self.findPathToClosestDot(state)[0]
@@ -112,4 +112,4 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         complete the problem definition.
         """
         x,y = state
-        return (x, y) in self.food.asList()
+        return self.food[x][y]
@@ -0,0 +1,206 @@
+# bitsetBFS.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Breadth first search over a wall grid, a whole level at a time.
+
+The maze is cut into bands of a few columns, and each band is stored as one
+Python integer with a bit per cell: cell (x,y) is bit dx * (height + 1) + y,
+where dx is x's column within the band.  Moving north or south shifts a set
+of cells by one bit and moving east or west shifts it by a column, with the
+column that falls off one band carried into the next.  The extra bit per
+column is never open, so shifts cannot wrap from the top of one column into
+the bottom of the next.  A BFS level is then, band by band,
+
+    frontier = (north | south | east | west shifts of frontier) & open & ~visited
+
+a handful of integer operations no matter how many cells are on it.  Only
+the bands the frontier touches are processed, so a narrow frontier winding
+through a big maze stays cheap.  Only reading out the distances touches cells
+one at a time.
+
+Example:
+grid = BitGrid(gameState.getWalls())
+distances = grid.distances([(1, 1)])          # indexed by x * height + y
+distances, parents = grid.search([(1, 1)])
+grid.pathTo(parents, (10, 10))                # Directions from (1,1) to (10,10)
+"""
+
+from game import Directions
+from game import Actions
+
+# Roughly how many bits each band holds
+BAND_BITS = 1024
+
+class BitGrid:
+    def __init__(self, walls):
+        self.walls = walls
+        self.width, self.height = walls.width, walls.height
+        self.stride = self.height + 1
+        self.bandWidth = max(1, BAND_BITS // self.stride)
+        self.numBands = (self.width + self.bandWidth - 1) // self.bandWidth
+        self.open = [0] * self.numBands
+        # For every band, the distance list index of every bit (-1 for padding)
+        self._indexOfBit = [[-1] * (self.bandWidth * self.stride) for band in range(self.numBands)]
+        for x in range(self.width):
+            band, dx = divmod(x, self.bandWidth)
+            for y in range(self.height):
+                self._indexOfBit[band][dx * self.stride + y] = x * self.height + y
+                if not walls[x][y]:
+                    self.open[band] |= 1 << (dx * self.stride + y)
+        self._firstColumn = (1 << self.stride) - 1
+        self._lastColumnShift = (self.bandWidth - 1) * self.stride
+
+    def maskOf(self, cells):
+        "The open cells among cells, as a dictionary from band to bit mask."
+        masks = {}
+        for x, y in cells:
+            band, dx = divmod(x, self.bandWidth)
+            bit = (1 << (dx * self.stride + y)) & self.open[band]
+            if bit: masks[band] = masks.get(band, 0) | bit
+        return masks
+
+    def cellsOf(self, masks):
+        "The (x,y) cells of the bits set in a dictionary from band to bit mask."
+        cells = []
+        for band, mask in masks.items():
+            for i in bitIndices(mask):
+                dx, y = divmod(i, self.stride)
+                cells.append((band * self.bandWidth + dx, y))
+        return cells
+
+    def moved(self, masks, band, action):
+        """
+        The cells of band entered by taking action from the cells in masks
+        (a dictionary from band to bit mask), walls included.
+        """
+        mask = masks.get(band, 0)
+        if action == Directions.NORTH: return mask << 1
+        if action == Directions.SOUTH: return mask >> 1
+        if action == Directions.EAST:
+            return (mask << self.stride) | (masks.get(band - 1, 0) >> self._lastColumnShift)
+        return (mask >> self.stride) | ((masks.get(band + 1, 0) & self._firstColumn) << self._lastColumnShift)
+
+    def levels(self, sources, maxDepth=None):
+        """
+        Returns a list with one dictionary from band to bit mask per level:
+        the cells at distance 0 (the open sources), 1, 2, ... from the
+        nearest source.
+        """
+        stride, lastColumnShift, firstColumn = self.stride, self._lastColumnShift, self._firstColumn
+        openBands, numBands = self.open, self.numBands
+        frontier = self.maskOf(sources)
+        visited = [0] * self.numBands
+        for band, mask in frontier.items():
+            visited[band] = mask
+        levels = []
+        while frontier and (maxDepth is None or len(levels) <= maxDepth):
+            levels.append(frontier)
+            if len(frontier) == 1:
+                # The common case of a narrow frontier inside a single band
+                (band, mask), = frontier.items()
+                if not (band > 0 and mask & firstColumn) and not (band + 1 < numBands and mask >> lastColumnShift):
+                    reached = ((mask << 1) | (mask >> 1) | (mask << stride) | (mask >> stride)) & openBands[band] & ~visited[band]
+                    visited[band] |= reached
+                    frontier = {band: reached} if reached else {}
+                    continue
+            # Neighboring bands only matter when the frontier reaches their edge
+            candidates = set(frontier)
+            for band, mask in frontier.items():
+                if band > 0 and mask & firstColumn: candidates.add(band - 1)
+                if band + 1 < numBands and mask >> lastColumnShift: candidates.add(band + 1)
+            nextFrontier = {}
+            for band in candidates:
+                mask = frontier.get(band, 0)
+                reached = (mask << 1) | (mask >> 1) | (mask << stride) | (mask >> stride)
+                reached |= frontier.get(band - 1, 0) >> lastColumnShift
+                reached |= (frontier.get(band + 1, 0) & firstColumn) << lastColumnShift
+                reached &= openBands[band] & ~visited[band]
+                if reached:
+                    nextFrontier[band] = reached
+                    visited[band] |= reached
+            frontier = nextFrontier
+        return levels
+
+    def distances(self, sources, maxDepth=None):
+        """
+        The maze distance from the nearest source to every cell, as a list
+        indexed by x * height + y with -1 for walls and unreached cells (the
+        same layout as landmarks.distancesFrom).
+        """
+        distances = [-1] * (self.width * self.height)
+        for depth, level in enumerate(self.levels(sources, maxDepth)):
+            for band, mask in level.items():
+                indexOfBit = self._indexOfBit[band]
+                for i in bitIndices(mask):
+                    distances[indexOfBit[i]] = depth
+        return distances
+
+    def search(self, sources, maxDepth=None):
+        """
+        Returns (distances, parents).  distances is as in distances();
+        parents[x * height + y] is the action that enters (x,y) on a shortest
+        path from a source, Directions.STOP for the sources and None for
+        cells that were not reached.  When a cell has several shortest paths,
+        the first action in the order north, south, east, west is kept, like
+        the successor order of the search problems.
+        """
+        size = self.width * self.height
+        distances, parents = [-1] * size, [None] * size
+        actions = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+        previous = None
+        for depth, level in enumerate(self.levels(sources, maxDepth)):
+            for band, mask in level.items():
+                indexOfBit = self._indexOfBit[band]
+                if previous is None:
+                    for i in bitIndices(mask):
+                        parents[indexOfBit[i]] = Directions.STOP
+                else:
+                    unclaimed = mask
+                    for action in actions:
+                        reached = self.moved(previous, band, action) & unclaimed
+                        unclaimed &= ~reached
+                        for i in bitIndices(reached):
+                            parents[indexOfBit[i]] = action
+                        if not unclaimed: break
+                for i in bitIndices(mask):
+                    distances[indexOfBit[i]] = depth
+            previous = level
+        return distances, parents
+
+    def pathTo(self, parents, cell):
+        """
+        The actions from the source to cell, following the parents returned
+        by search, or None if cell was not reached.
+        """
+        x, y = cell
+        action = parents[x * self.height + y]
+        if action is None: return None
+        actions = []
+        while action != Directions.STOP:
+            actions.append(action)
+            dx, dy = Actions.directionToVector(action)
+            x, y = int(x - dx), int(y - dy)
+            action = parents[x * self.height + y]
+        actions.reverse()
+        return actions
+
+def bitIndices(mask):
+    "The indices of the bits set in mask, lowest first."
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
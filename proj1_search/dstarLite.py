@@ -0,0 +1,209 @@
+# dstarLite.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+This file contains a DStarLitePlanner, an incremental planner (D* Lite, by
+Koenig and Likhachev) for walking to the cheapest of a set of goal cells in
+a maze, where entering a cell may cost more than 1 (e.g. near a ghost).
+
+The planner searches backward from the goals towards Pacman, and keeps its
+g and rhs tables between queries.  When Pacman moves, goals are added or
+removed (food eaten) or cell costs change (ghosts move), only the cells whose
+cost-to-goal actually changed are re-expanded, so replanning after a move is
+usually a small fraction of a fresh search.
+
+Example:
+planner = DStarLitePlanner(gameState.getWalls(), gameState.getFood().asList())
+planner.getPath(gameState.getPacmanPosition())
+planner.removeGoal((3, 4))
+planner.setCellCosts(dangerCosts(gameState))
+planner.getPath(nextPosition)
+"""
+
+import heapq
+from nearestTarget import computeNeighbors
+
+INFINITY = float('inf')
+
+class DStarLitePlanner:
+    def __init__(self, walls, goals=(), cellCosts=None):
+        """
+        walls: A Grid of the maze walls (game.py)
+        goals: The (x,y) positions Pacman may walk to
+        cellCosts: An optional dictionary from (x,y) to the cost of stepping
+                   onto that cell; cells not in it cost 1.  Costs must be >= 1.
+        """
+        self.walls = walls
+        self.goals = set()
+        self.costs = {}
+        self._neighbors = computeNeighbors(walls)
+        self._g = {}
+        self._rhs = {}
+        self._queue = [] # heap of (key, cell); stale entries are skipped
+        self._keys = {} # cell -> its current key in the queue
+        self._km = 0
+        self._start = None
+        self._expanded = 0 # Number of cells expanded by all queries
+        for goal in goals:
+            self.addGoal(goal)
+        if cellCosts:
+            self.setCellCosts(cellCosts)
+
+    def __contains__(self, position):
+        return position in self.goals
+
+    def __len__(self):
+        return len(self.goals)
+
+    def addGoal(self, goal):
+        if goal in self.goals or goal not in self._neighbors: return
+        self.goals.add(goal)
+        self._updateCell(goal)
+
+    def removeGoal(self, goal):
+        if goal not in self.goals: return
+        self.goals.discard(goal)
+        self._updateCell(goal)
+
+    def setGoals(self, goals):
+        "Adds and removes goals so the goal set equals goals."
+        goals = set(goals)
+        for goal in list(self.goals - goals):
+            self.removeGoal(goal)
+        for goal in goals - self.goals:
+            self.addGoal(goal)
+
+    def pruneGoals(self, grid):
+        "Removes the goals that are no longer marked True in grid (e.g. eaten food)."
+        for goal in [goal for goal in self.goals if not grid[goal[0]][goal[1]]]:
+            self.removeGoal(goal)
+
+    def setCellCosts(self, cellCosts):
+        """
+        Replaces the cell costs.  Only the cells whose cost actually changed
+        (and their neighbors, whose edges into them changed) are touched.
+        """
+        changed = [cell for cell in set(self.costs) | set(cellCosts)
+                   if self.costs.get(cell, 1) != cellCosts.get(cell, 1)]
+        self.costs = dict((cell, cost) for cell, cost in cellCosts.items() if cost != 1)
+        for cell in changed:
+            for neighbor, action in self._neighbors.get(cell, ()):
+                self._updateCell(neighbor)
+
+    def getDistance(self, start):
+        "The cost of the cheapest walk from start to a goal (infinity if none)."
+        self._computeShortestPath(start)
+        return self._g.get(start, INFINITY)
+
+    def getPath(self, start):
+        """
+        Returns the list of actions of the cheapest walk from start to a goal,
+        or None if no goal can be reached.
+        """
+        if self.getDistance(start) == INFINITY: return None
+        g, costs = self._g, self.costs
+        actions = []
+        cell = start
+        while cell not in self.goals:
+            best, bestStep = INFINITY, None
+            for neighbor, action in self._neighbors[cell]:
+                cost = costs.get(neighbor, 1) + g.get(neighbor, INFINITY)
+                if cost < best:
+                    best, bestStep = cost, (neighbor, action)
+            cell, action = bestStep
+            actions.append(action)
+        return actions
+
+    def _heuristic(self, a, b):
+        # Every step costs at least 1, so Manhattan distance is admissible
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _key(self, cell):
+        best = min(self._g.get(cell, INFINITY), self._rhs.get(cell, INFINITY))
+        if self._start is None:
+            return (best, best)
+        return (best + self._heuristic(self._start, cell) + self._km, best)
+
+    def _updateCell(self, cell):
+        if cell in self.goals:
+            self._rhs[cell] = 0
+        else:
+            g, costs = self._g, self.costs
+            best = INFINITY
+            for neighbor, action in self._neighbors[cell]:
+                cost = costs.get(neighbor, 1) + g.get(neighbor, INFINITY)
+                if cost < best: best = cost
+            self._rhs[cell] = best
+        if self._g.get(cell, INFINITY) != self._rhs[cell]:
+            key = self._key(cell)
+            self._keys[cell] = key
+            heapq.heappush(self._queue, (key, cell))
+        else:
+            self._keys.pop(cell, None)
+
+    def _topKey(self):
+        queue, keys = self._queue, self._keys
+        while queue:
+            key, cell = queue[0]
+            if keys.get(cell) == key: return key
+            heapq.heappop(queue)
+        return (INFINITY, INFINITY)
+
+    def _computeShortestPath(self, start):
+        if start != self._start:
+            if self._start is not None:
+                self._km += self._heuristic(self._start, start)
+            self._start = start
+        g, rhs, queue, keys = self._g, self._rhs, self._queue, self._keys
+        while True:
+            topKey = self._topKey()
+            if not (topKey < self._key(start) or rhs.get(start, INFINITY) != g.get(start, INFINITY)):
+                break
+            if topKey == (INFINITY, INFINITY): break
+            key, cell = heapq.heappop(queue)
+            newKey = self._key(cell)
+            if key < newKey:
+                keys[cell] = newKey
+                heapq.heappush(queue, (newKey, cell))
+                continue
+            del keys[cell]
+            self._expanded += 1
+            if g.get(cell, INFINITY) > rhs[cell]:
+                g[cell] = rhs[cell]
+                for neighbor, action in self._neighbors[cell]:
+                    self._updateCell(neighbor)
+            else:
+                g[cell] = INFINITY
+                self._updateCell(cell)
+                for neighbor, action in self._neighbors[cell]:
+                    self._updateCell(neighbor)
+
+def dangerCosts(gameState, radius=2, penalty=10):
+    """
+    Cell costs that make Pacman avoid the ghosts that are not scared: a cell
+    at Manhattan distance d <= radius from such a ghost costs
+    1 + penalty * (radius + 1 - d).
+    """
+    walls = gameState.getWalls()
+    costs = {}
+    for ghost in gameState.getGhostStates():
+        if ghost.scaredTimer > 0: continue
+        gx, gy = [int(round(c)) for c in ghost.getPosition()]
+        for x in range(gx - radius, gx + radius + 1):
+            for y in range(gy - radius, gy + radius + 1):
+                d = abs(x - gx) + abs(y - gy)
+                if d > radius or not (0 <= x < walls.width and 0 <= y < walls.height) or walls[x][y]:
+                    continue
+                costs[(x, y)] = max(costs.get((x, y), 1), 1 + penalty * (radius + 1 - d))
+    return costs
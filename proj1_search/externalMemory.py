@@ -0,0 +1,199 @@
+# externalMemory.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A closed set for graph search that moves to disk when it gets too big.
+
+States like FoodSearchProblem's (position, foodGrid) are large Python
+objects, and a search that closes millions of them runs out of memory long
+before it runs out of time.  A ClosedSet keeps states in an ordinary
+dictionary until they would take more than memoryLimit megabytes.  It then
+packs every state into a short fixed-size byte string and moves them to a
+DiskHashTable, an open addressing hash table in a memory-mapped temporary
+file.  From then on the operating system pages the table in and out as
+needed, so the search slows down instead of crashing.
+
+Example:
+closed = ClosedSet(problem, memoryLimit=200)
+closed[state] = cost
+if state in closed and closed[state] <= cost: ...
+closed.close()
+
+A problem can define packState(state) to return a fixed-size byte string
+for each state (FoodSearchProblem does); otherwise a 16 byte digest of the
+pickled state is used.
+"""
+
+import hashlib
+import mmap
+import pickle
+import struct
+import sys
+import tempfile
+
+class DiskHashTable:
+    """
+    A hash table from fixed-size byte string keys to float values, stored in
+    a memory-mapped temporary file.  Each slot is a used flag, the key and the
+    value; collisions are resolved by linear probing, and the table doubles
+    when it is 60% full.
+    """
+    MAX_LOAD = 0.6
+
+    def __init__(self, keySize, capacity=1 << 16, directory=None):
+        self.keySize = keySize
+        self.slotSize = 1 + keySize + 8
+        self.directory = directory
+        self.size = 0
+        self._open(capacity)
+
+    def _open(self, capacity):
+        self.capacity = capacity
+        self.file = tempfile.TemporaryFile(dir=self.directory)
+        self.file.truncate(capacity * self.slotSize)
+        self.map = mmap.mmap(self.file.fileno(), capacity * self.slotSize)
+
+    def _find(self, key):
+        "The offset of key's slot, or of the empty slot where it belongs."
+        mask = self.capacity - 1
+        slot = hash(key) & mask
+        slotSize, keySize, table = self.slotSize, self.keySize, self.map
+        while True:
+            offset = slot * slotSize
+            if not table[offset] or table[offset + 1:offset + 1 + keySize] == key:
+                return offset
+            slot = (slot + 1) & mask
+
+    def __contains__(self, key):
+        return self.map[self._find(key)] != 0
+
+    def get(self, key, default=None):
+        offset = self._find(key)
+        if not self.map[offset]: return default
+        return struct.unpack_from('d', self.map, offset + 1 + self.keySize)[0]
+
+    def __setitem__(self, key, value):
+        if len(key) != self.keySize:
+            raise ValueError('Keys must be %d bytes long, not %d' % (self.keySize, len(key)))
+        offset = self._find(key)
+        if not self.map[offset]:
+            if self.size + 1 > self.capacity * self.MAX_LOAD:
+                self._grow()
+                offset = self._find(key)
+            self.map[offset] = 1
+            self.map[offset + 1:offset + 1 + self.keySize] = key
+            self.size += 1
+        struct.pack_into('d', self.map, offset + 1 + self.keySize, value)
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        slotSize, keySize, table = self.slotSize, self.keySize, self.map
+        for offset in range(0, self.capacity * slotSize, slotSize):
+            if table[offset]:
+                yield table[offset + 1:offset + 1 + keySize], struct.unpack_from('d', table, offset + 1 + keySize)[0]
+
+    def _grow(self):
+        "Doubles the table, copying each used slot of the old file straight into the new one."
+        oldMap, oldFile, oldCapacity = self.map, self.file, self.capacity
+        self._open(oldCapacity * 2)
+        slotSize, keySize, table = self.slotSize, self.keySize, self.map
+        for offset in range(0, oldCapacity * slotSize, slotSize):
+            if oldMap[offset]:
+                newOffset = self._find(oldMap[offset + 1:offset + 1 + keySize])
+                table[newOffset:newOffset + slotSize] = oldMap[offset:offset + slotSize]
+        oldMap.close()
+        oldFile.close()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+class ClosedSet:
+    """
+    A dictionary from states to costs (for A*) or a set of states (for UCS,
+    with add) that moves to a DiskHashTable once its states would take more
+    than memoryLimit megabytes of RAM.
+    """
+    def __init__(self, problem, memoryLimit, directory=None):
+        self.packState = getattr(problem, 'packState', digestState)
+        self.memoryLimit = memoryLimit * 2 ** 20
+        self.directory = directory
+        self.states = {}
+        self.table = None
+        self.maxStates = None
+
+    def _key(self, state):
+        return self.packState(state)
+
+    def __contains__(self, state):
+        if self.table is None: return state in self.states
+        return self._key(state) in self.table
+
+    def __getitem__(self, state):
+        if self.table is None: return self.states[state]
+        cost = self.table.get(self._key(state))
+        if cost is None: raise KeyError(state)
+        return cost
+
+    def __setitem__(self, state, cost):
+        if self.table is not None:
+            self.table[self._key(state)] = cost
+            return
+        if self.maxStates is None:
+            self.maxStates = max(1, int(self.memoryLimit // (deepSizeOf(state) + 100)))
+        self.states[state] = cost
+        if len(self.states) > self.maxStates:
+            self._spill()
+
+    def add(self, state):
+        self[state] = 0
+
+    def __len__(self):
+        return len(self.states) if self.table is None else len(self.table)
+
+    def onDisk(self):
+        return self.table is not None
+
+    def _spill(self):
+        keys = [(self._key(state), cost) for state, cost in self.states.items()]
+        capacity = 1 << 16
+        while capacity * DiskHashTable.MAX_LOAD < 2 * len(keys): capacity *= 2
+        self.table = DiskHashTable(len(keys[0][0]), capacity, self.directory)
+        for key, cost in keys:
+            self.table[key] = cost
+        self.states = {}
+
+    def close(self):
+        if self.table is not None:
+            self.table.close()
+
+def digestState(state):
+    "A 16 byte digest of the pickled state, for problems without packState."
+    return hashlib.blake2b(pickle.dumps(state, 2), digest_size=16).digest()
+
+def deepSizeOf(obj, seen=None):
+    "Roughly the bytes of memory taken by obj and the objects it refers to."
+    if seen is None: seen = set()
+    if id(obj) in seen: return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum([deepSizeOf(key, seen) + deepSizeOf(value, seen) for key, value in obj.items()])
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum([deepSizeOf(item, seen) for item in obj])
+    elif hasattr(obj, '__dict__'):
+        size += deepSizeOf(obj.__dict__, seen)
+    return size
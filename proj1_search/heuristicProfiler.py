@@ -0,0 +1,194 @@
+# heuristicProfiler.py
+# --------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Measures whether a heuristic pays for itself in aStarSearch.
+
+Each heuristic of a problem type is run with aStarSearch on each layout, next
+to a run with nullHeuristic.  For every heuristic the report gives
+
+  evals     how many times the heuristic was called
+  h sec     the total time spent inside it
+  h/h*      the mean ratio of its estimate to the true remaining cost, over
+            the states on an optimal path (1.0 is a perfect heuristic)
+  saved     the nodes expanded by the nullHeuristic run minus its own
+  net sec   its wall time minus that of the nullHeuristic run; negative
+            means the heuristic made the search faster overall
+
+> python heuristicProfiler.py
+> python heuristicProfiler.py -p food -l trickySearch,tinySearch
+
+The problem types, heuristics and layouts are those of searchBenchmark.py.
+"""
+
+import sys
+import time
+import search
+import searchBenchmark
+import util
+
+class ProfiledHeuristic:
+    """
+    Wraps a heuristic and adds up the number of calls and the time they take.
+
+    profiled = ProfiledHeuristic(searchAgents.foodHeuristic)
+    search.aStarSearch(problem, heuristic=profiled)
+    profiled.calls, profiled.seconds
+    """
+    def __init__(self, heuristic):
+        self.heuristic = heuristic
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __call__(self, state, problem=None):
+        starttime = time.perf_counter()
+        value = self.heuristic(state, problem)
+        self.seconds += time.perf_counter() - starttime
+        self.calls += 1
+        return value
+
+def pathStates(problem, actions):
+    """
+    Returns the states visited by following actions from the start state and
+    the cost of each step.
+    """
+    states, costs = [problem.getStartState()], []
+    for action in actions:
+        for succ, succAction, stepCost in problem.getSuccessors(states[-1]):
+            if succAction == action:
+                states.append(succ)
+                costs.append(stepCost)
+                break
+        else:
+            raise Exception('Action %s is not legal in state %s' % (action, states[-1]))
+    return states, costs
+
+def heuristicRatio(heuristic, problem, states, costs):
+    """
+    The mean of h(s) / h*(s) over the states of an optimal path, where h*(s) is
+    the cost of the rest of the path.  The goal, where h* is 0, is left out.
+    Returns None for a path with no steps.
+    """
+    remaining = sum(costs)
+    ratios = []
+    for state, stepCost in zip(states, costs):
+        if remaining > 0:
+            ratios.append(heuristic(state, problem) / float(remaining))
+        remaining -= stepCost
+    if not ratios: return None
+    return sum(ratios) / len(ratios)
+
+def runAStar(problemName, gameState, heuristic):
+    "Returns (problem, actions, seconds) for one aStarSearch run."
+    problem = searchBenchmark.makeProblem(problemName, gameState)
+    starttime = time.time()
+    actions = search.aStarSearch(problem, heuristic=heuristic)
+    return problem, actions, time.time() - starttime
+
+def profileLayout(problemName, layoutName, heuristicNames=None, timeout=60):
+    """
+    Profiles every heuristic of problemName on one layout.  Returns a
+    dictionary with the nullHeuristic run under 'null' and one dictionary of
+    measurements per heuristic under 'heuristics'.  A run that times out or
+    raises records that in 'error'.
+    """
+    problemType, defaultHeuristics, defaultLayouts = searchBenchmark.PROBLEMS[problemName]
+    heuristicNames = [name for name in (heuristicNames or defaultHeuristics) if name != 'nullHeuristic']
+    gameState = searchBenchmark.loadGameState(layoutName)
+    report = {'layout': layoutName, 'problem': problemName, 'error': None, 'heuristics': []}
+
+    util.mutePrint()
+    try:
+        try:
+            problem, actions, seconds = util.TimeoutFunction(runAStar, timeout)(problemName, gameState, search.nullHeuristic)
+        except util.TimeoutFunctionException:
+            report['error'] = 'nullHeuristic timed out after %d seconds' % timeout
+            return report
+        # Read before pathStates, whose getSuccessors calls are counted too
+        expanded = problem._expanded
+        states, costs = pathStates(problem, actions)
+        report['null'] = {'cost': sum(costs), 'expanded': expanded, 'seconds': seconds}
+
+        for name in heuristicNames:
+            record = {'heuristic': name, 'error': None}
+            report['heuristics'].append(record)
+            try:
+                profiled = ProfiledHeuristic(searchBenchmark.lookupFunction(name))
+                problem, actions, seconds = util.TimeoutFunction(runAStar, timeout)(problemName, gameState, profiled)
+                record['cost'] = problem.getCostOfActions(actions)
+                record['expanded'] = problem._expanded
+                record['seconds'] = seconds
+                record['calls'] = profiled.calls
+                record['heuristicSeconds'] = profiled.seconds
+                # Measured on the problem the heuristic has just searched, so
+                # anything it cached in problem.heuristicInfo is reused
+                record['ratio'] = heuristicRatio(profiled.heuristic, problem, states, costs)
+                record['saved'] = report['null']['expanded'] - record['expanded']
+                record['netSeconds'] = seconds - report['null']['seconds']
+            except util.TimeoutFunctionException:
+                record['error'] = 'timeout after %d seconds' % timeout
+            except Exception as e:
+                record['error'] = '%s: %s' % (type(e).__name__, e)
+    finally:
+        util.unmutePrint()
+    return report
+
+def profileSuite(problems=None, layouts=None, timeout=60, verbose=True):
+    reports = []
+    for problemName in (problems or searchBenchmark.PROBLEMS.keys()):
+        for layoutName in (layouts or searchBenchmark.PROBLEMS[problemName][2]):
+            report = profileLayout(problemName, layoutName, timeout=timeout)
+            if verbose: printReport(report)
+            reports.append(report)
+    return reports
+
+def printReport(report):
+    print('%s / %s' % (report['layout'], report['problem']))
+    if report['error'] is not None:
+        print('  %s' % report['error'])
+        return
+    null = report['null']
+    print('  %-20s %6s %8s %9s %9s %6s %8s %9s %9s' %
+          ('heuristic', 'cost', 'expanded', 'evals', 'h sec', 'h/h*', 'saved', 'sec', 'net sec'))
+    print('  %-20s %6d %8d %9s %9s %6s %8s %9.4f %9s' %
+          ('nullHeuristic', null['cost'], null['expanded'], '-', '-', '-', '-', null['seconds'], '-'))
+    for record in report['heuristics']:
+        if record['error'] is not None:
+            print('  %-20s %s' % (record['heuristic'], record['error']))
+            continue
+        if record['cost'] != null['cost']:
+            print('  Warning: %s found a path of cost %d instead of %d' % (record['heuristic'], record['cost'], null['cost']))
+        ratio = '%6.3f' % record['ratio'] if record['ratio'] is not None else '%6s' % '-'
+        print('  %-20s %6d %8d %9d %9.4f %s %8d %9.4f %+9.4f' %
+              (record['heuristic'], record['cost'], record['expanded'], record['calls'], record['heuristicSeconds'],
+               ratio, record['saved'], record['seconds'], record['netSeconds']))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('python heuristicProfiler.py <options>')
+    parser.add_option('-p', '--problems', dest='problems', default=','.join(sorted(searchBenchmark.PROBLEMS.keys())),
+                      help='comma separated problem types [Default: %default]')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated layouts, instead of each problem\'s default layouts')
+    parser.add_option('--timeout', dest='timeout', type='int', default=60,
+                      help='seconds allowed for each run [Default: %default]')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    layouts = options.layouts.split(',') if options.layouts else None
+    profileSuite(options.problems.split(','), layouts, options.timeout)
@@ -0,0 +1,139 @@
+# junctionGraph.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Mazes compressed to a graph of junctions.
+
+Most open cells of a Pacman maze are corridor cells with exactly two open
+neighbors, and a search gains nothing by stopping at each of them.  A
+JunctionGraph keeps only the cells where something can happen -- junctions
+(three or more neighbors), dead ends, and any cells the caller pins, such as
+the start, the goal or the corners -- and joins them by edges that each stand
+for a whole corridor.  An edge remembers the cells it passes through and the
+action of every step, so a plan over the graph expands back into ordinary
+per-step Directions.
+
+Example:
+graph = getJunctionGraph(gameState.getWalls(), [start, goal])
+for target, edge in graph.edges[start]:
+    edge.actions, edge.cells
+
+Graphs are cached per maze and set of pinned cells.  JunctionPositionSearchProblem
+and JunctionCornersProblem in searchAgents.py search over them:
+
+> python pacman.py -l bigMaze -p SearchAgent -a fn=astar,prob=JunctionPositionSearchProblem,heuristic=manhattanHeuristic -z .5
+
+Every edge costs at least as much as the Manhattan distance between its ends,
+so the position heuristics stay admissible and consistent.  Breadth and depth
+first search treat every edge as one step, so their paths are no longer the
+shortest; use uniform cost search or A* for those.
+"""
+
+from game import Directions
+from game import Actions
+
+DIRECTIONS = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+
+class Edge:
+    """
+    One corridor between two nodes of a JunctionGraph.  cells are the cells
+    entered along it, ending with the target node, and actions the step taken
+    into each of them, so len(cells) == len(actions) is its length.
+    """
+    def __init__(self, cells, actions):
+        self.cells = tuple(cells)
+        self.actions = tuple(actions)
+
+    def __len__(self):
+        return len(self.actions)
+
+class JunctionGraph:
+    def __init__(self, walls, pinned=()):
+        """
+        Builds the graph of walls, keeping every cell in pinned as a node even
+        if it lies inside a corridor.
+        """
+        self.walls = walls
+        self.neighbors = {}
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                adjacent = []
+                for action in DIRECTIONS:
+                    dx, dy = Actions.directionToVector(action)
+                    nextx, nexty = int(x + dx), int(y + dy)
+                    if 0 <= nextx < walls.width and 0 <= nexty < walls.height and not walls[nextx][nexty]:
+                        adjacent.append(((nextx, nexty), action))
+                self.neighbors[(x, y)] = adjacent
+
+        self.nodes = set(cell for cell, adjacent in self.neighbors.items() if len(adjacent) != 2)
+        self.nodes.update(cell for cell in pinned if cell in self.neighbors)
+
+        # Each node's edges, one per open direction, in the order of DIRECTIONS.
+        # A corridor that leads back to the node it started from is dropped,
+        # since no shortest path uses it.
+        self.edges = {}
+        for node in self.nodes:
+            edges = []
+            for cell, action in self.neighbors[node]:
+                edge = self._walk(node, cell, action)
+                if edge.cells[-1] != node:
+                    edges.append((edge.cells[-1], edge))
+            self.edges[node] = edges
+
+    def _walk(self, node, cell, action):
+        "Follows the corridor entered from node by action until the next node."
+        cells, actions = [cell], [action]
+        previous = node
+        while cell not in self.nodes:
+            for nextCell, nextAction in self.neighbors[cell]:
+                if nextCell != previous:
+                    break
+            previous, cell = cell, nextCell
+            cells.append(cell)
+            actions.append(nextAction)
+        return Edge(cells, actions)
+
+    def __contains__(self, cell):
+        return cell in self.nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+def expandActions(actions):
+    """
+    Flattens a plan over a JunctionGraph, whose actions are tuples of
+    Directions, into one Direction per step.  Plain Directions are kept, and
+    None (no plan) stays None.
+    """
+    if actions is None: return None
+    steps = []
+    for action in actions:
+        if isinstance(action, tuple):
+            steps.extend(action)
+        else:
+            steps.append(action)
+    return steps
+
+_graphCache = {}
+
+def getJunctionGraph(walls, pinned=()):
+    """
+    Returns the JunctionGraph of these walls with these pinned cells, building
+    it only the first time they are seen together.
+    """
+    key = (walls.packBits(), tuple(sorted(set(pinned))))
+    if key not in _graphCache:
+        _graphCache[key] = JunctionGraph(walls, pinned)
+    return _graphCache[key]
@@ -0,0 +1,140 @@
+# landmarks.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Landmark (ALT) lower bounds on maze distances.
+
+A few landmark cells are picked far apart from each other, and the maze
+distance from each landmark to every cell is computed once.  By the triangle
+inequality, for any landmark L
+
+    d(s, goal) >= |d(L, goal) - d(L, s)|
+
+so the largest of these over the landmarks is an admissible and consistent
+heuristic.  Unlike the Manhattan distance it knows about the walls, which
+matters most in twisty mazes.
+
+Example:
+landmarks = getLandmarks(gameState.getWalls())
+landmarks.lowerBound((1, 1), (10, 10))
+table = landmarks.heuristicTable((1, 1))   # lower bound from every cell to (1,1)
+
+Landmark tables are cached per maze, so every problem on the same walls shares
+them.
+"""
+
+from collections import deque
+from bitsetBFS import BitGrid
+
+DEFAULT_LANDMARKS = 8
+
+class Landmarks:
+    def __init__(self, walls, numLandmarks=DEFAULT_LANDMARKS):
+        """
+        Picks numLandmarks landmarks by farthest-point selection and stores the
+        maze distance from each to every cell.
+        """
+        self.walls = walls
+        self.width, self.height = walls.width, walls.height
+        self.grid = BitGrid(walls)
+        self.cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.landmarks = []
+        self.distances = [] # One list per landmark, indexed by x * height + y; -1 if unreachable
+        self._tables = {}
+        if not self.cells: return
+
+        # Farthest-point selection: start from the cell farthest from an
+        # arbitrary one, then keep adding the cell whose nearest landmark is
+        # farthest away.  Cells no landmark reaches yet count as infinitely far,
+        # so every connected region of the maze gets a landmark.
+        first = self.grid.distances([self.cells[0]])
+        landmark = max(self.cells, key=lambda cell: first[self.index(cell)])
+        nearest = [float('inf')] * (self.width * self.height)
+        while len(self.landmarks) < min(numLandmarks, len(self.cells)):
+            distances = self.grid.distances([landmark])
+            self.landmarks.append(landmark)
+            self.distances.append(distances)
+            for i, distance in enumerate(distances):
+                if distance >= 0 and distance < nearest[i]:
+                    nearest[i] = distance
+            landmark = max(self.cells, key=lambda cell: nearest[self.index(cell)])
+            if nearest[self.index(landmark)] == 0: break
+
+    def index(self, cell):
+        return cell[0] * self.height + cell[1]
+
+    def lowerBound(self, start, goal):
+        """
+        The largest landmark lower bound on the maze distance from start to
+        goal.
+        """
+        i, j = self.index(start), self.index(goal)
+        best = 0
+        for distances in self.distances:
+            a, b = distances[i], distances[j]
+            if a < 0 or b < 0: continue
+            if abs(a - b) > best: best = abs(a - b)
+        return best
+
+    def heuristicTable(self, goal):
+        """
+        Returns a list, indexed like the distance lists, of the lower bound
+        from every cell to goal.  The whole table is computed at once, a
+        landmark at a time, and kept for later calls with the same goal.
+        """
+        if goal in self._tables:
+            return self._tables[goal]
+        j = self.index(goal)
+        table = [0] * (self.width * self.height)
+        for distances in self.distances:
+            toGoal = distances[j]
+            if toGoal < 0: continue
+            table = [max(bound, abs(toGoal - distance)) if distance >= 0 else bound
+                     for bound, distance in zip(table, distances)]
+        self._tables[goal] = table
+        return table
+
+def distancesFrom(walls, source):
+    """
+    Breadth first search from source.  Returns a list of the maze distance to
+    every cell, indexed by x * walls.height + y, with -1 for walls and cells
+    that cannot be reached.  For several searches on the same walls, a
+    bitsetBFS.BitGrid is faster.
+    """
+    width, height = walls.width, walls.height
+    distances = [-1] * (width * height)
+    distances[source[0] * height + source[1]] = 0
+    queue = deque([source])
+    while queue:
+        x, y = queue.popleft()
+        nextDistance = distances[x * height + y] + 1
+        for nextx, nexty in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= nextx < width and 0 <= nexty < height and not walls[nextx][nexty]:
+                i = nextx * height + nexty
+                if distances[i] < 0:
+                    distances[i] = nextDistance
+                    queue.append((nextx, nexty))
+    return distances
+
+_landmarkCache = {}
+
+def getLandmarks(walls, numLandmarks=DEFAULT_LANDMARKS):
+    """
+    Returns the Landmarks for these walls, computing them only the first time
+    a maze with the same walls is seen.
+    """
+    key = (walls.packBits(), numLandmarks)
+    if key not in _landmarkCache:
+        _landmarkCache[key] = Landmarks(walls, numLandmarks)
+    return _landmarkCache[key]
@@ -0,0 +1,150 @@
+# multiGoalHeuristic.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A heuristic engine for problems where Pacman must visit a set of goal cells
+(corners, food dots) in any order.
+
+The maze distance from every goal to every cell is computed once.  A set of
+remaining goals is a bitmask over the goal list.  For up to exactLimit
+remaining goals, the value is the length of the shortest walk from Pacman
+through all of them, solved by the Held-Karp subset dynamic program and
+memoized by bitmask; that is the exact remaining cost.  For more goals it
+falls back to the distance to the nearest goal plus the weight of a minimum
+spanning tree over the remaining goals.  Each tree is derived from the tree of
+a goal set with one more goal whenever the removed goal was a leaf.
+
+Example:
+engine = MultiGoalHeuristic(walls, corners)
+engine.value(position, engine.maskOf(remainingCorners))
+"""
+
+from bitsetBFS import BitGrid
+
+DEFAULT_EXACT_LIMIT = 16
+
+class MultiGoalHeuristic:
+    def __init__(self, walls, goals, exactLimit=DEFAULT_EXACT_LIMIT):
+        self.walls = walls
+        self.height = walls.height
+        self.goals = list(goals)
+        self.goalIndex = dict((goal, i) for i, goal in enumerate(self.goals))
+        self.exactLimit = exactLimit
+        # fields[i][x * height + y] is the maze distance from goal i to (x,y)
+        grid = BitGrid(walls)
+        self.fields = [grid.distances([goal]) for goal in self.goals]
+        self.pairwise = [[field[other[0] * self.height + other[1]] for other in self.goals] for field in self.fields]
+        self._tours = {} # mask -> {i: shortest walk from goal i through every goal in mask}
+        self._trees = {} # mask -> (weight, edges) of a minimum spanning tree
+
+    def maskOf(self, remainingGoals):
+        mask = 0
+        for goal in remainingGoals:
+            mask |= 1 << self.goalIndex[goal]
+        return mask
+
+    def maskOfGrid(self, grid):
+        "The mask of the goals still marked True in grid (e.g. a food Grid)."
+        mask = 0
+        for i, (x, y) in enumerate(self.goals):
+            if grid[x][y]: mask |= 1 << i
+        return mask
+
+    def value(self, position, mask):
+        """
+        A lower bound (exact for up to exactLimit goals) on the cost of
+        visiting every goal in mask starting from position.  Returns infinity
+        if some goal cannot be reached.
+        """
+        if mask == 0: return 0
+        index = position[0] * self.height + position[1]
+        members = bits(mask)
+        toGoal = {}
+        for i in members:
+            distance = self.fields[i][index]
+            if distance < 0: return float('inf')
+            toGoal[i] = distance
+        if len(members) <= self.exactLimit:
+            tours = self.tours(mask)
+            return min([toGoal[i] + tours[i] for i in members])
+        return min(toGoal.values()) + self.treeWeight(mask)
+
+    def tours(self, mask):
+        """
+        Held-Karp: the shortest walk that starts at goal i and visits every
+        goal in mask, for each i in mask.
+        """
+        if mask in self._tours:
+            return self._tours[mask]
+        members = bits(mask)
+        if len(members) == 1:
+            result = {members[0]: 0}
+        else:
+            result = {}
+            for i in members:
+                rest = self.tours(mask & ~(1 << i))
+                row = self.pairwise[i]
+                best = float('inf')
+                for j, cost in rest.items():
+                    if row[j] >= 0 and row[j] + cost < best:
+                        best = row[j] + cost
+                result[i] = best
+        self._tours[mask] = result
+        return result
+
+    def treeWeight(self, mask):
+        if mask not in self._trees:
+            self._trees[mask] = self._spanningTree(mask)
+        return self._trees[mask][0]
+
+    def _spanningTree(self, mask):
+        # If a goal set with one more goal already has a tree in which that
+        # goal is a leaf, dropping the leaf leaves a minimum spanning tree
+        for i in range(len(self.goals)):
+            if mask & (1 << i): continue
+            parent = self._trees.get(mask | (1 << i))
+            if parent is None: continue
+            weight, edges = parent
+            touching = [edge for edge in edges if i in edge]
+            if len(touching) == 1:
+                a, b = touching[0]
+                return weight - self.pairwise[a][b], [edge for edge in edges if edge is not touching[0]]
+        return self._prim(mask)
+
+    def _prim(self, mask):
+        members = bits(mask)
+        if not members: return 0, []
+        start = members[0]
+        best = dict((i, (self.pairwise[start][i], start)) for i in members[1:])
+        weight, edges = 0, []
+        while best:
+            i = min(best, key=lambda j: best[j][0] if best[j][0] >= 0 else float('inf'))
+            cost, parent = best.pop(i)
+            if cost < 0: return float('inf'), edges
+            weight += cost
+            edges.append((parent, i))
+            row = self.pairwise[i]
+            for j in best:
+                if row[j] >= 0 and (best[j][0] < 0 or row[j] < best[j][0]):
+                    best[j] = (row[j], i)
+        return weight, edges
+
+def bits(mask):
+    members = []
+    i = 0
+    while mask:
+        if mask & 1: members.append(i)
+        mask >>= 1
+        i += 1
+    return members
@@ -0,0 +1,263 @@
+# nearestTarget.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+This file contains a NearestTargetFinder object which answers "what is the
+path to the nearest target from p" queries in a maze.  Targets (usually food)
+are kept in a set, so membership tests are O(1) instead of a Grid.asList()
+scan.
+
+Example:
+finder = NearestTargetFinder(gameState.getWalls(), gameState.getFood().asList())
+finder.findPathToNearest(gameState.getPacmanPosition())
+finder.removeTarget((3, 4))
+
+Without a distance field, a query is a single breadth first search that stops
+at the first target it reaches.  Once the distance field has been built (call
+buildDistanceField, or pass cacheDistances=True), the finder remembers for
+every reachable cell the maze distance to its nearest target and which target
+that is.  Queries then walk straight down the field, and removing a target
+only re-solves the cells that were closest to that target.
+"""
+
+import heapq
+from collections import deque
+from game import Directions
+from game import Actions
+
+class NearestTargetFinder:
+    def __init__(self, walls, targets=(), cacheDistances=False):
+        """
+        walls: A Grid of the maze walls (game.py)
+        targets: The (x,y) positions to search for
+        cacheDistances: If True, build the distance field right away
+        """
+        self.walls = walls
+        self.targets = set(targets)
+        self._neighbors = computeNeighbors(walls)
+        self._distances = None # cell -> maze distance to its nearest target
+        self._owners = None # cell -> the target that distance refers to
+        self._owned = None # target -> set of cells it is nearest to
+        self._expanded = 0 # Number of cells expanded by queries and repairs
+        if cacheDistances:
+            self.buildDistanceField()
+
+    def __contains__(self, position):
+        return position in self.targets
+
+    def __len__(self):
+        return len(self.targets)
+
+    def isTarget(self, position):
+        return position in self.targets
+
+    def hasDistanceField(self):
+        return self._distances is not None
+
+    def buildDistanceField(self):
+        """
+        Computes the distance field with one breadth first search seeded from
+        every target at once.
+        """
+        distances, owners, owned = {}, {}, {}
+        queue = deque()
+        for target in self.targets:
+            distances[target] = 0
+            owners[target] = target
+            owned[target] = {target}
+            queue.append(target)
+        while queue:
+            cell = queue.popleft()
+            self._expanded += 1
+            nextDistance = distances[cell] + 1
+            owner = owners[cell]
+            for neighbor, action in self._neighbors[cell]:
+                if neighbor not in distances:
+                    distances[neighbor] = nextDistance
+                    owners[neighbor] = owner
+                    owned[owner].add(neighbor)
+                    queue.append(neighbor)
+        self._distances, self._owners, self._owned = distances, owners, owned
+
+    def clearDistanceField(self):
+        self._distances, self._owners, self._owned = None, None, None
+
+    def addTarget(self, target):
+        if target in self.targets: return
+        self.targets.add(target)
+        if self._distances is None: return
+
+        # Spread out from the new target for as long as it is closer than the
+        # target each cell currently refers to
+        distances, owners, owned = self._distances, self._owners, self._owned
+        owned[target] = set()
+        queue = deque([(target, 0)])
+        while queue:
+            cell, distance = queue.popleft()
+            if distance >= distances.get(cell, float('inf')) and cell != target:
+                continue
+            if cell in owners:
+                owned[owners[cell]].discard(cell)
+            distances[cell] = distance
+            owners[cell] = target
+            owned[target].add(cell)
+            self._expanded += 1
+            for neighbor, action in self._neighbors[cell]:
+                if distance + 1 < distances.get(neighbor, float('inf')):
+                    queue.append((neighbor, distance + 1))
+
+    def removeTarget(self, target):
+        if target not in self.targets: return
+        self.targets.remove(target)
+        if self._distances is None: return
+
+        # Only the cells that were closest to the removed target can change.
+        # Every other cell still refers to a live target, so its distance is
+        # still exact and can seed the repair of the region.
+        distances, owners, owned = self._distances, self._owners, self._owned
+        region = owned.pop(target)
+        for cell in region:
+            del distances[cell]
+            del owners[cell]
+        fringe = []
+        for cell in region:
+            for neighbor, action in self._neighbors[cell]:
+                if neighbor in distances:
+                    heapq.heappush(fringe, (distances[neighbor] + 1, cell, owners[neighbor]))
+        while fringe:
+            distance, cell, owner = heapq.heappop(fringe)
+            if cell in distances: continue
+            distances[cell] = distance
+            owners[cell] = owner
+            owned[owner].add(cell)
+            self._expanded += 1
+            for neighbor, action in self._neighbors[cell]:
+                if neighbor not in distances:
+                    heapq.heappush(fringe, (distance + 1, neighbor, owner))
+
+    def setTargets(self, targets):
+        """
+        Replaces the target set, repairing the distance field (if any) one
+        removed or added target at a time, or rebuilding it when most of the
+        targets changed.
+        """
+        targets = set(targets)
+        removed, added = self.targets - targets, targets - self.targets
+        if self._distances is not None and len(removed) + len(added) > len(targets) // 2:
+            # Too much has changed for repairs to beat a fresh field
+            self.targets = targets
+            self.buildDistanceField()
+            return
+        for target in removed:
+            self.removeTarget(target)
+        for target in added:
+            self.addTarget(target)
+
+    def pruneTargets(self, grid):
+        """
+        Removes every target that is no longer marked True in grid (e.g. the
+        current food Grid).  This only looks at the remaining targets, not at
+        the whole grid.
+        """
+        for x, y in [target for target in self.targets if not grid[x][y]]:
+            self.removeTarget((x, y))
+
+    def getDistance(self, start):
+        """
+        Returns the maze distance from start to the nearest target, or None if
+        no target can be reached.
+        """
+        if self._distances is not None:
+            return self._distances.get(start)
+        path = self._search(start)
+        if path is None: return None
+        return len(path[0])
+
+    def getNearestTarget(self, start):
+        """
+        Returns the position of the nearest target, or None if no target can
+        be reached.
+        """
+        if self._distances is not None:
+            return self._owners.get(start)
+        path = self._search(start)
+        if path is None: return None
+        return path[1]
+
+    def findPathToNearest(self, start):
+        """
+        Returns a list of actions that leads from start to the nearest target,
+        or None if no target can be reached.
+        """
+        if self._distances is None:
+            path = self._search(start)
+            if path is None: return None
+            return path[0]
+
+        distances = self._distances
+        if start not in distances: return None
+        actions = []
+        cell = start
+        distance = distances[cell]
+        while distance > 0:
+            for neighbor, action in self._neighbors[cell]:
+                if distances.get(neighbor) == distance - 1:
+                    actions.append(action)
+                    cell, distance = neighbor, distance - 1
+                    break
+        return actions
+
+    def _search(self, start):
+        """
+        Breadth first search from start that stops at the first target.
+        Returns (actions, target) or None.
+        """
+        if start in self.targets: return [], start
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            self._expanded += 1
+            for neighbor, action in self._neighbors[cell]:
+                if neighbor in parents: continue
+                parents[neighbor] = (cell, action)
+                if neighbor in self.targets:
+                    actions = []
+                    node = neighbor
+                    while parents[node] is not None:
+                        node, action = parents[node]
+                        actions.append(action)
+                    actions.reverse()
+                    return actions, neighbor
+                queue.append(neighbor)
+        return None
+
+def computeNeighbors(walls):
+    """
+    Returns a dictionary from every open cell to a list of (neighbor, action)
+    pairs, in the same action order the search problems use.
+    """
+    neighbors = {}
+    directions = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+    for x in range(walls.width):
+        for y in range(walls.height):
+            if walls[x][y]: continue
+            adjacent = []
+            for action in directions:
+                dx, dy = Actions.directionToVector(action)
+                nextx, nexty = int(x + dx), int(y + dy)
+                if 0 <= nextx < walls.width and 0 <= nexty < walls.height and not walls[nextx][nexty]:
+                    adjacent.append(((nextx, nexty), action))
+            neighbors[(x, y)] = adjacent
+    return neighbors
@@ -0,0 +1,507 @@
+# npuzzle.py
+# ----------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+The eight puzzle (eightpuzzle.py) generalized to the fifteen puzzle, with a
+board packed into a single integer and additive pattern database heuristics.
+
+A board with n*n cells stores the tile in cell i (row-major, 0 is the blank)
+in bits 4*i to 4*i+3 of one integer, so copying a board is free, hashing it
+is hashing an int, and a move only has to swap two nibbles.
+
+A pattern database for a set of tiles stores, for every placement of those
+tiles, the fewest moves *of those tiles* needed to put them in their goal
+cells.  Moves of the other tiles are free, so the databases of disjoint tile
+sets can be added together and still never overestimate.  The tables are
+built by breadth first search backwards from the goal, saved under
+patternDatabases/, and loaded from there the next time.
+
+To solve a batch of random puzzles and compare with breadth first search on
+EightPuzzleState:
+
+> python npuzzle.py -s 3 -n 20
+> python npuzzle.py -s 4 -n 10 -m 200
+
+By default the puzzles are scrambled by a number of random moves from the
+goal, which for the fifteen puzzle gives shallow instances.  --uniform draws
+them uniformly from all solvable boards instead, whose optimal solutions
+average about 53 moves; IDA* takes from seconds to minutes on each of those:
+
+> python npuzzle.py -s 4 -n 3 --uniform
+"""
+
+import os
+import sys
+import time
+import random
+from array import array
+from collections import deque
+import search
+
+MOVES = ['up', 'down', 'left', 'right']
+
+# Tiles of each pattern database, for each board size.  The goal has the blank
+# in the top left corner, so these are compact blocks of the goal board.
+DEFAULT_PATTERNS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 6, 7), (4, 5, 8, 9, 12), (10, 11, 13, 14, 15)],
+}
+
+DATABASE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'patternDatabases')
+
+UNSEEN = 255
+
+class NPuzzleState:
+    """
+    An n by n sliding tile puzzle (n is 3 for the eight puzzle, 4 for the
+    fifteen puzzle) with the whole board packed into one integer.
+
+    It has the same interface as EightPuzzleState: legalMoves, result, isGoal,
+    and moves are named after the direction the blank moves in.
+    """
+    __slots__ = ['size', 'board', 'blankIndex']
+
+    def __init__(self, numbers, size=None):
+        """
+        numbers: the tiles in row-major order, 0 being the blank.  The goal is
+          [0, 1, 2, ..., n*n - 1], as for EightPuzzleState.
+        """
+        if size is None:
+            size = int(round(len(numbers) ** 0.5))
+        if size * size != len(numbers) or not 2 <= size <= 4:
+            raise Exception('An NPuzzleState needs 4, 9 or 16 numbers, not %d' % len(numbers))
+        if sorted(numbers) != list(range(size * size)):
+            raise Exception('The numbers must be 0 to %d, each once' % (size * size - 1))
+        self.size = size
+        self.board = packNumbers(numbers)
+        self.blankIndex = numbers.index(0)
+
+    def fromBoard(size, board, blankIndex):
+        puzzle = NPuzzleState.__new__(NPuzzleState)
+        puzzle.size, puzzle.board, puzzle.blankIndex = size, board, blankIndex
+        return puzzle
+    fromBoard = staticmethod(fromBoard)
+
+    def fromEightPuzzle(eightPuzzle):
+        "Converts an EightPuzzleState (eightpuzzle.py)."
+        return NPuzzleState([number for row in eightPuzzle.cells for number in row], 3)
+    fromEightPuzzle = staticmethod(fromEightPuzzle)
+
+    def numbers(self):
+        return unpackNumbers(self.board, self.size * self.size)
+
+    def getCells(self):
+        "The board as a list of rows, like EightPuzzleState.cells"
+        numbers = self.numbers()
+        return [numbers[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+    cells = property(getCells)
+
+    def isGoal(self):
+        return self.board == goalBoard(self.size)
+
+    def legalMoves(self):
+        moves = []
+        row, col = divmod(self.blankIndex, self.size)
+        if row != 0:
+            moves.append('up')
+        if row != self.size - 1:
+            moves.append('down')
+        if col != 0:
+            moves.append('left')
+        if col != self.size - 1:
+            moves.append('right')
+        return moves
+
+    def result(self, move):
+        """
+        Returns a new puzzle with the blank moved; this one is unchanged.
+        """
+        if move == 'up':
+            newIndex = self.blankIndex - self.size
+        elif move == 'down':
+            newIndex = self.blankIndex + self.size
+        elif move == 'left':
+            newIndex = self.blankIndex - 1
+        elif move == 'right':
+            newIndex = self.blankIndex + 1
+        else:
+            raise Exception('Illegal move: ' + str(move))
+        return NPuzzleState.fromBoard(self.size, slide(self.board, self.blankIndex, newIndex), newIndex)
+
+    def __eq__(self, other):
+        return isinstance(other, NPuzzleState) and self.board == other.board and self.size == other.size
+
+    def __hash__(self):
+        return hash(self.board)
+
+    def __str__(self):
+        width = len(str(self.size * self.size - 1))
+        horizontalLine = '-' * (self.size * (width + 3) + 1)
+        lines = [horizontalLine]
+        for row in self.cells:
+            lines.append('|' + '|'.join([' %*s ' % (width, number or '') for number in row]) + '|')
+            lines.append(horizontalLine)
+        return '\n'.join(lines)
+
+def packNumbers(numbers):
+    board = 0
+    for index, number in enumerate(numbers):
+        board |= number << (4 * index)
+    return board
+
+def unpackNumbers(board, cells):
+    return [(board >> (4 * index)) & 15 for index in range(cells)]
+
+def slide(board, blankIndex, tileIndex):
+    """
+    Moves the tile at tileIndex into the blank at blankIndex.
+    """
+    tile = (board >> (4 * tileIndex)) & 15
+    return board ^ (tile << (4 * tileIndex)) ^ (tile << (4 * blankIndex))
+
+_goalBoards = {}
+def goalBoard(size):
+    if size not in _goalBoards:
+        _goalBoards[size] = packNumbers(list(range(size * size)))
+    return _goalBoards[size]
+
+_neighborLists = {}
+def neighborIndices(size):
+    """
+    For each cell, the (move, neighbor cell) pairs the blank can move to.
+    """
+    if size not in _neighborLists:
+        neighbors = []
+        for index in range(size * size):
+            row, col = divmod(index, size)
+            adjacent = []
+            if row != 0: adjacent.append(('up', index - size))
+            if row != size - 1: adjacent.append(('down', index + size))
+            if col != 0: adjacent.append(('left', index - 1))
+            if col != size - 1: adjacent.append(('right', index + 1))
+            neighbors.append(adjacent)
+        _neighborLists[size] = neighbors
+    return _neighborLists[size]
+
+OPPOSITE = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+def createRandomPuzzle(size=4, moves=100):
+    """
+    Creates a random puzzle by applying 'moves' random moves to the goal, like
+    createRandomEightPuzzle does for the eight puzzle.
+    """
+    puzzle = NPuzzleState(list(range(size * size)), size)
+    for i in range(moves):
+        puzzle = puzzle.result(random.choice(puzzle.legalMoves()))
+    return puzzle
+
+def createSolvablePuzzle(size=4):
+    """
+    Draws a puzzle uniformly from all the boards the goal can be reached from.
+    A move of the blank along a row keeps the parity of the number of
+    inversions among the tiles; a move along a column passes size - 1 tiles,
+    so for an even size it flips that parity and the blank's row together.
+    Swapping two tiles flips the parity, turning an unsolvable board into a
+    solvable one.
+    """
+    numbers = list(range(size * size))
+    random.shuffle(numbers)
+    tiles = [number for number in numbers if number != 0]
+    inversions = sum([1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j]])
+    if size % 2 == 0: inversions += numbers.index(0) // size
+    if inversions % 2 == 1:
+        first, second = [i for i, number in enumerate(numbers) if number != 0][:2]
+        numbers[first], numbers[second] = numbers[second], numbers[first]
+    return numbers
+
+class PatternDatabase:
+    """
+    The fewest moves of the given tiles that put them in their goal cells, for
+    every placement of the tiles, stored in an array of bytes.
+    """
+    def __init__(self, size, tiles, table=None):
+        self.size = size
+        self.tiles = tuple(tiles)
+        self.cells = size * size
+        self.tableSize = 1
+        for i in range(len(self.tiles)):
+            self.tableSize *= self.cells - i
+        self.table = table if table is not None else self._build()
+
+    def rank(self, positions):
+        """
+        A perfect hash of the cells the pattern tiles occupy, from 0 to
+        tableSize - 1.
+        """
+        index = 0
+        cells = self.cells
+        for i, position in enumerate(positions):
+            smaller = 0
+            for j in range(i):
+                if positions[j] < position: smaller += 1
+            index = index * (cells - i) + position - smaller
+        return index
+
+    def positions(self, board):
+        "The cell of each pattern tile on a packed board."
+        where = [0] * self.cells
+        for index in range(self.cells):
+            where[(board >> (4 * index)) & 15] = index
+        return [where[tile] for tile in self.tiles]
+
+    def lookup(self, board):
+        return self.table[self.rank(self.positions(board))]
+
+    def _build(self):
+        """
+        Breadth first search backwards from the goal placement.  Moves of the
+        other tiles are free, so a search node is the placement of the pattern
+        tiles plus the region of free cells the blank can reach without moving
+        a pattern tile; the region is named by its lowest cell.
+        """
+        size, cells = self.size, self.cells
+        full = (1 << cells) - 1
+        notFirstColumn, notLastColumn = 0, 0
+        for index in range(cells):
+            if index % size != 0: notFirstColumn |= 1 << index
+            if index % size != size - 1: notLastColumn |= 1 << index
+
+        def region(start, occupied):
+            free = full & ~occupied
+            mask = 1 << start
+            while True:
+                grown = mask | ((mask << 1) & notFirstColumn) | ((mask >> 1) & notLastColumn) | \
+                        ((mask << size) & full) | (mask >> size)
+                grown &= free
+                if grown == mask: return mask
+                mask = grown
+
+        neighbors = [[neighbor for move, neighbor in adjacent] for adjacent in neighborIndices(size)]
+        table = array('B', [UNSEEN]) * self.tableSize
+        seen = bytearray(self.tableSize * cells)
+        start = list(self.tiles) # Each tile's goal cell is its number
+        occupied = sum([1 << position for position in start])
+        startRegion = region(0, occupied)
+        startRank = self.rank(start)
+        table[startRank] = 0
+        seen[startRank * cells + lowestCell(startRegion)] = 1
+        fringe = deque([(start, startRegion, 0)])
+        while fringe:
+            positions, blankRegion, distance = fringe.popleft()
+            occupied = sum([1 << position for position in positions])
+            for i, position in enumerate(positions):
+                for neighbor in neighbors[position]:
+                    if not (blankRegion >> neighbor) & 1: continue
+                    # Slide tile i into the blank region
+                    newPositions = positions[:]
+                    newPositions[i] = neighbor
+                    newRegion = region(position, occupied ^ (1 << position) ^ (1 << neighbor))
+                    rank = self.rank(newPositions)
+                    key = rank * cells + lowestCell(newRegion)
+                    if seen[key]: continue
+                    seen[key] = 1
+                    if table[rank] == UNSEEN:
+                        table[rank] = distance + 1
+                    fringe.append((newPositions, newRegion, distance + 1))
+        return table
+
+    def filename(self, directory=DATABASE_DIRECTORY):
+        return os.path.join(directory, 'puzzle%d-%s.pdb' % (self.size, '-'.join([str(tile) for tile in self.tiles])))
+
+    def save(self, directory=DATABASE_DIRECTORY):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(self.filename(directory), 'wb') as f:
+            self.table.tofile(f)
+
+    def load(size, tiles, directory=DATABASE_DIRECTORY):
+        """
+        Loads the database from directory, building and saving it first if it
+        is missing or does not have the right size.
+        """
+        database = PatternDatabase(size, tiles, table=array('B'))
+        path = database.filename(directory)
+        if os.path.exists(path) and os.path.getsize(path) == database.tableSize:
+            with open(path, 'rb') as f:
+                database.table.fromfile(f, database.tableSize)
+            return database
+        database.table = database._build()
+        database.save(directory)
+        return database
+    load = staticmethod(load)
+
+def lowestCell(mask):
+    return (mask & -mask).bit_length() - 1
+
+def loadPatternDatabases(size, patterns=None, directory=DATABASE_DIRECTORY):
+    """
+    Loads (building if necessary) an additive set of pattern databases.  The
+    tile sets in patterns must not overlap.
+    """
+    if patterns is None: patterns = DEFAULT_PATTERNS[size]
+    tiles = [tile for pattern in patterns for tile in pattern]
+    if len(tiles) != len(set(tiles)) or 0 in tiles:
+        raise Exception('Pattern databases must use disjoint sets of tiles, without the blank')
+    return [PatternDatabase.load(size, pattern, directory) for pattern in patterns]
+
+def patternDatabaseHeuristic(state, problem):
+    """
+    The sum of the pattern database values, for use with search.aStarSearch on
+    an NPuzzleSearchProblem.
+    """
+    return sum([database.lookup(state.board) for database in problem.databases])
+
+class NPuzzleSearchProblem(search.SearchProblem):
+    """
+    The NPuzzleState version of EightPuzzleSearchProblem.  Loads the pattern
+    databases for patternDatabaseHeuristic.
+    """
+    def __init__(self, puzzle, databases=None):
+        self.puzzle = puzzle
+        self.databases = databases if databases is not None else loadPatternDatabases(puzzle.size)
+        self._expanded = 0
+
+    def getStartState(self):
+        return self.puzzle
+
+    def isGoalState(self, state):
+        return state.isGoal()
+
+    def getSuccessors(self, state):
+        self._expanded += 1
+        return [(state.result(move), move, 1) for move in state.legalMoves()]
+
+    def getCostOfActions(self, actions):
+        return len(actions)
+
+def solve(puzzle, databases=None):
+    """
+    Returns (moves, expanded) for an optimal solution, found with iterative
+    deepening A* on the packed board.  Each move changes one tile, so only the
+    pattern database holding that tile is looked up again.
+    """
+    size = puzzle.size
+    if databases is None: databases = loadPatternDatabases(size)
+    neighbors = neighborIndices(size)
+    databaseOf = {}
+    positions = []
+    for d, database in enumerate(databases):
+        for i, tile in enumerate(database.tiles):
+            databaseOf[tile] = (d, i)
+        positions.append(database.positions(puzzle.board))
+    values = [database.table[database.rank(positions[d])] for d, database in enumerate(databases)]
+    goal = goalBoard(size)
+    path = []
+    expanded = [0]
+
+    def depthLimited(board, blankIndex, g, h, bound, lastMove):
+        f = g + h
+        if f > bound: return f
+        if board == goal: return True
+        expanded[0] += 1
+        smallest = float('inf')
+        for move, tileIndex in neighbors[blankIndex]:
+            if lastMove is not None and move == OPPOSITE[lastMove]: continue
+            tile = (board >> (4 * tileIndex)) & 15
+            newBoard = board ^ (tile << (4 * tileIndex)) ^ (tile << (4 * blankIndex))
+            newH = h
+            if tile in databaseOf:
+                d, i = databaseOf[tile]
+                database = databases[d]
+                positions[d][i] = blankIndex
+                newValue = database.table[database.rank(positions[d])]
+                newH = h - values[d] + newValue
+                oldValue, values[d] = values[d], newValue
+            path.append(move)
+            result = depthLimited(newBoard, tileIndex, g + 1, newH, bound, move)
+            if result is True: return True
+            path.pop()
+            if tile in databaseOf:
+                positions[d][i] = tileIndex
+                values[d] = oldValue
+            if result < smallest: smallest = result
+        return smallest
+
+    bound = sum(values)
+    while True:
+        result = depthLimited(puzzle.board, puzzle.blankIndex, 0, sum(values), bound, None)
+        if result is True:
+            return path, expanded[0]
+        if result == float('inf'):
+            return None, expanded[0]
+        bound = result
+
+def benchmark(size=3, numPuzzles=20, moves=100, compareBreadthFirst=True, uniform=False):
+    """
+    Solves numPuzzles random puzzles with solve() and, for the eight puzzle,
+    with breadth first search on EightPuzzleState, and prints the times.  The
+    puzzles are scrambled by moves random moves, or with uniform drawn by
+    createSolvablePuzzle.
+    """
+    import eightpuzzle
+    starttime = time.time()
+    databases = loadPatternDatabases(size)
+    print('Pattern databases for %d tiles ready in %.2f seconds' % (size * size - 1, time.time() - starttime))
+    workload = 'uniformly random solvable puzzles' if uniform else '%d-move scrambles' % moves
+    print('Solving %d %d-tile puzzles: %s' % (numPuzzles, size * size - 1, workload))
+    compareBreadthFirst = compareBreadthFirst and size == 3
+    totals = [0.0, 0.0]
+    for n in range(numPuzzles):
+        if uniform:
+            numbers = createSolvablePuzzle(size)
+            puzzle = NPuzzleState(numbers, size)
+            if size == 3: original = eightpuzzle.EightPuzzleState(numbers)
+        elif size == 3:
+            original = eightpuzzle.createRandomEightPuzzle(moves)
+            puzzle = NPuzzleState.fromEightPuzzle(original)
+        else:
+            puzzle = createRandomPuzzle(size, moves)
+        starttime = time.time()
+        path, expanded = solve(puzzle, databases)
+        seconds = time.time() - starttime
+        totals[0] += seconds
+        line = 'Puzzle %3d: %3d moves, %8d nodes expanded in %7.3f seconds' % (n, len(path), expanded, seconds)
+        if compareBreadthFirst:
+            starttime = time.time()
+            bfsPath = search.breadthFirstSearch(eightpuzzle.EightPuzzleSearchProblem(original))
+            bfsSeconds = time.time() - starttime
+            totals[1] += bfsSeconds
+            if len(bfsPath) != len(path):
+                print('Warning: breadth first search found %d moves instead of %d' % (len(bfsPath), len(path)))
+            line += ' (breadth first search: %7.3f seconds)' % bfsSeconds
+        print(line)
+    print('Total for %s: %.3f seconds' % (workload, totals[0]) +
+          (' (breadth first search: %.3f seconds)' % totals[1] if compareBreadthFirst else ''))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('python npuzzle.py <options>')
+    parser.add_option('-s', '--size', dest='size', type='int', default=3,
+                      help='3 for the eight puzzle, 4 for the fifteen puzzle [Default: %default]')
+    parser.add_option('-n', '--numPuzzles', dest='numPuzzles', type='int', default=20,
+                      help='how many random puzzles to solve [Default: %default]')
+    parser.add_option('-m', '--moves', dest='moves', type='int', default=100,
+                      help='random moves used to create each puzzle [Default: %default]')
+    parser.add_option('--uniform', dest='uniform', action='store_true', default=False,
+                      help='draw the puzzles uniformly from all solvable boards instead of scrambling the goal')
+    parser.add_option('--noBreadthFirst', dest='compareBreadthFirst', action='store_false', default=True,
+                      help='do not also solve eight puzzles with breadth first search')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    benchmark(options.size, options.numPuzzles, options.moves, options.compareBreadthFirst, options.uniform)
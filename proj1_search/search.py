@@ -124,22 +124,68 @@ def breadthFirstSearch(problem):
                 fringe.push((succ, action_state_cp))
 
 
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
-    closed = set()
-    fringe = util.PriorityQueueWithFunction(lambda x: x[0])
+def uniformCostSearch(problem, queue='heap', memoryLimit=None):
+    """
+    Search the node of least total cost first.
+
+    queue picks the fringe (see priorityFringe); 'bucket' and 'radix' need
+    integer step costs.  With a memoryLimit (in megabytes), the closed set
+    moves to disk once it outgrows the limit (see externalMemory.py).
+    """
+    closed = makeClosedSet(problem, memoryLimit, set)
+    fringe = priorityFringe(lambda x: x[0], queue)
     fringe.push((0, problem.getStartState(), []))
-    while fringe:
-        cost, curr_state, action_state = fringe.pop()
-        if problem.isGoalState(curr_state):
-            return action_state
-        if curr_state not in closed:
-            closed.add(curr_state)
-            for succ, action, stepCost in problem.getSuccessors(curr_state):
-                action_state_cp = action_state.copy()
-                action_state_cp.append(action)
-                fringe.push((cost + stepCost, succ, action_state_cp))
+    try:
+        while fringe:
+            cost, curr_state, action_state = fringe.pop()
+            if problem.isGoalState(curr_state):
+                return action_state
+            if curr_state not in closed:
+                closed.add(curr_state)
+                for succ, action, stepCost in problem.getSuccessors(curr_state):
+                    action_state_cp = action_state.copy()
+                    action_state_cp.append(action)
+                    fringe.push((cost + stepCost, succ, action_state_cp))
+    finally:
+        closeClosedSet(closed)
+
+
+def priorityFringe(priorityFunction, queue='heap'):
+    """
+    Returns an empty fringe ordered by priorityFunction.  queue is one of
+
+    'heap':   util.PriorityQueueWithFunction, for any priorities
+    'bucket': util.BucketQueueWithFunction (Dial's algorithm), for
+              non-negative integer priorities; constant time per push and pop
+              while priorities are small, then it switches to a radix heap
+    'radix':  util.RadixHeapWithFunction, for non-negative integer priorities
+              that never drop below the last one popped
+
+    The integer queues raise ValueError on a priority they cannot hold.
+    """
+    if queue == 'heap':
+        return util.PriorityQueueWithFunction(priorityFunction)
+    if queue == 'bucket':
+        return util.BucketQueueWithFunction(priorityFunction)
+    if queue == 'radix':
+        return util.RadixHeapWithFunction(priorityFunction)
+    raise AttributeError(queue + ' is not a fringe type; use heap, bucket or radix.')
+
+def makeClosedSet(problem, memoryLimit=None, default=set):
+    """
+    An empty closed set: default() (a set or a dict) without a memoryLimit,
+    otherwise an externalMemory.ClosedSet that keeps about memoryLimit
+    megabytes of states in RAM and the rest on disk.
+    """
+    if memoryLimit is None:
+        return default()
+    import externalMemory
+    return externalMemory.ClosedSet(problem, float(memoryLimit))
 
+def closeClosedSet(closed):
+    "Releases the file behind a closed set from makeClosedSet, if it has one."
+    if 'close' in dir(closed):
+        closed.close()
 
 def nullHeuristic(state, problem=None):
     """
@@ -148,22 +194,387 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
-    closed = {}
-    fringe = util.PriorityQueueWithFunction(lambda x: x[0] + heuristic(x[1], problem))
+def aStarSearch(problem, heuristic=nullHeuristic, queue='heap', memoryLimit=None):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    queue picks the fringe (see priorityFringe); 'bucket' and 'radix' need
+    integer step costs and heuristic values.  memoryLimit is as in
+    uniformCostSearch.
+    """
+    closed = makeClosedSet(problem, memoryLimit, dict)
+    fringe = priorityFringe(lambda x: x[0] + heuristic(x[1], problem), queue)
     fringe.push((0, problem.getStartState(), [])) #first 0: stepCost + heuristic
-    while fringe:
-        curr_cost, curr_state, action_state = fringe.pop()
+    try:
+        while fringe:
+            curr_cost, curr_state, action_state = fringe.pop()
+            if problem.isGoalState(curr_state):
+                return action_state
+            if curr_state not in closed or curr_cost < closed[curr_state]:
+                closed[curr_state] = curr_cost
+                for succ, action, stepCost in problem.getSuccessors(curr_state):
+                    action_state_cp = action_state.copy()
+                    action_state_cp.append(action)
+                    total_cost = curr_cost + stepCost
+                    fringe.push((total_cost, succ, action_state_cp))
+    finally:
+        closeClosedSet(closed)
+
+def jumpPointSearch(problem, heuristic=nullHeuristic):
+    """
+    A* over jump points (Harabor and Grastien) for grid problems whose states
+    are (x,y) positions, whose walls are a Grid in problem.walls, and whose
+    steps all cost 1.
+
+    Runs of cells that every optimal path could equally take some other way
+    are skipped instead of expanded.  With only the four Pacman moves, vertical
+    moves play the part of diagonal moves: a vertical run stops wherever a
+    horizontal run from it would find a jump point.  The returned plan spells
+    out every step between jump points, so it is valid for getCostOfActions.
+    """
+    walls = problem.walls
+    start = problem.getStartState()
+
+    def walkable(x, y):
+        return 0 <= x < walls.width and 0 <= y < walls.height and not walls[x][y]
+
+    def jump(x, y, dx, dy):
+        while walkable(x, y):
+            if problem.isGoalState((x, y)):
+                return (x, y)
+            if dx != 0:
+                # Horizontal: stop next to a wall corner that opens up
+                if (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or \
+                   (walkable(x, y + 1) and not walkable(x - dx, y + 1)):
+                    return (x, y)
+            else:
+                if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+                   (walkable(x + 1, y) and not walkable(x + 1, y - dy)):
+                    return (x, y)
+                if jump(x + 1, y, 1, 0) is not None or jump(x - 1, y, -1, 0) is not None:
+                    return (x, y)
+            x, y = x + dx, y + dy
+        return None
+
+    def prunedDirections(direction):
+        if direction is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx, dy = direction
+        if dx != 0:
+            return [(dx, 0), (0, 1), (0, -1)]
+        return [(0, dy), (1, 0), (-1, 0)]
+
+    # The start is expanded like any other search would, which also lets us
+    # check that the problem really has unit costs
+    for succ, action, stepCost in problem.getSuccessors(start):
+        if stepCost != 1:
+            raise Exception('jumpPointSearch needs a problem with unit step costs')
+
+    parents = {start: None}
+    best = {start: 0}
+    fringe = util.PriorityQueue()
+    fringe.push((start, None, 0), heuristic(start, problem))
+    while not fringe.isEmpty():
+        curr_state, direction, curr_cost = fringe.pop()
+        if curr_cost > best[curr_state]:
+            continue
         if problem.isGoalState(curr_state):
-            return action_state
-        if curr_state not in closed or curr_cost < closed[curr_state]:
-            closed[curr_state] = curr_cost
-            for succ, action, stepCost in problem.getSuccessors(curr_state):
-                action_state_cp = action_state.copy()
-                action_state_cp.append(action)
-                total_cost = curr_cost + stepCost
-                fringe.push((total_cost, succ, action_state_cp))
+            return jumpPointPath(parents, curr_state)
+        if direction is not None and '_expanded' in dir(problem):
+            problem._expanded += 1
+        x, y = curr_state
+        for dx, dy in prunedDirections(direction):
+            jump_point = jump(x + dx, y + dy, dx, dy)
+            if jump_point is None:
+                continue
+            total_cost = curr_cost + abs(jump_point[0] - x) + abs(jump_point[1] - y)
+            if total_cost < best.get(jump_point, float('inf')):
+                best[jump_point] = total_cost
+                parents[jump_point] = curr_state
+                fringe.push((jump_point, (dx, dy), total_cost), total_cost + heuristic(jump_point, problem))
+    return None
+
+def jumpPointPath(parents, goal):
+    """
+    Expands the chain of jump points ending at goal into one action per step.
+    """
+    from game import Actions
+    actions = []
+    curr_state = goal
+    while parents[curr_state] is not None:
+        parent = parents[curr_state]
+        dx, dy = curr_state[0] - parent[0], curr_state[1] - parent[1]
+        action = Actions.vectorToDirection((dx, dy))
+        actions.extend([action] * (abs(dx) + abs(dy)))
+        curr_state = parent
+    actions.reverse()
+    return actions
+
+def anytimeRepairingAStarSearch(problem, heuristic=nullHeuristic, budget=5, weight=3.0, weightStep=0.5):
+    """
+    Anytime Repairing A* (Likhachev, Gordon and Thrun).
+
+    Searches with f = g + weight * h, which finds a first plan quickly, then
+    lowers the weight by weightStep and repairs the search until the weight
+    reaches 1 or budget seconds have passed.  Each repair keeps the g values
+    of the previous one and only re-opens the states whose g value improved
+    after they were expanded, instead of starting over.
+
+    After each step the cost of the plan and its suboptimality bound (how
+    many times more expensive than optimal it can be, given an admissible
+    heuristic) are printed.  The best plan found is returned; if the budget
+    runs out before any plan is found, the search keeps going until it finds
+    one.
+    """
+    import heapq
+    import time
+    budget, weight, weightStep = float(budget), float(weight), float(weightStep)
+    deadline = time.time() + budget
+    start = problem.getStartState()
+    g = {start: 0}
+    parents = {start: None}
+    hValues = {}
+    def h(state):
+        if state not in hValues: hValues[state] = heuristic(state, problem)
+        return hValues[state]
+
+    counter = [0]
+    openKeys = {} # state -> its current key in the open list
+    openHeap = []
+    def openPush(state):
+        key = g[state] + weight * h(state)
+        openKeys[state] = key
+        counter[0] += 1
+        heapq.heappush(openHeap, (key, counter[0], state))
+    def openPeek():
+        while openHeap:
+            key, count, state = openHeap[0]
+            if openKeys.get(state) == key: return key
+            heapq.heappop(openHeap)
+        return float('inf')
+
+    best = [float('inf'), None] # cost and goal state of the best plan so far
+    if problem.isGoalState(start):
+        return []
+    openPush(start)
+    closed, incons = set(), set()
+
+    def improvePath():
+        while openPeek() < best[0]:
+            if best[1] is not None and time.time() > deadline:
+                return False
+            key, count, state = heapq.heappop(openHeap)
+            del openKeys[state]
+            closed.add(state)
+            for succ, action, stepCost in problem.getSuccessors(state):
+                cost = g[state] + stepCost
+                if cost >= g.get(succ, float('inf')): continue
+                g[succ] = cost
+                parents[succ] = (state, action)
+                if problem.isGoalState(succ):
+                    if cost < best[0]: best[0], best[1] = cost, succ
+                elif succ not in closed:
+                    openPush(succ)
+                else:
+                    incons.add(succ)
+        return True
+
+    while True:
+        starttime = time.time()
+        finished = improvePath()
+        if best[1] is None:
+            return None
+        lowest = min([g[state] + h(state) for state in list(openKeys) + list(incons)] + [best[0]])
+        bound = min(weight, best[0] / lowest) if lowest > 0 else 1.0
+        print('[ARA*] weight %.2f: cost %s, suboptimality bound %.3f (%.2f seconds)' %
+              (weight, best[0], bound, time.time() - starttime))
+        if not finished or weight <= 1 or bound <= 1 or time.time() > deadline:
+            break
+        # Lower the weight and repair: states improved since their expansion
+        # go back on the open list, and every key is recomputed
+        weight = max(1.0, weight - weightStep)
+        for state in incons:
+            openKeys[state] = None
+        incons.clear()
+        pending = list(openKeys)
+        openKeys.clear()
+        openHeap = []
+        for state in pending:
+            openPush(state)
+        closed.clear()
+
+    actions = []
+    state = best[1]
+    while parents[state] is not None:
+        state, action = parents[state]
+        actions.append(action)
+    actions.reverse()
+    return actions
+
+# Configurations portfolioSearch tries when none are given, by problem type.
+# A configuration is a search function name, optionally followed by
+# ':heuristicName'.
+PORTFOLIO_DEFAULTS = {
+    'PositionSearchProblem': ['astar:manhattanHeuristic', 'ucs', 'jps:manhattanHeuristic'],
+    'CornersProblem': ['astar:cornersHeuristic', 'ucs', 'bfs'],
+    'FoodSearchProblem': ['astar:foodHeuristic', 'ucs', 'closestDotSearch'],
+}
+
+# Search functions that return optimal plans (for A*, provided the heuristic
+# is admissible and consistent)
+OPTIMAL_SEARCHES = ['ucs', 'uniformCostSearch', 'astar', 'aStarSearch', 'jps', 'jumpPointSearch']
+
+# Seconds portfolioSearch waits for a result before checking on its workers
+PORTFOLIO_POLL = 0.1
+
+def portfolioSearch(problem, configs=None, guarantee='optimal', timeout=None):
+    """
+    Runs several search configurations on the same problem at once, each in
+    its own process, and returns the plan of the first one to finish that
+    meets the guarantee.  The other processes are then stopped.
+
+      configs: a list of configurations like 'astar:foodHeuristic' (or one
+               string joined with '+', as passed from the command line).
+               Defaults to PORTFOLIO_DEFAULTS for the problem's type.
+      guarantee: 'optimal' to only accept configurations in OPTIMAL_SEARCHES,
+               'any' to take whichever plan comes first.
+      timeout: seconds to wait for an acceptable plan.
+
+    If no configuration meets the guarantee in time, the cheapest plan found
+    so far is returned with a warning.  A process that dies without a result
+    (killed by a signal, say) counts as a failed configuration.  The number of nodes each
+    configuration expanded is printed.  Processes are forked, so the problem
+    does not need to be picklable; where fork is not available the
+    configurations are run one after another instead.
+    """
+    import multiprocessing
+    import time
+    if configs is None:
+        configs = PORTFOLIO_DEFAULTS.get(type(problem).__name__, ['ucs'])
+    elif isinstance(configs, str):
+        configs = configs.split('+')
+    if guarantee not in ['optimal', 'any']:
+        raise Exception("portfolioSearch guarantee must be 'optimal' or 'any', not " + str(guarantee))
+    if timeout is not None:
+        timeout = float(timeout)
+    acceptable = lambda config: guarantee == 'any' or config.split(':')[0] in OPTIMAL_SEARCHES
+    searchFunctions = [(config, lookupConfiguration(config)) for config in configs]
+
+    # Child processes must not draw on the parent's display
+    if 'visualize' in dir(problem):
+        problem.visualize = False
+
+    starttime = time.time()
+    report = dict((config, {'status': 'running', 'expanded': 0, 'cost': None, 'seconds': None}) for config in configs)
+    finished = []
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        for config, searchFunction in searchFunctions:
+            counter = multiprocessing.RawValue('l', 0)
+            finished.append(runPortfolioConfiguration(problem, config, searchFunction, counter))
+            if finished[-1][1] is not None and acceptable(config): break
+    else:
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        workers = {}
+        for config, searchFunction in searchFunctions:
+            counter = context.RawValue('l', 0)
+            worker = context.Process(target=portfolioWorker, args=(problem, config, searchFunction, counter, results))
+            worker.daemon = True
+            worker.start()
+            workers[config] = (worker, counter)
+        try:
+            while len(finished) < len(workers):
+                remaining = None if timeout is None else timeout - (time.time() - starttime)
+                if remaining is not None and remaining <= 0: break
+                wait = PORTFOLIO_POLL if remaining is None else min(PORTFOLIO_POLL, remaining)
+                try:
+                    result = results.get(timeout=wait)
+                except Exception: # queue.Empty: nothing yet
+                    # A worker exits with code 0 only after putting its result
+                    for config, (worker, counter) in workers.items():
+                        if worker.exitcode not in [None, 0] and config not in [result[0] for result in finished]:
+                            finished.append((config, None, counter.value, time.time() - starttime,
+                                             'exited with code %d' % worker.exitcode))
+                    continue
+                finished.append(result)
+                if result[1] is not None and acceptable(result[0]): break
+        finally:
+            for config, (worker, counter) in workers.items():
+                if worker.is_alive():
+                    worker.terminate()
+                    report[config]['status'] = 'cancelled'
+                report[config]['expanded'] = counter.value
+                worker.join()
+
+    best = None
+    for config, actions, expanded, seconds, error in finished:
+        entry = report[config]
+        entry['expanded'], entry['seconds'] = expanded, seconds
+        if error is not None or actions is None:
+            entry['status'] = 'failed' if error is None else 'failed: ' + error
+            continue
+        entry['status'], entry['cost'] = 'finished', problem.getCostOfActions(actions)
+        if acceptable(config) and (best is None or not acceptable(best[0])):
+            best = (config, actions)
+        elif best is None or (not acceptable(best[0]) and entry['cost'] < report[best[0]]['cost']):
+            best = (config, actions)
+
+    for config in configs:
+        entry = report[config]
+        line = '[Portfolio] %-28s %-10s %8d nodes expanded' % (config, entry['status'].split(':')[0], entry['expanded'])
+        if entry['cost'] is not None:
+            line += ', cost %s in %.2f seconds' % (entry['cost'], entry['seconds'])
+        print(line)
+    if best is None:
+        print('[Portfolio] No configuration found a plan')
+        return None
+    if not acceptable(best[0]):
+        print('[Portfolio] Warning: no %s plan in time; using %s' % (guarantee, best[0]))
+    print('[Portfolio] Using the plan from ' + best[0])
+    if '_expanded' in dir(problem):
+        problem._expanded = report[best[0]]['expanded']
+    return best[1]
+
+def lookupConfiguration(config):
+    """
+    Turns 'searchFunction' or 'searchFunction:heuristic' into a function of
+    the problem alone.  Names are looked up in search.py, then searchAgents.py.
+    """
+    import searchAgents
+    def lookup(name):
+        for module in [globals(), vars(searchAgents)]:
+            if name in module: return module[name]
+        raise AttributeError(name + ' is not a function in search.py or searchAgents.py.')
+    if ':' not in config:
+        return lookup(config)
+    fn, heuristic = config.split(':')
+    func, heur = lookup(fn), lookup(heuristic)
+    return lambda problem: func(problem, heuristic=heur)
+
+def runPortfolioConfiguration(problem, config, searchFunction, counter):
+    """
+    Runs one configuration, counting expansions in the shared counter so they
+    can be read even if the run is cancelled.  Returns (config, actions,
+    expanded, seconds, error).
+    """
+    import time
+    getSuccessors = problem.getSuccessors
+    def countedSuccessors(state):
+        counter.value += 1
+        return getSuccessors(state)
+    problem.getSuccessors = countedSuccessors
+    starttime = time.time()
+    try:
+        actions, error = searchFunction(problem), None
+    except Exception as e:
+        actions, error = None, '%s: %s' % (type(e).__name__, e)
+    finally:
+        del problem.getSuccessors
+    expanded = max(counter.value, problem._expanded if '_expanded' in dir(problem) else 0)
+    return config, actions, expanded, time.time() - starttime, error
+
+def portfolioWorker(problem, config, searchFunction, counter, results):
+    results.put(runPortfolioConfiguration(problem, config, searchFunction, counter))
 
 
 # Abbreviations
@@ -171,3 +582,6 @@ bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+jps = jumpPointSearch
+portfolio = portfolioSearch
+arastar = anytimeRepairingAStarSearch
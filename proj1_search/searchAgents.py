@@ -37,7 +37,14 @@ from game import Agent
 from game import Actions
 import util
 import time
+import struct
 import search
+import solutionCache
+import nearestTarget
+import dstarLite
+import landmarks
+import junctionGraph
+import multiGoalHeuristic
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -66,21 +73,39 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
+      portfolioSearch or portfolio
+
+    Any other agent arguments are passed on to the search function, e.g.
+      -a fn=portfolio,prob=FoodSearchProblem,guarantee=any,timeout=10
+
+    Junction problems search a maze compressed to its junctions (see
+    junctionGraph.py), e.g. -a fn=astar,prob=JunctionPositionSearchProblem,heuristic=manhattanHeuristic
+
+    With cacheDir, plans are stored in and replayed from that directory (see
+    solutionCache.py), e.g. -a fn=astar,heuristic=manhattanHeuristic,cacheDir=searchCache
 
 
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    cache = None # Subclasses that set up their own search have no cache
+
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', cacheDir=None, **searchArgs):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
+        self.cache = solutionCache.SolutionCache(cacheDir) if cacheDir else None
+        self.cacheDescription = (prob, fn, heuristic, searchArgs)
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError(fn + ' is not a search function in search.py.')
         func = getattr(search, fn)
+        argNames = func.__code__.co_varnames[:func.__code__.co_argcount]
+        for arg in searchArgs:
+            if arg not in argNames:
+                raise AttributeError(arg + ' is not an argument of ' + fn + ' in search.py.')
         if 'heuristic' not in func.__code__.co_varnames:
             print('[SearchAgent] using function ' + fn)
-            self.searchFunction = func
+            self.searchFunction = lambda x: func(x, **searchArgs)
         else:
             if heuristic in globals().keys():
                 heur = globals()[heuristic]
@@ -90,7 +115,7 @@ class SearchAgent(Agent):
                 raise AttributeError(heuristic + ' is not a function in searchAgents.py or search.py.')
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
             # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = lambda x: func(x, heuristic=heur, **searchArgs)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
@@ -109,11 +134,22 @@ class SearchAgent(Agent):
         """
         if self.searchFunction == None: raise Exception("No search function provided for SearchAgent")
         starttime = time.time()
+        if self.cache is not None:
+            cacheKey = self.cache.key(state, *self.cacheDescription)
+            cached = self.cache.load(cacheKey)
+            if cached is not None:
+                self.actions = cached['actions']
+                print('Path found with total cost of %d in %.1f seconds (cached)' % (cached['cost'], time.time() - starttime))
+                if cached['expanded'] is not None: print('Search nodes expanded: %d' % cached['expanded'])
+                return
         problem = self.searchType(state) # Makes a new search problem
         self.actions  = self.searchFunction(problem) # Find a path
+        if 'expandActions' in dir(problem): self.actions = problem.expandActions(self.actions)
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if self.cache is not None and self.actions is not None:
+            self.cache.store(cacheKey, self.actions, totalCost, getattr(problem, '_expanded', None))
 
     def getAction(self, state):
         """
@@ -260,6 +296,57 @@ def euclideanHeuristic(position, problem, info={}):
     xy2 = problem.goal
     return ( (xy1[0] - xy2[0]) ** 2 + (xy1[1] - xy2[1]) ** 2 ) ** 0.5
 
+def landmarkHeuristic(position, problem, info={}):
+    """
+    The landmark (ALT) lower bound on the maze distance for a
+    PositionSearchProblem (see landmarks.py).  The bound from every cell to the
+    goal is computed on the first call, so later calls are a list lookup.
+    """
+    if '_landmarkTable' not in problem.__dict__:
+        table = landmarks.getLandmarks(problem.walls).heuristicTable(problem.goal)
+        problem._landmarkTable = (table, problem.walls.height)
+    table, height = problem._landmarkTable
+    return table[position[0] * height + position[1]]
+
+class JunctionPositionSearchProblem(PositionSearchProblem):
+    """
+    A PositionSearchProblem over the junction graph of the maze (see
+    junctionGraph.py): states are only the junctions, dead ends, start and
+    goal, and each action is the tuple of Directions along one corridor.
+    expandActions turns a plan back into single steps; getCostOfActions takes
+    either form.
+    """
+
+    def __init__(self, gameState, costFn = lambda x: 1, goal=(1,1), start=None, warn=True, visualize=True):
+        PositionSearchProblem.__init__(self, gameState, costFn, goal, start, warn, visualize)
+        self.graph = junctionGraph.getJunctionGraph(self.walls, [self.startState, self.goal])
+        self._edgeCosts = {}
+
+    def getSuccessors(self, state):
+        """
+        Returns the node at the far end of each corridor leaving state, the
+        Directions that walk it, and the summed cost of the cells entered.
+        """
+        successors = []
+        for nextState, edge in self.graph.edges[state]:
+            if edge not in self._edgeCosts:
+                self._edgeCosts[edge] = sum(self.costFn(cell) for cell in edge.cells)
+            successors.append((nextState, edge.actions, self._edgeCosts[edge]))
+
+        # Bookkeeping for display purposes
+        self._expanded += 1 # DO NOT CHANGE
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return successors
+
+    def expandActions(self, actions):
+        return junctionGraph.expandActions(actions)
+
+    def getCostOfActions(self, actions):
+        return PositionSearchProblem.getCostOfActions(self, junctionGraph.expandActions(actions))
+
 #####################################################
 # This portion is incomplete.  Time to write code!  #
 #####################################################
@@ -285,6 +372,7 @@ class CornersProblem(search.SearchProblem):
         self._expanded = 0 # DO NOT CHANGE; Number of search nodes expanded
         # Please add any code here which you would like to use
         # in initializing the problem
+        self.heuristicInfo = {} # A dictionary for the heuristic to store information
 
     def getStartState(self):
         """
@@ -366,24 +454,20 @@ def cornersHeuristic(state, problem):
     """
 
     """
-    Say hi to His Royal Highness Hugh
-    Hugh stores all the corners that still needs to be visited in to_visit.
-    While there are corners to visit, Hugh looks for the corner that is closest to
-    the current coordinate, then adds that to sum_dist. Then, the current coordinate
-    is updated to that corner that is found.
+    The exact cost of visiting the remaining corners from the current
+    coordinate (see multiGoalHeuristic.py): maze distances between the corners
+    are computed once per problem, and the best order to visit the remaining
+    corners in is found by dynamic programming over subsets of corners.
     """
     corners = problem.corners # These are the corner coordinates
     walls = problem.walls # These are the walls of the maze, as a Grid (game.py)
     curr_coord, visited_corners = state
-    visited_corners = visited_corners
-    sum_dist = 0
-    to_visit = {corner for i, corner in enumerate(corners) if not visited_corners[i]}
-    while to_visit:
-        min_corner = min(to_visit, key=lambda x: util.manhattanDistance(curr_coord, x))
-        sum_dist += util.manhattanDistance(curr_coord, min_corner)
-        curr_coord = min_corner
-        to_visit.remove(curr_coord)
-    return sum_dist
+    if 'multiGoal' not in problem.heuristicInfo:
+        problem.heuristicInfo['multiGoal'] = multiGoalHeuristic.MultiGoalHeuristic(walls, corners)
+    to_visit = 0
+    for i, visited in enumerate(visited_corners):
+        if not visited: to_visit |= 1 << i
+    return problem.heuristicInfo['multiGoal'].value(curr_coord, to_visit)
 
 class AStarCornersAgent(SearchAgent):
     "A SearchAgent for FoodSearchProblem using A* and your foodHeuristic"
@@ -391,6 +475,42 @@ class AStarCornersAgent(SearchAgent):
         self.searchFunction = lambda prob: search.aStarSearch(prob, cornersHeuristic)
         self.searchType = CornersProblem
 
+class JunctionCornersProblem(CornersProblem):
+    """
+    A CornersProblem over the junction graph of the maze, with the start and
+    the corners kept as nodes (see junctionGraph.py).  Actions and plans are
+    as in JunctionPositionSearchProblem, and cornersHeuristic works unchanged.
+    """
+
+    def __init__(self, startingGameState):
+        CornersProblem.__init__(self, startingGameState)
+        self.graph = junctionGraph.getJunctionGraph(self.walls, (self.startingPosition,) + self.corners)
+
+    def getSuccessors(self, state):
+        """
+        Returns the state at the far end of each corridor leaving the current
+        coordinate, the Directions that walk it, and its length.
+        """
+        successors = []
+        coord, visited_corners = state
+        for next_coord, edge in self.graph.edges[coord]:
+            if next_coord in self.corners:
+                visited_corners_l = list(visited_corners)
+                visited_corners_l[self.corners.index(next_coord)] = True
+                nextState = (next_coord, tuple(visited_corners_l))
+            else:
+                nextState = (next_coord, visited_corners)
+            successors.append((nextState, edge.actions, len(edge)))
+
+        self._expanded += 1 # DO NOT CHANGE
+        return successors
+
+    def expandActions(self, actions):
+        return junctionGraph.expandActions(actions)
+
+    def getCostOfActions(self, actions):
+        return CornersProblem.getCostOfActions(self, junctionGraph.expandActions(actions))
+
 class FoodSearchProblem:
     """
     A search problem associated with finding the a path that collects all of the
@@ -413,6 +533,16 @@ class FoodSearchProblem:
     def isGoalState(self, state):
         return state[1].count() == 0
 
+    def packState(self, state):
+        """
+        The state as a byte string of fixed size, for search.py's disk-backed
+        closed set (see externalMemory.py): two bytes each for x and y, then
+        one bit per cell of the food grid.
+        """
+        (x, y), food = state
+        bits = ''.join(['1' if cell else '0' for column in food.data for cell in column])
+        return struct.pack('<HH', x, y) + int(bits, 2).to_bytes((len(bits) + 7) // 8, 'little')
+
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
         successors = []
@@ -476,16 +606,22 @@ def foodHeuristic(state, problem):
     problem.heuristicInfo['wallCount']
     """
     position, foodGrid = state
-    to_visit = foodGrid.asList()
-    if not to_visit:
-        return 0
-    return max([mazeDistance(position, coord, problem.startingGameState) for coord in to_visit])
+    # The remaining food is always a subset of the starting food, so one
+    # engine built on the starting food covers every state (see
+    # multiGoalHeuristic.py)
+    if 'multiGoal' not in problem.heuristicInfo:
+        problem.heuristicInfo['multiGoal'] = multiGoalHeuristic.MultiGoalHeuristic(problem.walls, problem.start[1].asList())
+    engine = problem.heuristicInfo['multiGoal']
+    return engine.value(position, engine.maskOfGrid(foodGrid))
 
 class ClosestDotSearchAgent(SearchAgent):
     "Search for all food using a sequence of searches"
     def registerInitialState(self, state):
         self.actions = []
         currentState = state
+        # One finder for the whole loop: its distance field is repaired as food
+        # is eaten instead of starting a fresh search after every segment
+        self.targetFinder = nearestTarget.NearestTargetFinder(state.getWalls(), state.getFood().asList(), cacheDistances=True)
         while(currentState.getFood().count() > 0):
             nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
             self.actions += nextPathSegment
@@ -495,6 +631,7 @@ class ClosestDotSearchAgent(SearchAgent):
                     t = (str(action), str(currentState))
                     raise Exception('findPathToClosestDot returned an illegal move: %s!\n%s' % t)
                 currentState = currentState.generateSuccessor(0, action)
+                self.targetFinder.removeTarget(currentState.getPacmanPosition())
         self.actionIndex = 0
         print('Path found with cost %d.' % len(self.actions))
 
@@ -507,14 +644,69 @@ class ClosestDotSearchAgent(SearchAgent):
         startPosition = gameState.getPacmanPosition()
         food = gameState.getFood()
         walls = gameState.getWalls()
-        problem = AnyFoodSearchProblem(gameState)
-        min_food, min_dist = None, float("inf")
-        food_coords = food.asList()
-        for f in food_coords:
-            dist = mazeDistance(startPosition, f, gameState)
-            if dist < min_dist:
-                min_food, min_dist = f, dist
-        return search.breadthFirstSearch(problem)
+        finder = getattr(self, 'targetFinder', None)
+        if finder is None:
+            finder = nearestTarget.NearestTargetFinder(walls, food.asList())
+        return finder.findPathToNearest(startPosition)
+
+class DStarLiteSearchAgent(ClosestDotSearchAgent):
+    """
+    Eats the dots one segment at a time like ClosestDotSearchAgent, but plans
+    with one D* Lite planner (dstarLite.py) for the whole loop, which repairs
+    only the cells affected by the food eaten since the last segment.  Cells
+    next to ghosts that are not scared cost extra, so on a layout with ghosts
+    Pacman may walk to a dot that is further away but safer.
+
+    > python pacman.py -l bigSearch -p DStarLiteSearchAgent -z .5
+    """
+    def registerInitialState(self, state):
+        self.actions = []
+        currentState = state
+        self.planner = dstarLite.DStarLitePlanner(state.getWalls(), state.getFood().asList())
+        while(currentState.getFood().count() > 0):
+            nextPathSegment = self.findPathToClosestDot(currentState)
+            self.actions += nextPathSegment
+            for action in nextPathSegment:
+                legal = currentState.getLegalActions()
+                if action not in legal:
+                    t = (str(action), str(currentState))
+                    raise Exception('findPathToClosestDot returned an illegal move: %s!\n%s' % t)
+                currentState = currentState.generateSuccessor(0, action)
+                self.planner.removeGoal(currentState.getPacmanPosition())
+        self.actionIndex = 0
+        print('Path found with cost %d.' % len(self.actions))
+
+    def findPathToClosestDot(self, gameState):
+        """
+        Returns a path (a list of actions) to the cheapest dot from gameState,
+        counting the extra cost of cells next to ghosts.
+        """
+        planner = getattr(self, 'planner', None)
+        if planner is None:
+            planner = dstarLite.DStarLitePlanner(gameState.getWalls(), gameState.getFood().asList())
+        planner.setCellCosts(dstarLite.dangerCosts(gameState))
+        return planner.getPath(gameState.getPacmanPosition())
+
+def closestDotSearch(problem):
+    """
+    A greedy plan for problems whose states are (pacmanPosition, foodGrid),
+    like FoodSearchProblem: keep walking to the closest remaining dot.  Fast,
+    but not optimal.
+    """
+    position, food = problem.getStartState()
+    finder = nearestTarget.NearestTargetFinder(problem.walls, food.asList(), cacheDistances=True)
+    finder.removeTarget(position)
+    actions = []
+    while len(finder) > 0:
+        nextPathSegment = finder.findPathToNearest(position)
+        if nextPathSegment is None: return None
+        for action in nextPathSegment:
+            dx, dy = Actions.directionToVector(action)
+            position = (int(position[0] + dx), int(position[1] + dy))
+            finder.removeTarget(position)
+        actions += nextPathSegment
+    problem._expanded += finder._expanded
+    return actions
 
 class AnyFoodSearchProblem(PositionSearchProblem):
     """
@@ -548,8 +740,7 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         complete the problem definition.
         """
         x,y = state
-        food_grid = self.food.asList()
-        return (x, y) in food_grid
+        return self.food[x][y]
 
 def mazeDistance(point1, point2, gameState):
     """
@@ -0,0 +1,471 @@
+# searchBenchmark.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Benchmarks for the search algorithms in search.py, run on the layouts in
+layouts/.
+
+Every algorithm is crossed with every problem type and every heuristic that
+fits that problem, on a selection of layouts.  The junction problem types are
+the position and corners problems over the maze's junction graph (see
+junctionGraph.py), on the same layouts.  Each run records the number of
+nodes expanded, the number of fringe pushes, the wall time, the peak memory
+(from tracemalloc) and the cost of the path found.
+
+> python searchBenchmark.py -o results.json
+> python searchBenchmark.py -b results.json -t 0.2
+
+The second command compares a new run against the stored one and exits with
+status 1 if any measurement got worse by more than 20%.  To compare jump point
+search with A* and the Manhattan heuristic instead:
+
+> python searchBenchmark.py --jps
+
+and to compare the heap fringe of uniform cost search and A* with the integer
+bucket queue and radix heap:
+
+> python searchBenchmark.py --queues
+
+and to compare single-source distance fields from a queue-based BFS with the
+level-at-a-time bitset BFS of bitsetBFS.py:
+
+> python searchBenchmark.py --bfs
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+import bitsetBFS
+import game
+import landmarks
+import layout
+import pacman
+import search
+import searchAgents
+import util
+
+ALGORITHMS = ['dfs', 'bfs', 'ucs', 'astar']
+
+PROBLEMS = {
+    'position': (searchAgents.PositionSearchProblem,
+                 ['nullHeuristic', 'manhattanHeuristic', 'euclideanHeuristic', 'landmarkHeuristic'],
+                 ['tinyMaze', 'mediumMaze', 'bigMaze', 'openMaze', 'contoursMaze']),
+    'corners': (searchAgents.CornersProblem,
+                ['nullHeuristic', 'cornersHeuristic'],
+                ['tinyCorners', 'mediumCorners']),
+    'junctionPosition': (searchAgents.JunctionPositionSearchProblem,
+                         ['nullHeuristic', 'manhattanHeuristic', 'euclideanHeuristic', 'landmarkHeuristic'],
+                         ['tinyMaze', 'mediumMaze', 'bigMaze', 'openMaze', 'contoursMaze']),
+    'junctionCorners': (searchAgents.JunctionCornersProblem,
+                        ['nullHeuristic', 'cornersHeuristic'],
+                        ['tinyCorners', 'mediumCorners']),
+    'food': (searchAgents.FoodSearchProblem,
+             ['nullHeuristic', 'foodHeuristic'],
+             ['testSearch', 'tinySearch', 'trickySearch']),
+}
+
+# Measurements compared against a baseline; for all of them, larger is worse
+METRICS = ['expanded', 'pushes', 'seconds', 'peakMemory', 'cost']
+
+# Wall times below this many seconds are too noisy to flag
+MIN_SECONDS = 0.05
+
+JPS_LAYOUTS = ['mediumMaze', 'bigMaze', 'openMaze', 'contoursMaze', 'openSearch', 'bigSearch']
+
+# (layout, problem, algorithm, heuristic) runs for --queues.  'stayWest' is a
+# PositionSearchProblem with StayWestSearchAgent's cost of 2 ** x per step,
+# whose costs outgrow the buckets and exercise the radix heap fallback.
+QUEUE_RUNS = [('bigMaze', 'position', 'ucs', None),
+              ('bigMaze', 'position', 'astar', 'manhattanHeuristic'),
+              ('openMaze', 'position', 'ucs', None),
+              ('mediumDottedMaze', 'stayWest', 'ucs', None),
+              ('mediumCorners', 'corners', 'ucs', None),
+              ('mediumCorners', 'corners', 'astar', 'cornersHeuristic'),
+              ('trickySearch', 'food', 'astar', 'foodHeuristic')]
+
+QUEUES = ['heap', 'bucket', 'radix']
+
+# Layouts for --bfs, plus generated mazes and open rooms of these (width, height)
+BFS_LAYOUTS = ['mediumMaze', 'bigMaze', 'openMaze', 'contoursMaze', 'bigSearch', 'mediumClassic']
+BFS_MAZE_SIZES = [(101, 101), (201, 201)]
+
+def loadGameState(layoutName):
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    return gameState
+
+def makeProblem(problemName, gameState):
+    problemType = PROBLEMS[problemName][0]
+    if issubclass(problemType, searchAgents.PositionSearchProblem):
+        return problemType(gameState, warn=False, visualize=False)
+    return problemType(gameState)
+
+def lookupFunction(name):
+    if name in dir(search): return getattr(search, name)
+    if name in dir(searchAgents): return getattr(searchAgents, name)
+    raise AttributeError(name + ' is not a function in search.py or searchAgents.py.')
+
+def takesHeuristic(fn):
+    return 'heuristic' in fn.__code__.co_varnames
+
+class PushCounter:
+    """
+    Counts the pushes onto the first util.Stack, util.Queue,
+    util.PriorityQueue, util.BucketQueue or util.RadixHeap created while it
+    is active.  That is the search's own
+    fringe; searches run inside a heuristic (e.g. mazeDistance) make their own
+    fringes later and are not counted.
+
+    with PushCounter() as counter:
+        search.bfs(problem)
+    counter.pushes
+    """
+    def __init__(self):
+        self.pushes = 0
+        self.fringe = None
+        self._originals = []
+
+    def __enter__(self):
+        for cls in [util.Stack, util.Queue, util.PriorityQueue, util.BucketQueue, util.RadixHeap]:
+            for name, wrap in [('__init__', self._wrapInit), ('push', self._wrapPush)]:
+                original = cls.__dict__[name]
+                self._originals.append((cls, name, original))
+                setattr(cls, name, wrap(original))
+        return self
+
+    def __exit__(self, *args):
+        for cls, name, original in self._originals:
+            setattr(cls, name, original)
+        self._originals = []
+
+    def _wrapInit(self, init):
+        counter = self
+        def countedInit(queue, *args, **keyArgs):
+            if counter.fringe is None: counter.fringe = queue
+            return init(queue, *args, **keyArgs)
+        return countedInit
+
+    def _wrapPush(self, push):
+        counter = self
+        def countedPush(queue, *args, **keyArgs):
+            if queue is counter.fringe: counter.pushes += 1
+            return push(queue, *args, **keyArgs)
+        return countedPush
+
+def timeSearch(searchFunction, problem):
+    """
+    Runs searchFunction on problem and returns (actions, expanded, seconds).
+    """
+    starttime = time.time()
+    actions = searchFunction(problem)
+    return actions, problem._expanded, time.time() - starttime
+
+def runOne(layoutName, problemName, algorithm, heuristic, timeout=60, measureMemory=True):
+    """
+    Solves one problem with one configuration and returns a dictionary of
+    measurements.  A run that times out or raises records that in 'error'.
+    """
+    gameState = loadGameState(layoutName)
+    fn = lookupFunction(algorithm)
+    if heuristic is not None:
+        heur = lookupFunction(heuristic)
+        searchFunction = lambda problem: fn(problem, heuristic=heur)
+    else:
+        searchFunction = fn
+    record = {'layout': layoutName, 'problem': problemName, 'algorithm': algorithm,
+              'heuristic': heuristic, 'error': None}
+
+    util.mutePrint()
+    try:
+        problem = makeProblem(problemName, gameState)
+        with PushCounter() as counter:
+            actions, expanded, seconds = util.TimeoutFunction(timeSearch, timeout)(searchFunction, problem)
+        record['expanded'] = expanded
+        record['pushes'] = counter.pushes
+        record['seconds'] = seconds
+        record['cost'] = problem.getCostOfActions(actions)
+        record['peakMemory'] = None
+        if measureMemory:
+            # A separate run, since tracing allocations slows the search down
+            problem = makeProblem(problemName, gameState)
+            tracemalloc.start()
+            try:
+                util.TimeoutFunction(searchFunction, timeout)(problem)
+                record['peakMemory'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except util.TimeoutFunctionException:
+        record['error'] = 'timeout after %d seconds' % timeout
+    except Exception as e:
+        record['error'] = '%s: %s' % (type(e).__name__, e)
+    finally:
+        util.unmutePrint()
+    return record
+
+def configurations(algorithms=ALGORITHMS, problems=None, layouts=None):
+    """
+    Yields (layout, problem, algorithm, heuristic) for every combination that
+    makes sense: heuristics only go with algorithms that take one, and only
+    with the problem they were written for.
+    """
+    for problemName in (problems or PROBLEMS.keys()):
+        problemType, heuristics, defaultLayouts = PROBLEMS[problemName]
+        for layoutName in (layouts or defaultLayouts):
+            for algorithm in algorithms:
+                if takesHeuristic(lookupFunction(algorithm)):
+                    for heuristic in heuristics:
+                        yield layoutName, problemName, algorithm, heuristic
+                else:
+                    yield layoutName, problemName, algorithm, None
+
+def runSuite(algorithms=ALGORITHMS, problems=None, layouts=None, timeout=60, measureMemory=True, verbose=True):
+    results = []
+    for layoutName, problemName, algorithm, heuristic in configurations(algorithms, problems, layouts):
+        record = runOne(layoutName, problemName, algorithm, heuristic, timeout, measureMemory)
+        if verbose: printRecord(record)
+        results.append(record)
+    return results
+
+def recordKey(record):
+    return (record['layout'], record['problem'], record['algorithm'], record['heuristic'])
+
+def compareToBaseline(results, baseline, threshold):
+    """
+    Returns a list of messages, one for each measurement in results that is
+    worse than the matching baseline measurement by more than threshold (a
+    fraction, so 0.2 means 20%).  A run that used to succeed and now fails is
+    always a regression.
+    """
+    regressions = []
+    old = dict((recordKey(record), record) for record in baseline)
+    for record in results:
+        key = recordKey(record)
+        if key not in old: continue
+        before = old[key]
+        name = '%s/%s/%s/%s' % key
+        if record['error'] is not None:
+            if before['error'] is None:
+                regressions.append('%s: %s' % (name, record['error']))
+            continue
+        if before['error'] is not None: continue
+        for metric in METRICS:
+            oldValue, newValue = before.get(metric), record.get(metric)
+            if oldValue is None or newValue is None: continue
+            if metric == 'seconds' and max(oldValue, newValue) < MIN_SECONDS: continue
+            if metric == 'cost':
+                worse = newValue > oldValue
+            else:
+                worse = newValue > oldValue * (1 + threshold)
+            if worse:
+                regressions.append('%s: %s went from %s to %s' % (name, metric, oldValue, newValue))
+    return regressions
+
+def printRecord(record):
+    name = '%-14s %-8s %-6s %-18s' % (record['layout'], record['problem'], record['algorithm'], record['heuristic'] or '-')
+    if record['error'] is not None:
+        print('%s %s' % (name, record['error']))
+        return
+    memory = record['peakMemory']
+    print('%s cost %5d  expanded %7d  pushes %7d  %8.3fs  %s' %
+          (name, record['cost'], record['expanded'], record['pushes'], record['seconds'],
+           '%8.1fKB' % (memory / 1024.0) if memory is not None else '-'))
+
+def compareJumpPointSearch(layoutNames=JPS_LAYOUTS):
+    """
+    Solves the PositionSearchProblem of each layout with aStarSearch and with
+    jumpPointSearch, both using manhattanHeuristic.  Returns one dictionary of
+    measurements per layout.
+    """
+    rows = []
+    for layoutName in layoutNames:
+        gameState = loadGameState(layoutName)
+        row = {'layout': layoutName}
+        for name, fn in [('astar', search.aStarSearch), ('jps', search.jumpPointSearch)]:
+            problem = makeProblem('position', gameState)
+            actions, expanded, seconds = timeSearch(lambda p: fn(p, heuristic=searchAgents.manhattanHeuristic), problem)
+            row[name] = {'cost': problem.getCostOfActions(actions), 'expanded': expanded, 'seconds': seconds}
+        rows.append(row)
+    return rows
+
+def printJumpPointComparison(rows):
+    print('%-14s %8s %10s %10s %10s %10s' % ('layout', 'cost', 'A* exp', 'JPS exp', 'A* sec', 'JPS sec'))
+    for row in rows:
+        astar, jps = row['astar'], row['jps']
+        if astar['cost'] != jps['cost']:
+            print('Warning: jump point search found a path of cost %d instead of %d' % (jps['cost'], astar['cost']))
+        print('%-14s %8d %10d %10d %10.4f %10.4f' % (row['layout'], astar['cost'], astar['expanded'],
+                                                      jps['expanded'], astar['seconds'], jps['seconds']))
+
+def compareQueues(runs=QUEUE_RUNS, queues=QUEUES):
+    """
+    Solves each run with every fringe type in queues.  Returns one dictionary
+    of measurements per run, keyed by fringe type.
+    """
+    rows = []
+    for layoutName, problemName, algorithm, heuristic in runs:
+        gameState = loadGameState(layoutName)
+        row = {'layout': layoutName, 'problem': problemName, 'algorithm': algorithm, 'heuristic': heuristic}
+        fn = lookupFunction(algorithm)
+        for queue in queues:
+            if problemName == 'stayWest':
+                problem = searchAgents.PositionSearchProblem(gameState, lambda pos: 2 ** pos[0], warn=False, visualize=False)
+            else:
+                problem = makeProblem(problemName, gameState)
+            if heuristic is not None:
+                searchFunction = lambda p: fn(p, heuristic=lookupFunction(heuristic), queue=queue)
+            else:
+                searchFunction = lambda p: fn(p, queue=queue)
+            util.mutePrint()
+            try:
+                actions, expanded, seconds = timeSearch(searchFunction, problem)
+            finally:
+                util.unmutePrint()
+            row[queue] = {'cost': problem.getCostOfActions(actions), 'expanded': expanded, 'seconds': seconds}
+        rows.append(row)
+    return rows
+
+def printQueueComparison(rows, queues=QUEUES):
+    print('%-16s %-8s %-6s %-18s %10s ' % ('layout', 'problem', 'search', 'heuristic', 'expanded') +
+          ' '.join(['%10s' % (queue + ' sec') for queue in queues]))
+    for row in rows:
+        costs = set([row[queue]['cost'] for queue in queues])
+        if len(costs) > 1:
+            print('Warning: the fringe types found paths of different costs: %s' % sorted(costs))
+        print('%-16s %-8s %-6s %-18s %10d ' % (row['layout'], row['problem'], row['algorithm'], row['heuristic'] or '-',
+                                               row[queues[0]]['expanded']) +
+              ' '.join(['%10.4f' % row[queue]['seconds'] for queue in queues]))
+
+def randomMazeWalls(width, height, seed=0):
+    """
+    A perfect maze (exactly one path between any two cells) carved by a
+    randomized depth first search, as a wall Grid.
+    """
+    rand = random.Random(seed)
+    walls = game.Grid(width, height, True)
+    walls[1][1] = False
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        options = [(dx, dy) for dx, dy in [(2, 0), (-2, 0), (0, 2), (0, -2)]
+                   if 0 < x + dx < width - 1 and 0 < y + dy < height - 1 and walls[x + dx][y + dy]]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = rand.choice(options)
+        walls[x + dx // 2][y + dy // 2] = False
+        walls[x + dx][y + dy] = False
+        stack.append((x + dx, y + dy))
+    return walls
+
+def openRoomWalls(width, height):
+    "A wall Grid with walls only around the border."
+    walls = game.Grid(width, height, False)
+    for x in range(width):
+        walls[x][0] = walls[x][height - 1] = True
+    for y in range(height):
+        walls[0][y] = walls[width - 1][y] = True
+    return walls
+
+def compareDistanceFields(layoutNames=BFS_LAYOUTS, mazeSizes=BFS_MAZE_SIZES, repeats=5):
+    """
+    Times a single-source distance field from the first open cell of each
+    maze, with landmarks.distancesFrom (one cell at a time) and with
+    bitsetBFS.BitGrid (one level at a time).  Returns one dictionary per maze.
+    """
+    mazes = [(name, layout.getLayout(name).walls) for name in layoutNames]
+    mazes += [('maze%dx%d' % size, randomMazeWalls(*size)) for size in mazeSizes]
+    mazes += [('room%dx%d' % size, openRoomWalls(*size)) for size in mazeSizes]
+    rows = []
+    for name, walls in mazes:
+        source = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]][0]
+        grid = bitsetBFS.BitGrid(walls)
+        row = {'layout': name, 'cells': walls.width * walls.height - walls.count()}
+        for method, fn in [('queue', lambda: landmarks.distancesFrom(walls, source)),
+                           ('bitset', lambda: grid.distances([source]))]:
+            starttime = time.time()
+            for i in range(repeats): fn()
+            row[method] = (time.time() - starttime) / repeats
+        row['equal'] = landmarks.distancesFrom(walls, source) == grid.distances([source])
+        rows.append(row)
+    return rows
+
+def printDistanceFieldComparison(rows):
+    print('%-16s %8s %10s %10s %8s' % ('layout', 'cells', 'queue sec', 'bitset sec', 'speedup'))
+    for row in rows:
+        if not row['equal']:
+            print('Warning: the bitset distances differ on %s' % row['layout'])
+        print('%-16s %8d %10.5f %10.5f %7.2fx' % (row['layout'], row['cells'], row['queue'], row['bitset'],
+                                                 row['queue'] / row['bitset']))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('python searchBenchmark.py <options>')
+    parser.add_option('-a', '--algorithms', dest='algorithms', default=','.join(ALGORITHMS),
+                      help='comma separated search functions from search.py [Default: %default]')
+    parser.add_option('-p', '--problems', dest='problems', default=','.join(sorted(PROBLEMS.keys())),
+                      help='comma separated problem types [Default: %default]')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated layouts, instead of each problem\'s default layouts')
+    parser.add_option('-o', '--output', dest='output', default=None,
+                      help='write the results to this JSON file')
+    parser.add_option('-b', '--baseline', dest='baseline', default=None,
+                      help='compare the results against this JSON file')
+    parser.add_option('-t', '--threshold', dest='threshold', type='float', default=0.2,
+                      help='fraction by which a measurement may grow before it counts as a regression [Default: %default]')
+    parser.add_option('--timeout', dest='timeout', type='int', default=60,
+                      help='seconds allowed for each run [Default: %default]')
+    parser.add_option('--noMemory', dest='measureMemory', action='store_false', default=True,
+                      help='skip the tracemalloc run that measures peak memory')
+    parser.add_option('--jps', dest='jps', action='store_true', default=False,
+                      help='only compare jump point search with A*')
+    parser.add_option('--queues', dest='queues', action='store_true', default=False,
+                      help='only compare the heap, bucket and radix heap fringes')
+    parser.add_option('--bfs', dest='bfs', action='store_true', default=False,
+                      help='only compare queue and bitset breadth first distance fields')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    if options.jps:
+        printJumpPointComparison(compareJumpPointSearch())
+        sys.exit(0)
+    if options.queues:
+        printQueueComparison(compareQueues())
+        sys.exit(0)
+    if options.bfs:
+        printDistanceFieldComparison(compareDistanceFields())
+        sys.exit(0)
+
+    layouts = options.layouts.split(',') if options.layouts else None
+    results = runSuite(options.algorithms.split(','), options.problems.split(','), layouts,
+                       options.timeout, options.measureMemory)
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        regressions = compareToBaseline(results, baseline, options.threshold)
+        for message in regressions:
+            print('REGRESSION: ' + message)
+        if regressions:
+            sys.exit(1)
+        print('No regressions beyond %d%%' % (options.threshold * 100))
@@ -0,0 +1,91 @@
+# solutionCache.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+An on-disk cache of the plans SearchAgent finds, so replaying a layout with
+the same search does not solve it again.
+
+A plan is stored under a hash of everything that could change it: the
+layout, Pacman's position and the remaining food, the problem type, the
+search function, the heuristic, the other search arguments, and the source
+code of every Python file in this directory (the searches and heuristics
+import a good many of them).  Editing any of them changes every key, so
+stale plans are simply never found again.
+
+> python pacman.py -l bigMaze -p SearchAgent -a fn=astar,heuristic=manhattanHeuristic,cacheDir=searchCache
+
+Each entry is a small JSON file named after its key.  Delete the directory to
+clear the cache.
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+_sourceHash = None
+
+def sourceHash():
+    "A hash of the source of every Python file in this directory, computed once per run."
+    global _sourceHash
+    if _sourceHash is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for path in sorted(glob.glob(os.path.join(directory, '*.py'))):
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _sourceHash = digest.hexdigest()
+    return _sourceHash
+
+def stateHash(gameState):
+    "A hash of the layout, Pacman's position and the remaining food of gameState."
+    digest = hashlib.sha256()
+    digest.update(str(gameState.data.layout).encode())
+    digest.update(repr(gameState.getPacmanPosition()).encode())
+    digest.update(str(gameState.getFood()).encode())
+    digest.update(repr(sorted(gameState.getCapsules())).encode())
+    return digest.hexdigest()
+
+class SolutionCache:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def key(self, gameState, problemName, searchName, heuristicName, searchArgs):
+        description = json.dumps([stateHash(gameState), problemName, searchName, heuristicName,
+                                  sorted(searchArgs.items()), sourceHash()])
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def load(self, key):
+        """
+        Returns the stored dictionary with 'actions', 'cost' and 'expanded',
+        or None if there is none (or it cannot be read).
+        """
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def store(self, key, actions, cost, expanded):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        # Write to a temporary file first so a crash never leaves half an entry
+        temporary = self._path(key) + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'actions': list(actions), 'cost': cost, 'expanded': expanded}, f)
+        os.replace(temporary, self._path(key))
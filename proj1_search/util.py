@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq, random
+import collections
 
 
 class FixedRandom:
@@ -221,6 +222,123 @@ class PriorityQueueWithFunction(PriorityQueue):
         "Adds an item to the queue with priority from the priority function"
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
+def integerPriority(priority):
+    "Checks that priority is a non-negative integer (an int or an integral float) and returns it as an int."
+    if priority < 0 or priority != int(priority):
+        raise ValueError('Priority %s is not a non-negative integer' % priority)
+    return int(priority)
+
+class BucketQueue:
+    """
+      A priority queue for non-negative integer priorities (Dial's algorithm).
+      There is one first-in-first-out bucket per priority value and a cursor
+      at the lowest bucket that may hold items, so push and pop take constant
+      amortized time instead of the heap's O(log n).  Items with equal
+      priority come out in the order they were pushed, like PriorityQueue.
+
+      A bucket per value only pays off while priorities are small.  The first
+      time a priority of maxPriority or more is pushed, every item moves to a
+      RadixHeap, which from then on requires priorities never to drop below
+      the last one popped.
+    """
+    def  __init__(self, maxPriority=1 << 16):
+        self.buckets = []
+        self.cursor = 0
+        self.size = 0
+        self.maxPriority = maxPriority
+        self.radixHeap = None
+
+    def push(self, item, priority):
+        priority = integerPriority(priority)
+        if self.radixHeap is None and priority >= self.maxPriority:
+            self.radixHeap = RadixHeap(self.cursor)
+            for bucketPriority in range(self.cursor, len(self.buckets)):
+                for bucketItem in self.buckets[bucketPriority]:
+                    self.radixHeap.push(bucketItem, bucketPriority)
+            self.buckets = []
+        if self.radixHeap is not None:
+            self.radixHeap.push(item, priority)
+            return
+        while len(self.buckets) <= priority:
+            self.buckets.append(collections.deque())
+        self.buckets[priority].append(item)
+        if priority < self.cursor: self.cursor = priority
+        self.size += 1
+
+    def pop(self):
+        if self.radixHeap is not None:
+            return self.radixHeap.pop()
+        if self.size == 0:
+            raise IndexError('pop from an empty BucketQueue')
+        while not self.buckets[self.cursor]:
+            self.cursor += 1
+        self.size -= 1
+        return self.buckets[self.cursor].popleft()
+
+    def isEmpty(self):
+        if self.radixHeap is not None:
+            return self.radixHeap.isEmpty()
+        return self.size == 0
+
+class RadixHeap:
+    """
+      A monotone priority queue for non-negative integer priorities: no
+      priority pushed may be lower than the last one popped, which holds for
+      uniform cost search and for A* with a consistent heuristic.  Bucket i
+      holds the items whose priority first differs from the last popped one
+      in bit i-1, so an item is moved at most once per bit of its priority
+      however large the priorities get.
+    """
+    def  __init__(self, last=0):
+        self.buckets = [collections.deque()]
+        self.last = last
+        self.size = 0
+
+    def push(self, item, priority):
+        priority = integerPriority(priority)
+        if priority < self.last:
+            raise ValueError('Priority %d is below the last priority popped (%d)' % (priority, self.last))
+        index = (priority ^ self.last).bit_length()
+        while len(self.buckets) <= index:
+            self.buckets.append(collections.deque())
+        self.buckets[index].append((priority, item))
+        self.size += 1
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError('pop from an empty RadixHeap')
+        if not self.buckets[0]:
+            index = 1
+            while not self.buckets[index]: index += 1
+            bucket = self.buckets[index]
+            self.buckets[index] = collections.deque()
+            self.last = min([priority for priority, item in bucket])
+            for priority, item in bucket:
+                self.buckets[(priority ^ self.last).bit_length()].append((priority, item))
+        self.size -= 1
+        return self.buckets[0].popleft()[1]
+
+    def isEmpty(self):
+        return self.size == 0
+
+class BucketQueueWithFunction(BucketQueue):
+    "A BucketQueue with the push signature of PriorityQueueWithFunction."
+    def  __init__(self, priorityFunction):
+        self.priorityFunction = priorityFunction
+        BucketQueue.__init__(self)
+
+    def push(self, item):
+        BucketQueue.push(self, item, self.priorityFunction(item))
+
+class RadixHeapWithFunction(RadixHeap):
+    "A RadixHeap with the push signature of PriorityQueueWithFunction."
+    def  __init__(self, priorityFunction):
+        self.priorityFunction = priorityFunction
+        RadixHeap.__init__(self)
+
+    def push(self, item):
+        RadixHeap.push(self, item, self.priorityFunction(item))
+
 
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
@@ -0,0 +1,209 @@
+# evaluationFeatures.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Cached, incrementally updated features for the evaluation functions in
+multiAgents.py.
+
+A depth-limited search evaluates far more leaves than it visits other nodes,
+and a leaf differs from its parent by a single agent's move.  getFeatures
+returns the Features of a state:
+
+  pacman            Pacman's cell
+  food              the cells with food, as a frozenset
+  nearestFood       the maze distance to the nearest food (0 if there is none)
+  ghostDistances    the maze distance to each ghost
+  capsuleDistances  the maze distance to each capsule
+
+Maze distances come from a DistanceOracle, which runs a breadth first search
+from a cell the first time it is asked about that cell.  A cell Pacman cannot
+reach, like food walled off in a pocket, is at distance width * height of the
+maze, further than any path in it.  Features are cached
+by transpositionTable.stateHash.  A state made by generateSuccessor in the
+search agents remembers its parent (as parentState), and its features are
+then updated from the parent's: a ghost's move only changes that ghost's
+distance, and Pacman's move removes at most one food and moves the nearest
+food by at most one step, so the food needn't be read from the grid.  The
+features of a SearchState (see searchState.py) come from its set of food.
+
+features = getFeatures(gameState)
+features.nearestFood, features.foodCount(), min(features.ghostDistances)
+"""
+
+from game import Actions
+from util import nearestPoint
+import searchState
+import transpositionTable
+
+class DistanceOracle:
+    def __init__(self, walls):
+        self.walls = walls
+        self.rows = {} # source cell -> {cell: maze distance}
+        self.unreachable = walls.width * walls.height # Longer than any path
+
+    def distances(self, source):
+        "The maze distance from source to every cell reachable from it."
+        row = self.rows.get(source)
+        if row is None:
+            row = self.rows[source] = {source: 0}
+            frontier = [source]
+            while frontier:
+                nextFrontier = []
+                for cell in frontier:
+                    distance = row[cell] + 1
+                    for neighbor in Actions.getLegalNeighbors(cell, self.walls):
+                        if neighbor not in row:
+                            row[neighbor] = distance
+                            nextFrontier.append(neighbor)
+                frontier = nextFrontier
+        return row
+
+    def distance(self, source, target):
+        return self.distances(source).get(target, self.unreachable)
+
+class Features:
+    __slots__ = ('pacman', 'food', 'nearestFood', 'nearestFoodCell', 'ghostDistances', 'capsules',
+                 'capsuleDistances')
+
+    def foodCount(self):
+        return len(self.food)
+
+class FeatureCache:
+    def __init__(self, size=1 << 18):
+        """
+        A cache of up to size states' Features; it is emptied when full.
+        """
+        self.size = size
+        self.walls = None
+        self.oracle = None
+        self.entries = {}
+        self.lookups = self.hits = self.updates = 0
+
+    def getFeatures(self, gameState):
+        walls = gameState.getWalls()
+        if walls is not self.walls:
+            self.walls = walls
+            self.oracle = DistanceOracle(walls)
+            self.entries = {}
+        return self._features(gameState)
+
+    def _features(self, gameState):
+        self.lookups += 1
+        key = transpositionTable.stateHash(gameState)
+        features = self.entries.get(key)
+        if features is not None:
+            self.hits += 1
+            return features
+        parent = getattr(gameState, 'parentState', None)
+        if parent is None:
+            features = self.compute(gameState)
+        else:
+            self.updates += 1
+            features = self.update(gameState, self._features(parent))
+        if len(self.entries) >= self.size: self.entries = {}
+        self.entries[key] = features
+        return features
+
+    def compute(self, gameState):
+        "The features of gameState, from scratch."
+        features = Features()
+        features.pacman = gameState.getPacmanPosition()
+        if isinstance(gameState, searchState.SearchState):
+            features.food = frozenset(gameState.food)
+        else:
+            features.food = frozenset(gameState.getFood().asList())
+        features.nearestFood, features.nearestFoodCell = self.nearestFood(features.pacman, features.food)
+        features.ghostDistances = self.ghostDistances(gameState, features.pacman)
+        features.capsules = tuple(gameState.getCapsules())
+        features.capsuleDistances = self.capsuleDistances(features.pacman, features.capsules)
+        return features
+
+    def update(self, gameState, parent):
+        "The features of gameState, from those of its parent state."
+        data = gameState.data
+        index = data._agentMoved
+        features = Features()
+        if index != 0:
+            # Only this ghost moved (or was eaten and sent home)
+            features.pacman, features.food = parent.pacman, parent.food
+            features.nearestFood, features.nearestFoodCell = parent.nearestFood, parent.nearestFoodCell
+            features.capsules, features.capsuleDistances = parent.capsules, parent.capsuleDistances
+            ghostDistances = list(parent.ghostDistances)
+            ghostDistances[index - 1] = self.oracle.distance(parent.pacman,
+                                                             nearestPoint(gameState.getGhostPosition(index)))
+            features.ghostDistances = tuple(ghostDistances)
+            return features
+
+        features.pacman = pacman = gameState.getPacmanPosition()
+        features.food = parent.food
+        if data._foodEaten is not None:
+            features.food = parent.food - frozenset([data._foodEaten])
+        # One step changes the distance to any food by at most one
+        features.nearestFood, features.nearestFoodCell = self.nearestFood(pacman, features.food,
+                                                                          parent.nearestFoodCell,
+                                                                          parent.nearestFood - 1)
+        features.ghostDistances = self.ghostDistances(gameState, pacman)
+        features.capsules = parent.capsules
+        if data._capsuleEaten is not None:
+            features.capsules = tuple([capsule for capsule in parent.capsules if capsule != data._capsuleEaten])
+        features.capsuleDistances = self.capsuleDistances(pacman, features.capsules)
+        return features
+
+    def nearestFood(self, pacman, food, guess=None, lowerBound=0):
+        """
+        The maze distance from pacman to the nearest of food, and that food;
+        the search stops at a food no further than lowerBound, and starts
+        from guess, the previous nearest food, if it is still there.
+        """
+        if not food: return 0, None
+        row, unreachable = self.oracle.distances(pacman), self.oracle.unreachable
+        best, bestCell = float("inf"), None
+        if guess in food:
+            best, bestCell = row.get(guess, unreachable), guess
+            if best <= lowerBound: return best, bestCell
+        for cell in food:
+            distance = row.get(cell, unreachable)
+            if distance < best:
+                best, bestCell = distance, cell
+                if best <= lowerBound: break
+        return best, bestCell
+
+    def ghostDistances(self, gameState, pacman):
+        # A scared ghost may be half way between cells
+        row, unreachable = self.oracle.distances(pacman), self.oracle.unreachable
+        return tuple([row.get(nearestPoint(position), unreachable) for position in gameState.getGhostPositions()])
+
+    def capsuleDistances(self, pacman, capsules):
+        row, unreachable = self.oracle.distances(pacman), self.oracle.unreachable
+        return tuple([row.get(capsule, unreachable) for capsule in capsules])
+
+    def hitRate(self):
+        "The fraction of lookups that found the features in the cache."
+        if self.lookups == 0: return 0.0
+        return self.hits / float(self.lookups)
+
+# The cache getFeatures uses
+featureCache = FeatureCache()
+
+def getFeatures(gameState):
+    return featureCache.getFeatures(gameState)
+
+def generateSuccessor(gameState, index, action):
+    """
+    gameState.generateSuccessor(index, action), which remembers gameState as
+    its parent, so that its features are updated from gameState's.
+    """
+    succ = gameState.generateSuccessor(index, action)
+    succ.parentState = gameState
+    return succ
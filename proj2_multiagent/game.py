@@ -620,6 +620,10 @@ class Game:
                 self.unmute()
                 self._agentCrash(i, quiet=True)
                 return
+            if ("setTimeLimits" in dir(agent)):
+                # Let agents that budget their own time see the limits they play under
+                agent.setTimeLimits(self.rules.getMoveTimeout(i), self.rules.getMoveWarningTime(i),
+                                    self.rules.getMaxTotalTime(i))
             if ("registerInitialState" in dir(agent)):
                 self.mute(i)
                 if self.catchExceptions:
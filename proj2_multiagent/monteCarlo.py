@@ -0,0 +1,344 @@
+# monteCarlo.py
+# -------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Monte Carlo tree search for MonteCarloAgent in multiAgents.py.
+
+Each playout walks down a tree of GameStates built with generateSuccessor
+to a leaf, scores the leaf and adds the score to every node on the way.  A
+leaf's successors are only generated once it has been scored expandAfter
+times, since generateSuccessor costs more than a rollout.
+
+Pacman's moves are picked by UCT: the move with the best mean score (scaled
+to the range seen in this search) plus an exploration bonus that shrinks as
+the move is tried.  The ghosts' joint move is sampled at random; a node keeps
+about widening * visits ** WIDENING_EXPONENT distinct outcomes (progressive
+widening) and otherwise replays one it has already seen, so the tree goes
+deep even with four ghosts.
+
+A leaf is scored by one of the rollout policies
+
+  random      Pacman and the ghosts move at random for rolloutDepth moves
+  greedy      as random, but Pacman eats adjacent food, avoids stepping next
+              to a dangerous ghost and does not turn back
+  evaluation  no rollout: the evaluation function scores the node itself
+
+Rollouts do not use GameState, which copies and hashes the whole state on
+every move, but a RolloutState that is changed in place and follows the rules
+closely enough to score a position (scared ghosts move every other move
+instead of at half speed).
+
+After a move, the subtree of the move played is kept, and the part of it
+that matches the ghosts' actual reply becomes the next root.
+
+> python pacman.py -p MonteCarloAgent -l originalClassic -a budget=0.5,rollout=greedy
+"""
+
+import math
+import random
+import time
+from game import Actions
+from game import Directions
+from util import nearestPoint
+import evaluationFeatures
+
+ROLLOUTS = ['random', 'greedy', 'evaluation']
+
+WIDENING_EXPONENT = 0.5
+
+# As in pacman.py
+SCARED_TIME = 40
+TIME_PENALTY = 1
+FOOD_SCORE, WIN_SCORE, LOSE_SCORE, GHOST_SCORE = 10, 500, -500, 200
+
+MOVES = [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]
+
+class Maze:
+    """
+    The moves from every open cell of a layout, as lists of (direction, next
+    cell), and a ghost's legal moves from each cell and direction; nothing in
+    a rollout needs the walls themselves.
+    """
+    def __init__(self, walls):
+        self.walls = walls
+        self.moves = {}
+        for x in range(walls.width):
+            for y in range(walls.height):
+                if walls[x][y]: continue
+                self.moves[(x, y)] = []
+                for direction in MOVES:
+                    dx, dy = Actions.directionToVector(direction)
+                    nextCell = (x + int(dx), y + int(dy))
+                    if not walls[nextCell[0]][nextCell[1]]:
+                        self.moves[(x, y)].append((direction, nextCell))
+        self.ghostMoves = {}
+        for cell, moves in self.moves.items():
+            for direction in MOVES + [Directions.STOP]:
+                # Ghosts turn back only in a dead end
+                reverse = Actions.reverseDirection(direction)
+                self.ghostMoves[(cell, direction)] = [move for move in moves if move[0] != reverse] or moves
+
+class RolloutState:
+    """
+    The state of a game during a rollout, changed in place by advance.
+    Ghosts are [cell, direction, scared timer, start cell] lists.  foodCells
+    holds every cell that may still have food in gameState, e.g. the food of
+    an earlier state of the game, which is quicker to check than the grid.
+    """
+    def __init__(self, gameState, maze, foodCells):
+        self.maze = maze
+        self.pacman = gameState.getPacmanPosition()
+        self.direction = gameState.getPacmanState().configuration.direction
+        self.ghosts = [[nearestPoint(ghost.getPosition()), ghost.configuration.direction, ghost.scaredTimer,
+                        ghost.start.getPosition()] for ghost in gameState.getGhostStates()]
+        food = gameState.getFood().data
+        self.food = set([(x, y) for x, y in foodCells if food[x][y]])
+        self.capsules = set(gameState.getCapsules())
+        self.score = gameState.getScore()
+        self.moves = 0
+        self.over = False
+
+    def pacmanMoves(self):
+        return self.maze.moves[self.pacman]
+
+    def dangerous(self, cell):
+        "Whether a ghost that is not scared is on or next to cell."
+        for ghost in self.ghosts:
+            if ghost[2] == 0 and abs(ghost[0][0] - cell[0]) + abs(ghost[0][1] - cell[1]) <= 1:
+                return True
+        return False
+
+    def advance(self, move, rand):
+        """
+        Pacman makes move, a (direction, next cell) pair, then every ghost
+        makes a random legal move.
+        """
+        self.direction, self.pacman = move
+        self.score -= TIME_PENALTY
+        if self.pacman in self.food:
+            self.food.remove(self.pacman)
+            self.score += FOOD_SCORE
+            if not self.food:
+                self.score += WIN_SCORE
+                self.over = True
+                return
+        if self.pacman in self.capsules:
+            self.capsules.remove(self.pacman)
+            for ghost in self.ghosts: ghost[2] = SCARED_TIME
+        self.moves += 1
+        ghostMoves = self.maze.ghostMoves
+        for ghost in self.ghosts:
+            if self.collide(ghost): return
+            if ghost[2] == 0 or self.moves % 2 == 0:
+                ghost[1], ghost[0] = rand.choice(ghostMoves[(ghost[0], ghost[1])])
+            if ghost[2] > 0: ghost[2] -= 1
+            if self.collide(ghost): return
+
+    def collide(self, ghost):
+        "Resolves Pacman meeting ghost; returns whether the game is lost."
+        if ghost[0] != self.pacman: return False
+        if ghost[2] > 0:
+            self.score += GHOST_SCORE
+            ghost[0], ghost[1], ghost[2] = ghost[3], Directions.STOP, 0
+            return False
+        self.score += LOSE_SCORE
+        self.over = True
+        return True
+
+def randomMove(state, rand):
+    return rand.choice(state.pacmanMoves())
+
+def greedyMove(state, rand):
+    moves = state.pacmanMoves()
+    safe = [move for move in moves if not state.dangerous(move[1])] or moves
+    eating = [move for move in safe if move[1] in state.food or move[1] in state.capsules]
+    if eating: return rand.choice(eating)
+    reverse = Actions.reverseDirection(state.direction)
+    return rand.choice([move for move in safe if move[0] != reverse] or safe)
+
+ROLLOUT_POLICIES = {'random': randomMove, 'greedy': greedyMove}
+
+class DecisionNode:
+    "A state in which Pacman moves; children maps his actions to ChanceNodes."
+    __slots__ = ('state', 'visits', 'total', 'children', 'untried')
+
+    def __init__(self, state):
+        self.state = state
+        self.visits = 0
+        self.total = 0.0
+        self.children = {}
+        self.untried = None # The actions not yet in children, once expanded
+
+class ChanceNode:
+    """
+    The state after one of Pacman's moves, in which the ghosts move.
+    outcomes maps the ghosts' joint moves to DecisionNodes, and draws holds
+    every joint move sampled here, so each is replayed as often as drawn.
+    """
+    __slots__ = ('state', 'visits', 'total', 'outcomes', 'draws')
+
+    def __init__(self, state):
+        self.state = state
+        self.visits = 0
+        self.total = 0.0
+        self.outcomes = {}
+        self.draws = []
+
+def isTerminal(gameState):
+    return gameState.isWin() or gameState.isLose()
+
+class MonteCarloTreeSearch:
+    def __init__(self, evaluationFunction, rollout='greedy', rolloutDepth=30, exploration=1.0, widening=1.0,
+                 expandAfter=1, seed=0):
+        if rollout not in ROLLOUTS:
+            raise AttributeError(rollout + ' is not a rollout policy; use ' + ', '.join(ROLLOUTS) + '.')
+        self.evaluationFunction = evaluationFunction
+        self.rolloutPolicy = ROLLOUT_POLICIES.get(rollout)
+        self.rolloutDepth = rolloutDepth
+        self.exploration = exploration
+        self.widening = widening
+        # The evaluation function gives a node the same score every time
+        self.expandAfter = expandAfter if self.rolloutPolicy is not None else 1
+        self.random = random.Random(seed)
+        self.maze = None
+        self.root = None
+        self.played = None # The ChanceNode of the move played last
+        self.reset()
+
+    def reset(self):
+        "Forgets the tree and the statistics, e.g. before a new game."
+        self.root = self.played = None
+        self.playouts = self.moves = self.reusedVisits = 0
+        self.seconds = 0.0
+
+    def findRoot(self, gameState):
+        """
+        The node for gameState below the move played last, which keeps its
+        subtree, or a new one.
+        """
+        if self.played is not None:
+            for node in self.played.outcomes.values():
+                if node.state == gameState:
+                    self.reusedVisits += node.visits
+                    return node
+        return DecisionNode(gameState)
+
+    def search(self, gameState, deadline, maxPlayouts=0):
+        """
+        Runs playouts from gameState until time.time() passes deadline (if
+        any) or maxPlayouts (if any) have run, and returns the action tried
+        most often at the root.  At least one playout is always run.
+        """
+        starttime = time.time()
+        walls = gameState.getWalls()
+        if self.maze is None or self.maze.walls != walls:
+            self.maze = Maze(walls)
+        self.root = self.findRoot(gameState)
+        self.foodCells = gameState.getFood().asList()
+        self.low, self.high = float("inf"), float("-inf")
+        playouts = 0
+        while True:
+            self.playout(self.root)
+            playouts += 1
+            if maxPlayouts and playouts >= maxPlayouts: break
+            if deadline is not None and time.time() > deadline: break
+        self.playouts += playouts
+        self.moves += 1
+        self.seconds += time.time() - starttime
+
+        children = self.root.children
+        action = max(children, key=lambda action: (children[action].visits,
+                                                    children[action].total / children[action].visits))
+        self.played = children[action]
+        return action
+
+    def playout(self, root):
+        """
+        Walks down from root to a leaf (a node visited fewer than expandAfter
+        times) or the end of the game, scores it and adds the score to the
+        nodes on the way.
+        """
+        node, path = root, [root]
+        while True:
+            if isTerminal(node.state):
+                value = node.state.getScore()
+                break
+            if node.visits < self.expandAfter and node is not root:
+                value = self.evaluate(node.state)
+                break
+            if node.untried is None:
+                node.untried = node.state.getLegalActions(0)
+                self.random.shuffle(node.untried)
+            if node.untried:
+                action = node.untried.pop()
+                chance = node.children[action] = ChanceNode(evaluationFeatures.generateSuccessor(node.state, 0, action))
+            else:
+                chance = self.select(node)
+            path.append(chance)
+            if isTerminal(chance.state):
+                value = chance.state.getScore()
+                break
+            node = self.sampleOutcome(chance)
+            path.append(node)
+        self.low, self.high = min(self.low, value), max(self.high, value)
+        for visited in path:
+            visited.visits += 1
+            visited.total += value
+
+    def select(self, node):
+        "The ChanceNode of the UCT choice of Pacman's move from node."
+        span = self.high - self.low
+        logVisits = math.log(node.visits)
+        def upperBound(chance):
+            mean = (chance.total / chance.visits - self.low) / span if span > 0 else 0.5
+            return mean + self.exploration * math.sqrt(logVisits / chance.visits)
+        return max(node.children.values(), key=upperBound)
+
+    def sampleOutcome(self, chance):
+        """
+        Returns the node for the ghosts' joint move from chance: a newly
+        sampled one while progressive widening allows another outcome, else
+        one of the outcomes drawn so far.
+        """
+        widened = math.ceil(self.widening * chance.visits ** WIDENING_EXPONENT)
+        if len(chance.outcomes) >= widened and chance.draws:
+            return chance.outcomes[self.random.choice(chance.draws)]
+        state, moves = chance.state, []
+        for index in range(1, state.getNumAgents()):
+            if isTerminal(state): break
+            action = self.random.choice(state.getLegalActions(index))
+            moves.append(action)
+            state = evaluationFeatures.generateSuccessor(state, index, action)
+        moves = tuple(moves)
+        chance.draws.append(moves)
+        if moves not in chance.outcomes:
+            chance.outcomes[moves] = DecisionNode(state)
+        return chance.outcomes[moves]
+
+    def evaluate(self, gameState):
+        "The score of a leaf, by the rollout policy."
+        if isTerminal(gameState):
+            return gameState.getScore()
+        if self.rolloutPolicy is None:
+            return self.evaluationFunction(gameState)
+        state = RolloutState(gameState, self.maze, self.foodCells)
+        policy, rand = self.rolloutPolicy, self.random
+        for i in range(self.rolloutDepth):
+            state.advance(policy(state, rand), rand)
+            if state.over: break
+        return state.score
+
+    def playoutsPerSecond(self):
+        if self.seconds == 0: return 0.0
+        return self.playouts / self.seconds
@@ -0,0 +1,140 @@
+# moveOrdering.py
+# ---------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Move ordering for AlphaBetaAgent.
+
+Alpha-beta pruning cuts off the most when the best move is tried first.  A
+MoveOrderer puts first the moves the search already believes in (the
+principal variation and the transposition table's best move), and sorts the
+rest with any of
+
+  killer   the last two moves that caused a cutoff at the same ply
+  history  how often, weighted by depth, a move of this agent from this
+           position caused a cutoff anywhere in the search
+  static   a cheap guess from the board: Pacman prefers food and capsules and
+           avoids stepping next to a dangerous ghost; ghosts prefer to close in
+           on Pacman (or run away when scared)
+
+It also counts how often a cutoff came from the first move tried, which is
+close to 100% when the ordering is good.
+
+> python pacman.py -p AlphaBetaAgent -l mediumClassic -a depth=3,ordering=killer+history+static
+"""
+
+from game import Actions
+from game import Directions
+import util
+
+HEURISTICS = ['killer', 'history', 'static']
+
+def parseOrdering(names):
+    """
+    Turns an agent argument such as 'killer+history' or 'all' into a list of
+    heuristic names.
+    """
+    if names == 'all': return list(HEURISTICS)
+    heuristics = [name for name in names.split('+') if name]
+    for name in heuristics:
+        if name not in HEURISTICS:
+            raise AttributeError(name + ' is not a move ordering; use ' + ', '.join(HEURISTICS) + ' or all.')
+    return heuristics
+
+class MoveOrderer:
+    def __init__(self, heuristics=HEURISTICS):
+        self.useKillers = 'killer' in heuristics
+        self.useHistory = 'history' in heuristics
+        self.useStatic = 'static' in heuristics
+        self.killers = {} # ply -> the last two moves that caused a cutoff there
+        self.history = util.Counter() # (agent, position, action) -> depth-weighted cutoffs
+        self.cutoffs = self.firstMoveCutoffs = 0
+
+    def newSearch(self):
+        """
+        Starts the search for a new move.  Killers are forgotten, since plies
+        now mean different positions; history is halved, so that it follows
+        the game.
+        """
+        self.killers = {}
+        for key in self.history:
+            self.history[key] /= 2.0
+
+    def order(self, gameState, index, ply, actions, firstMoves=()):
+        """
+        Returns actions with the legal moves in firstMoves first, then killers,
+        then the others from most to least promising.
+        """
+        ordered = []
+        for action in firstMoves:
+            if action in actions and action not in ordered:
+                ordered.append(action)
+        if self.useKillers:
+            for action in self.killers.get(ply, ()):
+                if action in actions and action not in ordered:
+                    ordered.append(action)
+        rest = [action for action in actions if action not in ordered]
+        if len(rest) > 1 and (self.useHistory or self.useStatic):
+            position = agentPosition(gameState, index)
+            scores = {}
+            for action in rest:
+                history = self.history[(index, position, action)] if self.useHistory else 0
+                static = staticScore(gameState, index, position, action) if self.useStatic else 0
+                scores[action] = (history, static)
+            # sorted is stable, so ties keep getLegalActions' order
+            rest = sorted(rest, key=lambda action: scores[action], reverse=True)
+        return ordered + rest
+
+    def recordCutoff(self, gameState, index, ply, depth, action, moveNumber):
+        """
+        Records that action, the moveNumber-th move tried (from 0), caused a
+        cutoff with depth rounds of search left.
+        """
+        self.cutoffs += 1
+        if moveNumber == 0: self.firstMoveCutoffs += 1
+        if self.useKillers:
+            killers = self.killers.get(ply, ())
+            if action not in killers:
+                self.killers[ply] = (action,) + killers[:1]
+        if self.useHistory:
+            self.history[(index, agentPosition(gameState, index), action)] += depth * depth
+
+    def firstMoveCutoffRate(self):
+        "The fraction of cutoffs caused by the first move tried."
+        if self.cutoffs == 0: return 0.0
+        return self.firstMoveCutoffs / float(self.cutoffs)
+
+def agentPosition(gameState, index):
+    if index == 0: return gameState.getPacmanPosition()
+    return gameState.getGhostPosition(index)
+
+def staticScore(gameState, index, position, action):
+    """
+    A cheap estimate of how good action is for agent index, from the cell it
+    leads to; higher is better.  STOP is always last.
+    """
+    if action == Directions.STOP: return -1000
+    dx, dy = Actions.directionToVector(action)
+    nextPosition = (int(position[0] + dx), int(position[1] + dy))
+    if index == 0:
+        score = 0
+        if gameState.hasFood(*nextPosition): score += 1
+        if nextPosition in gameState.getCapsules(): score += 2
+        for ghost in gameState.getGhostStates():
+            if ghost.scaredTimer == 0 and util.manhattanDistance(nextPosition, ghost.getPosition()) <= 1:
+                score -= 10
+        return score
+    distance = util.manhattanDistance(nextPosition, gameState.getPacmanPosition())
+    if gameState.getGhostState(index).scaredTimer > 0:
+        return distance
+    return -distance
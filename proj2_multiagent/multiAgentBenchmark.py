@@ -0,0 +1,163 @@
+# multiAgentBenchmark.py
+# ----------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Benchmarks for the adversarial search agents in multiAgents.py.
+
+Positions are taken from games on the four-ghost layouts in which every
+agent moves at random (with a fixed seed), so each agent configuration is
+timed on the same positions.
+
+> python multiAgentBenchmark.py --sampling
+
+times depth-3 ExpectimaxAgent moves with exact chance nodes and with sparse
+sampling, against the rules' move timeout.  For each configuration it reports
+the mean and slowest move time, how often the move matches the exact search,
+and how far the root value is from the exact one.  Exact searches that run
+out of time are reported as such; the sampled ones are then compared with a
+sampled search of many more samples instead.
+"""
+
+import random
+import sys
+import time
+import layout
+import multiAgents
+import pacman
+import util
+
+FOUR_GHOST_LAYOUTS = ['trickyClassic', 'powerClassic', 'originalClassic']
+
+SAMPLE_COUNTS = [2, 4, 8]
+
+# The reference for positions where the exact search runs out of time
+REFERENCE_SAMPLES = 32
+
+def loadGameState(layoutName, numGhosts=4):
+    lay = layout.getLayout(layoutName)
+    if lay == None: raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, numGhosts)
+    return gameState
+
+def randomPositions(layoutName, count, seed=0, spacing=5):
+    """
+    Up to count positions from a game in which every agent moves at random,
+    every spacing rounds.
+    """
+    rand = random.Random(seed)
+    gameState = loadGameState(layoutName)
+    positions = []
+    rounds = 0
+    while len(positions) < count and not (gameState.isWin() or gameState.isLose()):
+        if rounds % spacing == 0: positions.append(gameState)
+        for index in range(gameState.getNumAgents()):
+            if gameState.isWin() or gameState.isLose(): break
+            gameState = gameState.generateSuccessor(index, rand.choice(gameState.getLegalActions(index)))
+        rounds += 1
+    return positions
+
+def timeMove(agent, gameState, timeout):
+    """
+    Returns (action, root value, seconds) for the agent's search from
+    gameState, or None if it takes longer than timeout seconds.
+    """
+    def search():
+        agent.ghost_indexes = list(range(1, gameState.getNumAgents()))
+        agent.prepareSearch(gameState)
+        return agent.minimax(gameState, agent.depth, 0)
+    starttime = time.time()
+    try:
+        action, value = util.TimeoutFunction(search, timeout)()
+    except util.TimeoutFunctionException:
+        return None
+    return action, value, time.time() - starttime
+
+def compareSampling(layoutNames=FOUR_GHOST_LAYOUTS, sampleCounts=SAMPLE_COUNTS, depth=3, positions=5,
+                    evalFn='better', timeout=30):
+    """
+    Searches each position exactly and with each number of samples.  Returns
+    one dictionary of measurements per layout and configuration.
+    """
+    rows = []
+    for layoutName in layoutNames:
+        states = randomPositions(layoutName, positions)
+        exact, reference = [], []
+        for gameState in states:
+            result = timeMove(multiAgents.ExpectimaxAgent(evalFn, str(depth)), gameState, timeout)
+            exact.append(result)
+            if result is None:
+                result = timeMove(multiAgents.ExpectimaxAgent(evalFn, str(depth), samples=str(REFERENCE_SAMPLES)),
+                                  gameState, timeout)
+            reference.append(result)
+        rows.append(summarize(layoutName, 'exact', exact, reference, timeout))
+        for samples in sampleCounts:
+            agent = multiAgents.ExpectimaxAgent(evalFn, str(depth), samples=str(samples))
+            results = [timeMove(agent, gameState, timeout) for gameState in states]
+            row = summarize(layoutName, '%d samples' % samples, results, reference, timeout)
+            nodes = agent.samplingStats['nodes']
+            row['standardError'] = agent.samplingStats['standardError'] / nodes if nodes else 0.0
+            row['hoeffding'] = agent.samplingStats['hoeffding'] / nodes if nodes else 0.0
+            rows.append(row)
+    return rows
+
+def summarize(layoutName, config, results, reference, timeout):
+    finished = [result for result in results if result is not None]
+    compared = [(result, ref) for result, ref in zip(results, reference) if result is not None and ref is not None]
+    row = {'layout': layoutName, 'config': config, 'moves': len(results), 'timeouts': len(results) - len(finished),
+           'standardError': None, 'hoeffding': None, 'timeout': timeout}
+    row['meanSeconds'] = sum([result[2] for result in finished]) / len(finished) if finished else None
+    row['maxSeconds'] = max([result[2] for result in finished]) if finished else None
+    row['agreement'] = sum([result[0] == ref[0] for result, ref in compared]) / float(len(compared)) if compared else None
+    row['valueError'] = sum([abs(result[1] - ref[1]) for result, ref in compared]) / len(compared) if compared else None
+    return row
+
+def printSamplingComparison(rows):
+    print('%-16s %-11s %9s %9s %8s %9s %10s %9s %10s' %
+          ('layout', 'chance', 'mean sec', 'max sec', 'timeouts', 'same move', '|value err|', 'std err', 'Hoeffding'))
+    number = lambda value, format: format % value if value is not None else '%*s' % (len(format % 0), '-')
+    for row in rows:
+        print('%-16s %-11s %s %s %5d/%-2d %s %s %s %s' %
+              (row['layout'], row['config'], number(row['meanSeconds'], '%9.3f'), number(row['maxSeconds'], '%9.3f'),
+               row['timeouts'], row['moves'], number(row['agreement'], '%9.2f'), number(row['valueError'], '%11.2f'),
+               number(row['standardError'], '%9.2f'), number(row['hoeffding'], '%10.2f')))
+    print('Move timeout: %d seconds' % rows[0]['timeout'])
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('python multiAgentBenchmark.py <options>')
+    parser.add_option('-l', '--layouts', dest='layouts', default=','.join(FOUR_GHOST_LAYOUTS),
+                      help='comma separated layouts [Default: %default]')
+    parser.add_option('-d', '--depth', dest='depth', type='int', default=3,
+                      help='search depth [Default: %default]')
+    parser.add_option('-n', '--positions', dest='positions', type='int', default=5,
+                      help='positions per layout [Default: %default]')
+    parser.add_option('-s', '--samples', dest='samples', default=','.join(map(str, SAMPLE_COUNTS)),
+                      help='comma separated sample counts [Default: %default]')
+    parser.add_option('--timeout', dest='timeout', type='int', default=30,
+                      help='seconds allowed for each move, as in pacman.py [Default: %default]')
+    parser.add_option('--sampling', dest='sampling', action='store_true', default=False,
+                      help='compare exact and sampled expectimax chance nodes')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    if options.sampling:
+        printSamplingComparison(compareSampling(options.layouts.split(','), [int(n) for n in options.samples.split(',')],
+                                                options.depth, options.positions, timeout=options.timeout))
+    else:
+        print('Nothing to do; see --help')
@@ -14,7 +14,15 @@
 
 from util import manhattanDistance
 from game import Directions
-import random, util
+import random, util, time, math
+import ghostAgents
+import transpositionTable
+import moveOrdering
+import parallelSearch
+import monteCarlo
+import evaluationFeatures
+import searchState
+import searchStats
 
 from game import Agent
 
@@ -67,15 +75,11 @@ class ReflexAgent(Agent):
         to create a masterful evaluation function.
         """
         # Useful information you can extract from a GameState (pacman.py)
-        successorGameState = currentGameState.generatePacmanSuccessor(action)
-        newPos = successorGameState.getPacmanPosition()
-        newFood = successorGameState.getFood()
-        newGhostStates = successorGameState.getGhostStates()
-        newScaredTimes = [ghostState.scaredTimer for ghostState in newGhostStates]
-        food_dist = [util.manhattanDistance(newPos, f) for f in newFood.asList()]
-        min_food_dist = min(food_dist) if food_dist else 0
-        ghost_dist = [util.manhattanDistance(newPos, g.getPosition()) for g in newGhostStates]
-        min_ghost_dist = min(ghost_dist)
+        successorGameState = evaluationFeatures.generateSuccessor(currentGameState, 0, action)
+        # Maze distances from Pacman, updated from currentGameState's (see evaluationFeatures.py)
+        features = evaluationFeatures.getFeatures(successorGameState)
+        min_food_dist = features.nearestFood
+        min_ghost_dist = min(features.ghostDistances)
         modifier = 0
         if min_ghost_dist == 1:
             modifier = 1000
@@ -91,6 +95,11 @@ def scoreEvaluationFunction(currentGameState):
     """
     return currentGameState.getScore()
 
+# The most of the rules' per-move limit, and of the game's remaining total
+# time, that one move of a search agent with a budget may use
+MOVE_TIME_SHARE = 0.5
+TOTAL_TIME_SHARE = 0.02
+
 class MultiAgentSearchAgent(Agent):
     """
     This class provides some common elements to all of your
@@ -104,12 +113,111 @@ class MultiAgentSearchAgent(Agent):
     Note: this is an abstract class: one that should not be instantiated.  It's
     only partially specified, and designed to be extended.  Agent (game.py)
     is another abstract class.
+
+    With a tableSize, the search agents remember the values of positions they
+    have searched in a transposition table of that many slots (see
+    transpositionTable.py), e.g. -a depth=4,tableSize=65536
+
+    With processes, each of Pacman's moves at the root is searched in its own
+    worker process (see parallelSearch.py), e.g. -a depth=3,processes=4
+
+    With mutable=True, the search makes and takes back moves on one
+    SearchState (see searchState.py) instead of copying a GameState for every
+    node; it finds the same moves.
+
+    With stats=True, the nodes, time and cutoffs of every search are recorded
+    (see searchStats.py) and summarized after the games; statsFile also
+    writes them to that file as JSON lines, e.g. -a depth=3,statsFile=stats.jsonl
     """
 
-    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2'):
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', tableSize = '0', processes = '0',
+                 mutable = 'False', stats = 'False', statsFile = ''):
         self.index = 0 # Pacman is always agent index 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
+        self.table = transpositionTable.TranspositionTable(int(tableSize)) if int(tableSize) > 0 else None
+        self.splitter = parallelSearch.RootSplitter(self, int(processes)) if int(processes) > 0 else None
+        self.timeLimits = None
+        self.timeUsed = 0.0
+        self.mutable = mutable == 'True'
+        self.stats = None
+        if stats == 'True' or statsFile:
+            self.stats = searchStats.SearchStats(self.__class__.__name__, statsFile or None)
+
+    def setTimeLimits(self, moveTimeout, moveWarningTime, totalTime):
+        """
+        Called by Game.run with the rules' time limits for this agent, in
+        seconds: the move timeout, the time after which a move draws a warning,
+        and the total time allowed for the whole game.
+        """
+        self.timeLimits = (moveTimeout, moveWarningTime, totalTime)
+
+    def evaluate(self, gameState):
+        "self.evaluationFunction(gameState), counted and timed if there are stats."
+        if self.stats is None:
+            return self.evaluationFunction(gameState)
+        starttime = time.time()
+        value = self.evaluationFunction(gameState)
+        self.stats.evalSeconds += time.time() - starttime
+        self.stats.evaluated += 1
+        return value
+
+    def startMove(self):
+        if self.stats is not None: self.stats.startMove()
+
+    def endMove(self, action, depth=None):
+        """
+        Records the statistics of the search for action, which reached depth
+        (self.depth by default), and returns action.
+        """
+        if self.stats is not None:
+            self.stats.endMove(action, depth if depth is not None else self.depth, len(self.ghost_indexes) + 1)
+        return action
+
+    def printStatsSummary(self):
+        "Called by pacman.runGames after all games."
+        if self.stats is not None and self.stats.games: print(self.stats.summary())
+
+    def searchRoot(self, gameState):
+        "The state a search from gameState starts with: a new SearchState if mutable."
+        if self.mutable: return searchState.SearchState(gameState)
+        return gameState
+
+    def applyMove(self, gameState, index, action):
+        """
+        Returns (successor, record) for agent index taking action.  A
+        SearchState makes the move in place, so the successor is gameState
+        itself until undoMove(successor, record) takes the move back.
+        """
+        if isinstance(gameState, searchState.SearchState):
+            return gameState, gameState.apply(index, action)
+        return evaluationFeatures.generateSuccessor(gameState, index, action), None
+
+    def undoMove(self, successor, record):
+        if record is not None: successor.undo(record)
+
+    def moveBudget(self):
+        """
+        The seconds this move may take: self.budget, cut down to a share of the
+        rules' per-move limits and of the total time left in the game.
+        """
+        budget = self.budget
+        if self.timeLimits is not None:
+            moveTimeout, moveWarningTime, totalTime = self.timeLimits
+            budget = min(budget, MOVE_TIME_SHARE * min(moveTimeout, moveWarningTime),
+                         TOTAL_TIME_SHARE * max(totalTime - self.timeUsed, 0))
+        return budget
+
+    def final(self, state):
+        """
+        Stops the worker processes, if any, and reports how useful the
+        transposition table was at the end of a game.
+        """
+        if self.splitter is not None: self.splitter.close()
+        if self.stats is not None: self.stats.endGame(state)
+        if self.table is not None:
+            print('Transposition table: %d lookups, %.1f%% hits, %d of %d slots used' %
+                  (self.table.probes, 100 * self.table.hitRate(), len(self.table), self.table.size))
 
 class MinimaxAgent(MultiAgentSearchAgent):
     """
@@ -142,8 +250,12 @@ class MinimaxAgent(MultiAgentSearchAgent):
         "*** YOUR CODE HERE ***"
 
         self.ghost_indexes = list(range(1, gameState.getNumAgents()))
-        action, value = self.minimax(gameState, self.depth, 0)
-        return action
+        self.startMove()
+        if self.table is not None: self.table.newSearch()
+        if self.splitter is not None:
+            return self.endMove(self.splitter.getAction(gameState))
+        action, value = self.minimax(self.searchRoot(gameState), self.depth, 0)
+        return self.endMove(action)
 
 
     def minimax(self, gameState, depth, index):
@@ -152,12 +264,21 @@ class MinimaxAgent(MultiAgentSearchAgent):
         """
         if depth == 0 or gameState.isWin() or gameState.isLose():
             # This is the lowest depth we want to search into.
-            return None, self.evaluationFunction(gameState)
+            return None, self.evaluate(gameState)
+
+        if self.table is not None:
+            key = transpositionTable.stateHash(gameState)
+            entry = self.table.lookup(key, depth, index)
+            if entry is not None:
+                if self.stats is not None: self.stats.tableHits += 1
+                value, flag, action = entry
+                return action, value
 
         results = []
+        if self.stats is not None: self.stats.expanded += 1
 
         for action in gameState.getLegalActions(index):
-            succ = gameState.generateSuccessor(index, action)
+            succ, record = self.applyMove(gameState, index, action)
             if index == 0:
                 # Handle pacman case, pacman will choose the best action.
                 max_action, max_val = self.minimax(succ, depth, 1)
@@ -168,44 +289,173 @@ class MinimaxAgent(MultiAgentSearchAgent):
                 next_depth = depth - 1 if next_dex == 0 else depth
                 min_action, min_val = self.minimax(succ, next_depth, next_dex)
                 results.append((action, min_val))
+            self.undoMove(succ, record)
 
         choose = max if index == 0 else min
-        return choose(results, key=lambda x: x[1])
+        best = choose(results, key=lambda x: x[1])
+        if self.table is not None:
+            self.table.store(key, depth, index, best[1], transpositionTable.EXACT, best[0])
+        return best
+
 
 
+class SearchTimeout(Exception):
+    "Raised inside AlphaBetaAgent.minimax once the move's deadline has passed."
+    pass
 
 class AlphaBetaAgent(MultiAgentSearchAgent):
     """
     Your minimax agent with alpha-beta pruning (question 3)
+
+    With a budget (seconds per move), the agent searches depth 1, 2, 3, ...
+    until the budget runs out and plays the move of the deepest search that
+    finished; depth and processes are then ignored, e.g. -a budget=0.5.  The budget is cut
+    down to fit the time limits of the game's rules, and how much of it was
+    used is reported at the end of the game.
+
+    With an ordering, moves are tried in the order of those move ordering
+    heuristics (see moveOrdering.py), e.g. -a ordering=killer+history+static
     """
 
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', tableSize = '0', processes = '0',
+                 budget = '0', ordering = '', mutable = 'False', stats = 'False', statsFile = ''):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth, tableSize, processes, mutable, stats, statsFile)
+        self.ordering = moveOrdering.MoveOrderer(moveOrdering.parseOrdering(ordering)) if ordering else None
+        self.budget = float(budget)
+        self.deadline = None
+        self.principalVariation = []
+        self.moveReports = [] # (seconds used, budget, deepest search finished) for each move
+
     def getAction(self, gameState):
         """
         Returns the minimax action using self.depth and self.evaluationFunction
         """
         "*** YOUR CODE HERE ***"
         self.ghost_indexes = list(range(1, gameState.getNumAgents()))
-        action, value = self.minimax(gameState, self.depth, 0, float("-inf"), float("inf"))
+        self.startMove()
+        if self.table is not None: self.table.newSearch()
+        if self.ordering is not None: self.ordering.newSearch()
+        if self.budget > 0:
+            # The deepest search finished
+            return self.endMove(self.iterativeDeepening(gameState), self.moveReports[-1][2])
+        self.startSearch(self.depth)
+        if self.splitter is not None:
+            return self.endMove(self.splitter.getAction(gameState, alphaBeta=True))
+        action, value = self.minimax(self.searchRoot(gameState), self.depth, 0, float("-inf"), float("inf"))
+        return self.endMove(action)
+
+    def startSearch(self, depth):
+        "Resets the bookkeeping of minimax for a search of this depth."
+        self.searchDepth = depth
+        self.followPV = True
+        self.depthLimited = False
+        self.lines = {} # The best line found below the latest node at each ply
+
+    def iterativeDeepening(self, gameState):
+        """
+        Searches depth 1, 2, 3, ... until the move's budget is spent, trying the
+        principal variation of each depth first at the next, and returns the
+        move of the deepest search that finished.
+        """
+        starttime = time.time()
+        budget = self.moveBudget()
+        self.principalVariation = []
+        action, completed, depth = None, 0, 1
+        while True:
+            # Depth 1 always runs to the end, so there is always a move
+            self.deadline = starttime + budget if depth > 1 else None
+            self.startSearch(depth)
+            iterationStart = time.time()
+            try:
+                # A new root, since a timeout leaves moves made on a SearchState
+                action, value = self.minimax(self.searchRoot(gameState), depth, 0, float("-inf"), float("inf"))
+            except SearchTimeout:
+                break
+            completed = depth
+            self.principalVariation = self.lines.get(0, [])
+            # A deeper search takes at least as long as this one did, and is
+            # pointless if this one reached no depth limit
+            elapsed = time.time() - iterationStart
+            if not self.depthLimited or time.time() + elapsed > starttime + budget:
+                break
+            depth += 1
+        self.deadline = None
+        used = time.time() - starttime
+        self.timeUsed += used
+        self.moveReports.append((used, budget, completed))
         return action
 
+    def final(self, state):
+        MultiAgentSearchAgent.final(self, state)
+        if self.ordering is not None:
+            print('Move ordering: %d cutoffs, %.1f%% at the first move' %
+                  (self.ordering.cutoffs, 100 * self.ordering.firstMoveCutoffRate()))
+        if self.moveReports:
+            used, budgets, depths = zip(*self.moveReports)
+            print('Iterative deepening: %d moves, depth %.1f on average (deepest %d), '
+                  '%.3fs of a %.3fs budget used on average, slowest move %.3fs' %
+                  (len(depths), sum(depths) / float(len(depths)), max(depths),
+                   sum(used) / len(used), sum(budgets) / len(budgets), max(used)))
+        # The next game starts with its own time limits
+        self.timeUsed = 0.0
+        self.moveReports = []
+
     def minimax(self, gameState, depth, index, alpha, beta):
         """
         Return the minimaxing ACTION and associated VALUE for that minimaxing node.
         """
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+        ply = (self.searchDepth - depth) * (len(self.ghost_indexes) + 1) + index
+        self.lines[ply] = []
         if depth == 0 or gameState.isWin() or gameState.isLose():
             # This is the lowest depth we want to search into.
-            return None, self.evaluationFunction(gameState)
+            if depth == 0: self.depthLimited = True
+            return None, self.evaluate(gameState)
+
+        actions = gameState.getLegalActions(index)
+        key = hashMove = pvMove = None
+        if self.table is not None:
+            key = transpositionTable.stateHash(gameState)
+            entry = self.table.lookup(key, depth, index)
+            if entry is not None:
+                value, flag, bestAction = entry
+                if flag == transpositionTable.EXACT or \
+                        (flag == transpositionTable.LOWER and value > beta) or \
+                        (flag == transpositionTable.UPPER and value < alpha):
+                    if bestAction is not None: self.lines[ply] = [bestAction]
+                    if self.stats is not None: self.stats.tableHits += 1
+                    return bestAction, value
+                # Not enough to decide here, but the best move so far goes first
+                hashMove = bestAction
+        if self.followPV:
+            # Still on the leftmost path, which is the previous depth's best line
+            if ply < len(self.principalVariation) and self.principalVariation[ply] in actions:
+                pvMove = self.principalVariation[ply]
+            else:
+                self.followPV = False
+        actions = self.orderMoves(gameState, index, ply, actions, hashMove, pvMove)
 
         results = []
+        childLines = {}
+        if self.stats is not None: self.stats.expanded += 1
         v = float("-inf") if index == 0 else float("inf")
+        startAlpha, startBeta = alpha, beta
 
-        for action in gameState.getLegalActions(index):
-            succ = gameState.generateSuccessor(index, action)
+        for moveNumber, action in enumerate(actions):
+            succ, record = self.applyMove(gameState, index, action)
             if index == 0:
                 # Handle pacman case, pacman will choose the best action.
                 max_action, max_val = self.minimax(succ, depth, 1, alpha, beta)
+                self.undoMove(succ, record)
+                self.followPV = False
+                childLines[action] = self.lines.get(ply + 1, [])
                 if max_val > beta:
-                    return action, max_val
+                    self.lines[ply] = [action] + childLines[action]
+                    if self.ordering is not None:
+                        self.ordering.recordCutoff(gameState, index, ply, depth, action, moveNumber)
+                    if self.stats is not None: self.stats.cutoff(moveNumber)
+                    return self.storeBound(key, depth, index, action, max_val, transpositionTable.LOWER)
                 alpha = max(alpha, max_val)
                 results.append((action, max_val))
             else:
@@ -213,19 +463,90 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
                 next_dex = index + 1 if index + 1 <= self.ghost_indexes[-1] else 0
                 next_depth = depth - 1 if next_dex == 0 else depth
                 min_action, min_val = self.minimax(succ, next_depth, next_dex, alpha, beta)
+                self.undoMove(succ, record)
+                self.followPV = False
+                childLines[action] = self.lines.get(ply + 1, [])
                 if min_val < alpha:
-                    return action, min_val
+                    self.lines[ply] = [action] + childLines[action]
+                    if self.ordering is not None:
+                        self.ordering.recordCutoff(gameState, index, ply, depth, action, moveNumber)
+                    if self.stats is not None: self.stats.cutoff(moveNumber)
+                    return self.storeBound(key, depth, index, action, min_val, transpositionTable.UPPER)
                 beta = min(beta, min_val)
                 results.append((action, min_val))
 
         choose = max if index == 0 else min
-        return choose(results, key=lambda x: x[1])
+        action, value = choose(results, key=lambda x: x[1])
+        self.lines[ply] = [action] + childLines[action]
+        # Values outside the starting window may rest on cut off subtrees
+        if value <= startAlpha:
+            flag = transpositionTable.UPPER
+        elif value >= startBeta:
+            flag = transpositionTable.LOWER
+        else:
+            flag = transpositionTable.EXACT
+        return self.storeBound(key, depth, index, action, value, flag)
+
+    def orderMoves(self, gameState, index, ply, actions, hashMove, pvMove):
+        """
+        Returns actions in the order minimax tries them: the principal
+        variation's and the transposition table's moves first, then the rest
+        by the move ordering heuristics, if any.
+        """
+        if self.ordering is not None:
+            return self.ordering.order(gameState, index, ply, actions, (pvMove, hashMove))
+        for move in (hashMove, pvMove):
+            if move in actions:
+                actions = [move] + [action for action in actions if action != move]
+        return actions
+
+    def rootMoves(self, gameState):
+        """
+        Pacman's legal moves in gameState, in the order a search started by
+        startSearch tries them at the root.
+        """
+        hashMove = pvMove = None
+        if self.table is not None:
+            entry = self.table.lookup(transpositionTable.stateHash(gameState), self.searchDepth, 0)
+            if entry is not None: hashMove = entry[2]
+        if self.principalVariation: pvMove = self.principalVariation[0]
+        return self.orderMoves(gameState, 0, 0, gameState.getLegalActions(0), hashMove, pvMove)
+
+    def storeBound(self, key, depth, index, action, value, flag):
+        """
+        Stores value in the transposition table, if there is one, and returns
+        (action, value).
+        """
+        if self.table is not None:
+            self.table.store(key, depth, index, value, flag, action)
+        return action, value
 
 class ExpectimaxAgent(MultiAgentSearchAgent):
     """
       Your expectimax agent (question 4)
+
+    With samples, the ghosts' joint move is estimated from that many sampled
+    outcomes instead of every combination of their legal moves (sparse
+    sampling), e.g. -a depth=3,samples=6.  Sibling chance nodes use the same
+    random numbers, so their estimates differ only where their positions do,
+    and the standard error of the estimates is reported at the end of the
+    game.  ghostModel names a ghost agent in ghostAgents.py whose
+    getDistribution the ghosts are assumed to follow, e.g.
+    ghostModel=DirectionalGhost; by default they move uniformly at random.
+    Its distributions come from ghostAgents.distributionTable, which works
+    each out once.
     """
 
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', tableSize = '0', processes = '0',
+                 samples = '0', ghostModel = '', seed = '0', mutable = 'False', stats = 'False', statsFile = ''):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth, tableSize, processes, mutable, stats, statsFile)
+        self.samples = int(samples)
+        self.ghostModel = util.lookup(ghostModel, vars(ghostAgents)) if ghostModel else None
+        self.ghostModels = {} # ghost index -> an instance of ghostModel
+        self.seed = int(seed)
+        self.commonRandom = {}
+        self.samplingStats = util.Counter()
+
     def getAction(self, gameState):
         """
         Returns the expectimax action using self.depth and self.evaluationFunction
@@ -235,27 +556,165 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         """
         "*** YOUR CODE HERE ***"
         self.ghost_indexes = list(range(1, gameState.getNumAgents()))
-        action, value = self.minimax(gameState, self.depth, 0)
-        return action
+        self.startMove()
+        if self.table is not None: self.table.newSearch()
+        self.prepareSearch(gameState)
+        if self.splitter is not None:
+            return self.endMove(self.splitter.getAction(gameState))
+        action, value = self.minimax(self.searchRoot(gameState), self.depth, 0)
+        return self.endMove(action)
+
+    def prepareSearch(self, gameState):
+        """
+        Draws the random numbers for the sampled chance nodes of a search from
+        gameState: for each remaining depth, one number per sample and ghost.
+        They depend only on the seed and gameState, so worker processes
+        searching from the same root (see parallelSearch.py) draw the same.
+        """
+        if self.samples <= 0: return
+        rand = random.Random(repr((self.seed, transpositionTable.stableHash(gameState))))
+        self.commonRandom = {}
+        for depth in range(1, self.depth + 1):
+            self.commonRandom[depth] = [[rand.random() for ghost in self.ghost_indexes] for i in range(self.samples)]
 
-    def choose(self, vals, index):
+    def choose(self, vals, index, weights=None):
         if index == 0:
             return max(vals, key=lambda x: x[1])
+        elif weights is not None:
+            return None, sum([weight * v[1] for weight, v in zip(weights, vals)])
         else:
             return None, sum([v[1] for v in vals]) / len(vals)
 
+    def ghostModelAgent(self, index):
+        "The instance of ghostModel for ghost index."
+        if index not in self.ghostModels:
+            self.ghostModels[index] = self.ghostModel(index)
+        return self.ghostModels[index]
+
+    def ghostDistribution(self, gameState, index, actions, distribution=None):
+        """
+        The probability of each of actions for ghost index under ghostModel,
+        or None for the uniform distribution.  distribution is the ghost's
+        getActionDistribution in gameState, if it has been looked up already.
+        """
+        if self.ghostModel is None: return None
+        if distribution is None:
+            distribution = self.ghostModelAgent(index).getActionDistribution(gameState)
+        distribution = dict(distribution)
+        weights = [distribution.get(action, 0) for action in actions]
+        total = float(sum(weights))
+        if total == 0: return [1.0 / len(actions)] * len(actions)
+        return [weight / total for weight in weights]
+
+    def ghostChoices(self, gameState):
+        """
+        Each ghost's legal actions in gameState and their probabilities (None
+        for uniform).  Neither depends on the other ghosts' moves, so they
+        hold for the whole of the joint move, and the ghosts' distributions are
+        looked up together.
+        """
+        if self.ghostModel is None:
+            distributions = [None] * len(self.ghost_indexes)
+        else:
+            agents = [self.ghostModelAgent(index) for index in self.ghost_indexes]
+            distributions = ghostAgents.distributionTable.lookupAll(agents, gameState)
+        choices = []
+        for index, distribution in zip(self.ghost_indexes, distributions):
+            actions = gameState.getLegalActions(index)
+            choices.append((actions, self.ghostDistribution(gameState, index, actions, distribution)))
+        return choices
+
+    def sampleAction(self, actions, weights, draw):
+        "The action at the quantile draw of actions' weights (uniform if None)."
+        if weights is None:
+            return actions[min(int(draw * len(actions)), len(actions) - 1)]
+        total = 0.0
+        for action, weight in zip(actions, weights):
+            total += weight
+            if draw < total: return action
+        return actions[-1]
+
+    def jointMoves(self, gameState):
+        "The number of combinations of the ghosts' legal moves in gameState."
+        count = 1
+        for index in self.ghost_indexes:
+            count *= len(gameState.getLegalActions(index))
+        return count
+
+    def sampleGhostMoves(self, gameState, depth):
+        """
+        Estimates the value of the chance node where the ghosts, from index 1
+        on, make their joint move, as the mean over the sampled outcomes.
+        Outcomes drawn more than once are only searched once.
+        """
+        searched = {}
+        values = []
+        choices = self.ghostChoices(gameState)
+        for draws in self.commonRandom[depth]:
+            state, moves, records = gameState, [], []
+            for index, draw, (actions, weights) in zip(self.ghost_indexes, draws, choices):
+                if state.isWin() or state.isLose(): break
+                action = self.sampleAction(actions, weights, draw)
+                moves.append(action)
+                state, record = self.applyMove(state, index, action)
+                records.append(record)
+            moves = tuple(moves)
+            if moves not in searched:
+                searched[moves] = self.minimax(state, depth - 1, 0)[1]
+            for record in reversed(records):
+                self.undoMove(state, record)
+            values.append(searched[moves])
+
+        mean = sum(values) / len(values)
+        self.samplingStats['nodes'] += 1
+        if len(values) > 1:
+            # The standard error of the mean, and the 95% Hoeffding bound for
+            # values within the range that was seen
+            variance = sum([(value - mean) ** 2 for value in values]) / (len(values) - 1)
+            standardError = math.sqrt(variance / len(values))
+            hoeffding = (max(values) - min(values)) * math.sqrt(math.log(2 / 0.05) / (2 * len(values)))
+            self.samplingStats['standardError'] += standardError
+            self.samplingStats['hoeffding'] += hoeffding
+            self.samplingStats['maxStandardError'] = max(self.samplingStats['maxStandardError'], standardError)
+        return None, mean
+
+    def final(self, state):
+        MultiAgentSearchAgent.final(self, state)
+        nodes = self.samplingStats['nodes']
+        if nodes:
+            print('Sparse sampling: %d chance nodes, standard error %.2f on average (at most %.2f), '
+                  '95%% Hoeffding bound +/-%.2f on average' %
+                  (nodes, self.samplingStats['standardError'] / nodes, self.samplingStats['maxStandardError'],
+                   self.samplingStats['hoeffding'] / nodes))
+            self.samplingStats = util.Counter()
+
     def minimax(self, gameState, depth, index):
         """
         Return the minimaxing ACTION and associated VALUE for that minimaxing node.
         """
         if depth == 0 or gameState.isWin() or gameState.isLose():
             # This is the lowest depth we want to search into.
-            return None, self.evaluationFunction(gameState)
+            return None, self.evaluate(gameState)
+
+        if self.table is not None:
+            key = transpositionTable.stateHash(gameState)
+            entry = self.table.lookup(key, depth, index)
+            if entry is not None:
+                if self.stats is not None: self.stats.tableHits += 1
+                value, flag, action = entry
+                return action, value
+
+        if self.stats is not None: self.stats.expanded += 1
+        if index == 1 and self.samples > 0 and self.samples < self.jointMoves(gameState):
+            best = self.sampleGhostMoves(gameState, depth)
+            if self.table is not None:
+                self.table.store(key, depth, index, best[1], transpositionTable.EXACT, best[0])
+            return best
 
         results = []
 
         for action in gameState.getLegalActions(index):
-            succ = gameState.generateSuccessor(index, action)
+            succ, record = self.applyMove(gameState, index, action)
             if index == 0:
                 # Handle pacman case, pacman will choose the best action.
                 max_action, max_val = self.minimax(succ, depth, 1)
@@ -266,8 +725,58 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
                 next_depth = depth - 1 if next_dex == 0 else depth
                 min_action, min_val = self.minimax(succ, next_depth, next_dex)
                 results.append((action, min_val))
+            self.undoMove(succ, record)
+
+        weights = None
+        if index != 0 and self.ghostModel is not None:
+            weights = self.ghostDistribution(gameState, index, [action for action, value in results])
+        best = self.choose(results, index, weights)
+        if self.table is not None:
+            self.table.store(key, depth, index, best[1], transpositionTable.EXACT, best[0])
+        return best
+
+class MonteCarloAgent(MultiAgentSearchAgent):
+    """
+    A Monte Carlo tree search agent (see monteCarlo.py), which runs playouts
+    for budget seconds a move, or stops after playouts of them (at least one
+    of the two must be set), e.g. -p MonteCarloAgent -a budget=0.5,rollout=greedy.  rollout is random,
+    greedy or evaluation (evalFn scores the leaf; betterEvaluationFunction by
+    default), rolloutDepth the number of moves a rollout plays,
+    exploration the UCT exploration constant, widening the progressive
+    widening factor for the ghosts' moves and expandAfter the number of
+    rollouts from a leaf before it is expanded.  The number of playouts per
+    second is reported at the end of the game.
+    """
+
+    def __init__(self, evalFn = 'betterEvaluationFunction', budget = '0.5', playouts = '0', rollout = 'greedy',
+                 rolloutDepth = '30', exploration = '1.0', widening = '1.0', expandAfter = '4', seed = '0'):
+        MultiAgentSearchAgent.__init__(self, evalFn)
+        self.budget = float(budget)
+        self.playouts = int(playouts)
+        if self.budget <= 0 and self.playouts <= 0:
+            raise Exception('MonteCarloAgent needs a time budget or a number of playouts to stop its search')
+        self.search = monteCarlo.MonteCarloTreeSearch(self.evaluationFunction, rollout, int(rolloutDepth),
+                                                      float(exploration), float(widening), int(expandAfter),
+                                                      int(seed))
+
+    def getAction(self, gameState):
+        starttime = time.time()
+        deadline = starttime + self.moveBudget() if self.budget > 0 else None
+        action = self.search.search(gameState, deadline, self.playouts)
+        self.timeUsed += time.time() - starttime
+        return action
 
-        return self.choose(results, index)
+    def final(self, state):
+        MultiAgentSearchAgent.final(self, state)
+        search = self.search
+        if search.moves:
+            print('Monte Carlo tree search: %d moves, %d playouts (%.0f per second, %.0f per move), '
+                  '%.1f%% of them kept from the move before' %
+                  (search.moves, search.playouts, search.playoutsPerSecond(), search.playouts / float(search.moves),
+                   100.0 * search.reusedVisits / search.playouts))
+        # The next game starts with a new tree and its own time limits
+        search.reset()
+        self.timeUsed = 0.0
 
 def betterEvaluationFunction(currentGameState):
     """
@@ -279,26 +788,21 @@ def betterEvaluationFunction(currentGameState):
     2. Discourages pacman to be too close to a ghost by subtrcting 2 * inverse distance of the closest ghost, up to 4 units away
     3. Discourages not eating food at all by subtracting 2 * the number of remaining food
     4. Encourages eating capsules by subtracting 20 * number of remaining capsules
+    Distances are maze distances, from the cached features of evaluationFeatures.py.
 
     Potential improvements: when there are scared ghosts, encourage pacman to eat them.
     """
 
     if currentGameState.isLose():
         return currentGameState.getScore()
-    pos = currentGameState.getPacmanPosition()
-    food = currentGameState.getFood()
-    food_list = food.asList()
-    ghost_states = currentGameState.getGhostStates()
-    scaredTimes = [ghostState.scaredTimer for ghostState in ghost_states]
-    food_dist = [util.manhattanDistance(pos, f) for f in food_list]
-    min_food_dist = min(food_dist) if food_dist else 0
-    ghost_dist = [util.manhattanDistance(pos, g.getPosition()) for g in ghost_states]
-    min_ghost_dist = min(ghost_dist)
+    features = evaluationFeatures.getFeatures(currentGameState)
+    min_food_dist = features.nearestFood
+    min_ghost_dist = min(features.ghostDistances)
     return currentGameState.getScore() \
             - 0.3 * min_food_dist \
             - 2 * (1 / max(min_ghost_dist,4)) \
-            - 2 * len(food_list) \
-            - 20 * len(currentGameState.getCapsules())
+            - 2 * features.foodCount() \
+            - 20 * len(features.capsules)
 
 # Abbreviation
 better = betterEvaluationFunction
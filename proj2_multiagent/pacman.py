@@ -715,6 +715,8 @@ def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, c
               (wins.count(True), len(wins), winRate))
         print('Record:       ', ', '.join(
             [['Loss', 'Win'][int(w)] for w in wins]))
+        if 'printStatsSummary' in dir(pacman):
+            pacman.printStatsSummary()
 
     return games
 
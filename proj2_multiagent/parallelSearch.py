@@ -0,0 +1,157 @@
+# parallelSearch.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Root-parallel search for the agents in multiAgents.py.
+
+Each of Pacman's moves at the root is searched in a worker process, and the
+root picks the best of their values, exactly as the single process search
+would.  For alpha-beta the eldest brother, the first move in the agent's own
+order (its transposition table or principal variation move, then its move
+ordering heuristics), is searched first, alone, to get a bound (Young
+Brothers Wait); the other moves are then searched in parallel, starting from
+the best value any of them has reached so far, which the workers share
+through shared memory.
+
+The workers are forked once per game and already hold the layout, so each
+move only sends them a small tuple made by packState:
+
+packed = packState(gameState)
+gameState = unpackState(packed, templateState)
+
+> python pacman.py -p ExpectimaxAgent -l mediumClassic -a depth=3,processes=4
+
+Where processes cannot be forked, the search stays in one process.
+"""
+
+import multiprocessing
+from game import Configuration
+from game import Grid
+
+def packState(gameState):
+    """
+    The parts of gameState that change during a game, as a tuple of plain
+    values: every agent's position, direction and scared timer, the food as
+    one integer with a bit per cell, the capsules, the score and whether the
+    game is won or lost.
+    """
+    data = gameState.data
+    height = data.food.height
+    food = 0
+    for x, column in enumerate(data.food.data):
+        for y, hasFood in enumerate(column):
+            if hasFood: food |= 1 << (x * height + y)
+    agents = tuple([(agent.configuration.pos, agent.configuration.direction, agent.scaredTimer)
+                    for agent in data.agentStates])
+    return (agents, food, tuple(data.capsules), data.score, tuple(data._eaten), data._win, data._lose)
+
+def unpackState(packed, template):
+    """
+    Rebuilds the GameState that packState packed, from template, any state of
+    the same game (it supplies the layout and the agents' start positions).
+    """
+    agents, food, capsules, score, eaten, win, lose = packed
+    gameState = template.__class__(template)
+    data = gameState.data
+    for agentState, (pos, direction, scaredTimer) in zip(data.agentStates, agents):
+        agentState.configuration = Configuration(pos, direction)
+        agentState.scaredTimer = scaredTimer
+    width, height = data.food.width, data.food.height
+    data.food = Grid(width, height)
+    for x in range(width):
+        column = data.food.data[x]
+        bits = food >> (x * height)
+        for y in range(height):
+            if bits & (1 << y): column[y] = True
+    data.capsules = list(capsules)
+    data.score = score
+    data._eaten = list(eaten)
+    data._win, data._lose = win, lose
+    return gameState
+
+# Set in each worker by initWorker
+_worker = {}
+
+def initWorker(agent, template, sharedAlpha):
+    _worker['agent'] = agent
+    _worker['template'] = template
+    _worker['alpha'] = sharedAlpha
+
+def searchRootAction(packed, action, alphaBeta):
+    """
+    Runs in a worker: the value of Pacman taking action in the packed state,
+    searched to the agent's depth.
+    """
+    agent, sharedAlpha = _worker['agent'], _worker['alpha']
+    gameState = unpackState(packed, _worker['template'])
+    agent.ghost_indexes = list(range(1, gameState.getNumAgents()))
+    succ = gameState.generateSuccessor(0, action)
+    if not alphaBeta:
+        if 'prepareSearch' in dir(agent): agent.prepareSearch(gameState)
+        return agent.minimax(succ, agent.depth, 1)[1]
+    agent.startSearch(agent.depth)
+    value = agent.minimax(succ, agent.depth, 1, sharedAlpha.value, float("inf"))[1]
+    with sharedAlpha.get_lock():
+        if value > sharedAlpha.value: sharedAlpha.value = value
+    return value
+
+class RootSplitter:
+    """
+    Searches the root moves of a MultiAgentSearchAgent in a pool of
+    processes.  The pool is started on the first move of a game and stopped by
+    close().
+    """
+    def __init__(self, agent, processes):
+        self.agent = agent
+        self.processes = processes
+        self.pool = None
+        self.forkable = 'fork' in multiprocessing.get_all_start_methods()
+
+    def getAction(self, gameState, alphaBeta=False):
+        """
+        Returns the action the agent's own search would choose in gameState,
+        with alpha-beta bounds if alphaBeta.  The agent must be ready to search
+        (ghost_indexes set, and startSearch called for alpha-beta).
+        """
+        agent = self.agent
+        actions = agent.rootMoves(gameState) if alphaBeta else gameState.getLegalActions(0)
+        if not self.forkable or len(actions) == 1:
+            return self._searchSerially(gameState, actions, alphaBeta)
+        if self.pool is None:
+            context = multiprocessing.get_context('fork')
+            self.sharedAlpha = context.Value('d', float("-inf"))
+            # Forked, so the agent and the state are inherited rather than pickled
+            self.pool = context.Pool(self.processes, initWorker, (agent, gameState, self.sharedAlpha))
+        packed = packState(gameState)
+        if alphaBeta:
+            # Young Brothers Wait: the eldest brother alone sets the first bound
+            eldest = agent.minimax(gameState.generateSuccessor(0, actions[0]), agent.depth, 1,
+                                   float("-inf"), float("inf"))[1]
+            self.sharedAlpha.value = eldest
+            values = [eldest] + self.pool.starmap(searchRootAction, [(packed, action, True) for action in actions[1:]])
+        else:
+            values = self.pool.starmap(searchRootAction, [(packed, action, False) for action in actions])
+        # The first of the best, as the single process search picks
+        return actions[values.index(max(values))]
+
+    def _searchSerially(self, gameState, actions, alphaBeta):
+        if alphaBeta:
+            return self.agent.minimax(gameState, self.agent.depth, 0, float("-inf"), float("inf"))[0]
+        return self.agent.minimax(gameState, self.agent.depth, 0)[0]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
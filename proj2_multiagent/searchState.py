@@ -0,0 +1,325 @@
+# searchState.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A mutable game position for depth first search.
+
+GameState.generateSuccessor copies the whole state for every move, and a
+search keeps those copies alive all the way up the recursion.  A SearchState
+is one position that moves are made on and taken back:
+
+state = SearchState(gameState)
+record = state.apply(agentIndex, action)
+...                      # search the successor
+state.undo(record)       # back to where it was
+
+apply follows PacmanRules and GhostRules in pacman.py exactly (food,
+capsules, scared timers, ghosts at half speed, deaths, eaten ghosts and the
+score), and the usual GameState accessors read the position, so search code
+and evaluation functions work on either.  Moves must be undone in the
+reverse order they were made.
+
+> python searchState.py
+
+plays random games on every kind of layout and checks each move, and each
+undo, against generateSuccessor.
+"""
+
+from game import Actions
+from game import AgentState
+from game import Configuration
+from game import Directions
+from game import Grid
+from util import nearestPoint
+import pacman
+
+class SearchState:
+    def __init__(self, gameState):
+        data = gameState.data
+        self.template = gameState
+        self.walls = data.layout.walls
+        self.starts = [agentState.start for agentState in data.agentStates]
+        self.positions = [agentState.configuration.pos for agentState in data.agentStates]
+        self.directions = [agentState.configuration.direction for agentState in data.agentStates]
+        self.scaredTimers = [agentState.scaredTimer for agentState in data.agentStates]
+        self.food = set(data.food.asList())
+        # The food as one integer with a bit per cell, for key()
+        self.foodBits = 0
+        for x, y in self.food:
+            self.foodBits |= 1 << (x * self.walls.height + y)
+        self.capsules = list(data.capsules)
+        self.score = data.score
+        self.win, self.lose = data._win, data._lose
+        self.cellActions = {} # cell -> Actions.getPossibleActions there
+
+    def apply(self, agentIndex, action):
+        """
+        Makes the move, which must be legal, in place and returns the record
+        that undo needs to take it back.
+        """
+        if self.win or self.lose:
+            raise Exception('Can\'t generate a successor of a terminal state.')
+        positions, timers = self.positions, self.scaredTimers
+        record = (agentIndex, positions[agentIndex], self.directions[agentIndex], timers[agentIndex],
+                  self.score, self.win, self.lose)
+        foodEaten = capsuleEaten = oldTimers = None
+        dx, dy = Actions._directions[action]
+
+        if agentIndex == 0:
+            speed = pacman.PacmanRules.PACMAN_SPEED
+            x, y = positions[0]
+            positions[0] = (x + dx * speed, y + dy * speed)
+            if action != Directions.STOP: self.directions[0] = action
+            # PacmanRules.consume
+            nearest = nearestPoint(positions[0])
+            if abs(nearest[0] - positions[0][0]) + abs(nearest[1] - positions[0][1]) <= 0.5:
+                if nearest in self.food:
+                    self.food.remove(nearest)
+                    self.foodBits ^= 1 << (nearest[0] * self.walls.height + nearest[1])
+                    self.score += 10
+                    foodEaten = nearest
+                    if not self.food and not self.lose:
+                        self.score += 500
+                        self.win = True
+                if nearest in self.capsules:
+                    capsuleEaten = (self.capsules.index(nearest), nearest)
+                    self.capsules.remove(nearest)
+                    oldTimers = timers[:]
+                    for index in range(1, len(timers)):
+                        timers[index] = pacman.SCARED_TIME
+            self.score -= pacman.TIME_PENALTY
+        else:
+            speed = pacman.GhostRules.GHOST_SPEED
+            if timers[agentIndex] > 0: speed /= 2.0
+            x, y = positions[agentIndex]
+            positions[agentIndex] = (x + dx * speed, y + dy * speed)
+            self.directions[agentIndex] = action
+            # GhostRules.decrementTimer
+            if timers[agentIndex] == 1:
+                positions[agentIndex] = nearestPoint(positions[agentIndex])
+            timers[agentIndex] = max(0, timers[agentIndex] - 1)
+
+        # GhostRules.checkDeath
+        eaten = None
+        px, py = positions[0]
+        for index in (range(1, len(positions)) if agentIndex == 0 else (agentIndex,)):
+            gx, gy = positions[index]
+            if abs(gx - px) + abs(gy - py) <= pacman.COLLISION_TOLERANCE:
+                if timers[index] > 0:
+                    if eaten is None: eaten = []
+                    eaten.append((index, positions[index], self.directions[index], timers[index]))
+                    self.score += 200
+                    start = self.starts[index]
+                    positions[index], self.directions[index] = start.pos, start.direction
+                    timers[index] = 0
+                elif not self.win:
+                    self.score -= 500
+                    self.lose = True
+        return record + (foodEaten, capsuleEaten, oldTimers, eaten)
+
+    def undo(self, record):
+        "Takes back the move apply returned record for."
+        agentIndex, position, direction, timer, score, win, lose, foodEaten, capsuleEaten, oldTimers, eaten = record
+        if eaten is not None:
+            for index, ghostPosition, ghostDirection, ghostTimer in reversed(eaten):
+                self.positions[index], self.directions[index] = ghostPosition, ghostDirection
+                self.scaredTimers[index] = ghostTimer
+        if oldTimers is not None:
+            self.scaredTimers[:] = oldTimers
+        if capsuleEaten is not None:
+            self.capsules.insert(*capsuleEaten)
+        if foodEaten is not None:
+            self.food.add(foodEaten)
+            self.foodBits ^= 1 << (foodEaten[0] * self.walls.height + foodEaten[1])
+        self.positions[agentIndex], self.directions[agentIndex] = position, direction
+        self.scaredTimers[agentIndex] = timer
+        self.score, self.win, self.lose = score, win, lose
+
+    def getLegalActions(self, agentIndex=0):
+        "The same actions, in the same order, as GameState.getLegalActions."
+        if self.win or self.lose:
+            return []
+        position, direction = self.positions[agentIndex], self.directions[agentIndex]
+        x, y = position
+        cell = (int(x + 0.5), int(y + 0.5))
+        if abs(x - cell[0]) + abs(y - cell[1]) > Actions.TOLERANCE:
+            # In between grid points, all agents must continue straight
+            possible = [direction]
+        else:
+            if cell not in self.cellActions:
+                self.cellActions[cell] = Actions.getPossibleActions(Configuration(cell, direction), self.walls)
+            possible = list(self.cellActions[cell])
+        if agentIndex == 0:
+            return possible
+        # GhostRules.getLegalActions
+        if Directions.STOP in possible:
+            possible.remove(Directions.STOP)
+        reverse = Actions.reverseDirection(direction)
+        if reverse in possible and len(possible) > 1:
+            possible.remove(reverse)
+        return possible
+
+    def getLegalPacmanActions(self):
+        return self.getLegalActions(0)
+
+    def key(self):
+        "A hash of the position, used by transpositionTable.stateHash for SearchStates."
+        return hash((tuple(self.positions), tuple(self.directions), tuple(self.scaredTimers), self.foodBits,
+                     tuple(self.capsules), self.score))
+
+    def getAgentState(self, agentIndex):
+        "A new AgentState (game.py) for the agent; changing it changes nothing here."
+        agentState = AgentState(self.starts[agentIndex], agentIndex == 0)
+        agentState.configuration = Configuration(self.positions[agentIndex], self.directions[agentIndex])
+        agentState.scaredTimer = self.scaredTimers[agentIndex]
+        return agentState
+
+    def getPacmanState(self):
+        return self.getAgentState(0)
+
+    def getPacmanPosition(self):
+        return self.positions[0]
+
+    def getGhostStates(self):
+        return [self.getAgentState(index) for index in range(1, len(self.positions))]
+
+    def getGhostState(self, agentIndex):
+        if agentIndex == 0 or agentIndex >= self.getNumAgents():
+            raise Exception("Invalid index passed to getGhostState")
+        return self.getAgentState(agentIndex)
+
+    def getGhostPosition(self, agentIndex):
+        if agentIndex == 0:
+            raise Exception("Pacman's index passed to getGhostPosition")
+        return self.positions[agentIndex]
+
+    def getGhostPositions(self):
+        return self.positions[1:]
+
+    def getNumAgents(self):
+        return len(self.positions)
+
+    def getScore(self):
+        return float(self.score)
+
+    def getCapsules(self):
+        return self.capsules
+
+    def getNumFood(self):
+        return len(self.food)
+
+    def getFood(self):
+        "A new Grid of the food; hasFood is quicker for single cells."
+        food = Grid(self.walls.width, self.walls.height)
+        for x, y in self.food:
+            food[x][y] = True
+        return food
+
+    def getWalls(self):
+        return self.walls
+
+    def hasFood(self, x, y):
+        return (x, y) in self.food
+
+    def hasWall(self, x, y):
+        return self.walls[x][y]
+
+    def isLose(self):
+        return self.lose
+
+    def isWin(self):
+        return self.win
+
+    def toGameState(self):
+        "A GameState of the current position."
+        gameState = self.template.__class__(self.template)
+        data = gameState.data
+        for index, agentState in enumerate(data.agentStates):
+            agentState.configuration = Configuration(self.positions[index], self.directions[index])
+            agentState.scaredTimer = self.scaredTimers[index]
+        data.food = self.getFood()
+        data.capsules = list(self.capsules)
+        data.score = self.score
+        data._win, data._lose = self.win, self.lose
+        return gameState
+
+def differences(searchState, gameState):
+    """
+    The parts of the position in which searchState and gameState differ, as a
+    list of names; empty if they are the same.
+    """
+    data = gameState.data
+    different = []
+    for index, agentState in enumerate(data.agentStates):
+        if searchState.positions[index] != agentState.configuration.pos: different.append('position %d' % index)
+        if searchState.directions[index] != agentState.configuration.direction:
+            different.append('direction %d' % index)
+        if searchState.scaredTimers[index] != agentState.scaredTimer: different.append('scared timer %d' % index)
+    if searchState.food != set(data.food.asList()): different.append('food')
+    if searchState.capsules != data.capsules: different.append('capsules')
+    if searchState.score != data.score: different.append('score')
+    if (searchState.win, searchState.lose) != (data._win, data._lose): different.append('win or lose')
+    for index in range(gameState.getNumAgents()):
+        if searchState.getLegalActions(index) != gameState.getLegalActions(index):
+            different.append('legal actions %d' % index)
+    return different
+
+def checkEquivalence(layoutNames, games=5, seed=0):
+    """
+    Plays games on each layout in which every agent moves at random, except
+    that Pacman eats adjacent food when he can (so that games are won too).  At
+    every turn each legal move is applied to a SearchState and compared with
+    generateSuccessor, then undone and compared with the state before.
+    Returns the number of moves checked; raises an Exception at the first
+    difference.
+    """
+    import layout
+    import random
+    rand = random.Random(seed)
+    checked = 0
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        for game in range(games):
+            gameState = pacman.GameState()
+            gameState.initialize(lay, len(lay.agentPositions) - 1)
+            state = SearchState(gameState)
+            index = 0
+            while not (gameState.isWin() or gameState.isLose()):
+                for action in gameState.getLegalActions(index):
+                    record = state.apply(index, action)
+                    different = differences(state, gameState.generateSuccessor(index, action))
+                    if different:
+                        raise Exception('%s, game %d: agent %d moving %s gives a different %s' %
+                                        (layoutName, game, index, action, ', '.join(different)))
+                    state.undo(record)
+                    different = differences(state, gameState)
+                    if different:
+                        raise Exception('%s, game %d: undoing agent %d moving %s gives a different %s' %
+                                        (layoutName, game, index, action, ', '.join(different)))
+                    checked += 1
+                actions = gameState.getLegalActions(index)
+                if index == 0:
+                    x, y = gameState.getPacmanPosition()
+                    eating = [action for action in actions
+                              if gameState.hasFood(*map(int, Actions.getSuccessor((x, y), action)))]
+                    actions = eating or actions
+                action = rand.choice(actions)
+                gameState = gameState.generateSuccessor(index, action)
+                state.apply(index, action)
+                index = (index + 1) % gameState.getNumAgents()
+    return checked
+
+if __name__ == '__main__':
+    layoutNames = ['testClassic', 'smallClassic', 'mediumClassic', 'trickyClassic', 'powerClassic', 'capsuleClassic']
+    print('%d moves checked against generateSuccessor' % checkEquivalence(layoutNames))
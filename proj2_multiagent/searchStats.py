@@ -0,0 +1,141 @@
+# searchStats.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Statistics of the searches of the agents in multiAgents.py.
+
+With stats=True, a MinimaxAgent, AlphaBetaAgent or ExpectimaxAgent records
+for every move
+
+  depth            the search depth (the deepest finished, with a budget)
+  expanded         nodes whose successors were searched
+  evaluated        leaves scored by the evaluation function
+  tableHits        nodes answered by the transposition table
+  branchingFactor  the effective branching factor: the b for which a tree
+                   of depth * agents plies, with b children per node, has as
+                   many nodes as were searched
+  nodesPerSecond   expanded and evaluated nodes per second
+  cutoffRate       the fraction of expanded nodes cut off by alpha-beta, and
+                   firstMoveCutoffRate the fraction of cutoffs at the first move
+  evalShare        the fraction of the time spent in the evaluation function
+
+and adds them up at the end of each game; pacman.py prints a summary of all
+games after its own.  With statsFile (which implies stats=True), every move
+and game is also written to that file as a line of JSON.
+
+> python pacman.py -p AlphaBetaAgent -l mediumClassic -n 5 -q -a depth=3,statsFile=stats.jsonl
+
+Searches in worker processes (see parallelSearch.py) are not counted.
+"""
+
+import json
+import time
+
+def effectiveBranchingFactor(nodes, plies):
+    """
+    The b for which 1 + b + b**2 + ... + b**plies == nodes, found by
+    bisection; 1 if there are too few nodes for a tree that deep.
+    """
+    if plies <= 0 or nodes <= plies + 1: return 1.0
+    treeSize = lambda b: sum([b ** i for i in range(plies + 1)])
+    low, high = 1.0, float(nodes) ** (1.0 / plies)
+    for i in range(50):
+        middle = (low + high) / 2
+        if treeSize(middle) < nodes:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+def ratio(numerator, denominator):
+    if denominator == 0: return 0.0
+    return numerator / float(denominator)
+
+class SearchStats:
+    def __init__(self, agentName, statsFile=None):
+        self.agentName = agentName
+        self.statsFile = statsFile
+        self.moves = [] # The records of this game's moves
+        self.games = [] # The records of finished games
+        self.startMove()
+
+    def startMove(self):
+        "Starts counting for a new move."
+        self.expanded = self.evaluated = self.tableHits = 0
+        self.cutoffs = self.firstMoveCutoffs = 0
+        self.evalSeconds = 0.0
+        self.starttime = time.time()
+
+    def cutoff(self, moveNumber):
+        "Counts a cutoff at the moveNumber-th move tried (from 0)."
+        self.cutoffs += 1
+        if moveNumber == 0: self.firstMoveCutoffs += 1
+
+    def endMove(self, action, depth, numAgents):
+        "Records the move that was just searched and returns its record."
+        seconds = time.time() - self.starttime
+        nodes = self.expanded + self.evaluated
+        record = {'type': 'move', 'agent': self.agentName, 'game': len(self.games) + 1,
+                  'move': len(self.moves) + 1, 'action': action, 'depth': depth,
+                  'expanded': self.expanded, 'evaluated': self.evaluated, 'tableHits': self.tableHits,
+                  'seconds': seconds, 'nodesPerSecond': ratio(nodes, seconds),
+                  'branchingFactor': effectiveBranchingFactor(nodes, depth * numAgents),
+                  'cutoffRate': ratio(self.cutoffs, self.expanded),
+                  'firstMoveCutoffRate': ratio(self.firstMoveCutoffs, self.cutoffs),
+                  'evalShare': ratio(self.evalSeconds, seconds), 'evalSeconds': self.evalSeconds,
+                  'cutoffs': self.cutoffs}
+        self.moves.append(record)
+        self.write(record)
+        return record
+
+    def endGame(self, state):
+        "Adds up the moves of the game that ended in state and returns the record."
+        moves = self.moves
+        seconds = sum([move['seconds'] for move in moves])
+        expanded = sum([move['expanded'] for move in moves])
+        nodes = expanded + sum([move['evaluated'] for move in moves])
+        cutoffs = sum([move['cutoffs'] for move in moves])
+        record = {'type': 'game', 'agent': self.agentName, 'game': len(self.games) + 1,
+                  'score': state.getScore(), 'win': state.isWin(), 'moves': len(moves),
+                  'depth': ratio(sum([move['depth'] for move in moves]), len(moves)),
+                  'nodes': nodes, 'nodesPerMove': ratio(nodes, len(moves)), 'seconds': seconds,
+                  'slowestMove': max([move['seconds'] for move in moves] or [0.0]),
+                  'nodesPerSecond': ratio(nodes, seconds),
+                  'branchingFactor': ratio(sum([move['branchingFactor'] for move in moves]), len(moves)),
+                  'cutoffRate': ratio(cutoffs, expanded),
+                  'firstMoveCutoffRate': ratio(sum([move['firstMoveCutoffRate'] * move['cutoffs'] for move in moves]),
+                                               cutoffs),
+                  'evalShare': ratio(sum([move['evalSeconds'] for move in moves]), seconds)}
+        self.games.append(record)
+        self.write(record)
+        self.moves = []
+        return record
+
+    def write(self, record):
+        if self.statsFile:
+            with open(self.statsFile, 'a') as sink:
+                sink.write(json.dumps(record) + '\n')
+
+    def summary(self):
+        "A table of every game's record, one line per game."
+        lines = ['Search statistics (%s):' % self.agentName,
+                 '%5s %6s %6s %10s %10s %9s %8s %8s %8s %8s' %
+                 ('game', 'moves', 'depth', 'nodes/move', 'nodes/sec', 'branching', 'cutoffs', '1st cut',
+                  'eval', 'slowest')]
+        for game in self.games:
+            lines.append('%5d %6d %6.1f %10.0f %10.0f %9.2f %7.1f%% %7.1f%% %7.1f%% %7.3fs' %
+                         (game['game'], game['moves'], game['depth'], game['nodesPerMove'],
+                          game['nodesPerSecond'], game['branchingFactor'], 100 * game['cutoffRate'],
+                          100 * game['firstMoveCutoffRate'], 100 * game['evalShare'], game['slowestMove']))
+        return '\n'.join(lines)
@@ -0,0 +1,113 @@
+# transpositionTable.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A transposition table for the adversarial search agents in multiAgents.py.
+
+The same position is often reached by different orders of moves, and again
+on the next call to getAction.  The table remembers the value the search
+found for a position, at a given remaining depth and agent to move, so it is
+only searched once.  With alpha-beta pruning a value may only be a bound:
+
+  EXACT  the value of the position
+  LOWER  the value is at least this (the search was cut off above beta)
+  UPPER  the value is at most this (no move reached alpha)
+
+along with the best move found, which is worth trying first next time.
+
+The table has a fixed number of slots.  A position goes in the slot its hash
+picks; when the slot is taken, the deeper search is kept, except that entries
+left over from an earlier getAction call (an older age) are always replaced.
+
+> python pacman.py -p AlphaBetaAgent -l mediumClassic -a depth=4,tableSize=65536
+"""
+
+import hashlib
+import searchState
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+def stateHash(gameState):
+    """
+    A hash of everything a search value depends on: every agent's position,
+    direction and scared timer, the food, the capsules and the score.  It is
+    much faster than hash(gameState), which loops over the food grid in
+    Python, and keeps all 64 bits.  A SearchState (see searchState.py) has its
+    own key.
+    """
+    if isinstance(gameState, searchState.SearchState): return gameState.key()
+    data = gameState.data
+    agents = tuple([(agent.configuration.pos, agent.configuration.direction, agent.scaredTimer)
+                    for agent in data.agentStates])
+    return hash((agents, tuple(map(tuple, data.food.data)), tuple(data.capsules), data.score))
+
+def stableHash(gameState):
+    """
+    The position stateHash covers, digested with hashlib so that it is the
+    same in every run: hash() of the direction strings changes with
+    PYTHONHASHSEED.  It is too slow for table lookups; use it for seeds.
+    """
+    data = gameState.data
+    agents = tuple([(agent.configuration.pos, agent.configuration.direction, agent.scaredTimer)
+                    for agent in data.agentStates])
+    position = (agents, tuple(map(tuple, data.food.data)), tuple(data.capsules), data.score)
+    return int.from_bytes(hashlib.sha256(repr(position).encode()).digest()[:8], 'big')
+
+class TranspositionTable:
+    def __init__(self, size=65536):
+        """
+        A table of size slots, rounded up to a power of two.
+        """
+        self.size = 1
+        while self.size < size: self.size *= 2
+        self.mask = self.size - 1
+        self.slots = [None] * self.size
+        self.age = 0
+        self.probes = self.hits = self.stores = 0
+
+    def newSearch(self):
+        "Starts a new search; entries from earlier searches become replaceable."
+        self.age += 1
+
+    def lookup(self, key, depth, index):
+        """
+        Returns (value, flag, action) stored for the state with hash key at
+        this remaining depth with agent index to move, or None.
+        """
+        self.probes += 1
+        i = hash((key, depth, index)) & self.mask
+        entry = self.slots[i]
+        if entry is None or entry[0] != key or entry[1] != depth or entry[2] != index:
+            return None
+        self.hits += 1
+        if entry[6] != self.age:
+            # Still useful, so it should not be the first to go
+            self.slots[i] = entry[:6] + (self.age,)
+        return entry[3], entry[4], entry[5]
+
+    def store(self, key, depth, index, value, flag, action):
+        i = hash((key, depth, index)) & self.mask
+        entry = self.slots[i]
+        if entry is None or entry[6] != self.age or depth >= entry[1] or \
+                (entry[0] == key and entry[1] == depth and entry[2] == index):
+            self.slots[i] = (key, depth, index, value, flag, action, self.age)
+            self.stores += 1
+
+    def hitRate(self):
+        "The fraction of lookups that found an entry."
+        if self.probes == 0: return 0.0
+        return self.hits / float(self.probes)
+
+    def __len__(self):
+        return len([entry for entry in self.slots if entry is not None])
@@ -16,6 +16,7 @@
 
 from game import Directions, Actions
 import util
+import nearestTarget
 
 class FeatureExtractor:
     def getFeatures(self, state, action):
@@ -70,8 +71,27 @@ class SimpleExtractor(FeatureExtractor):
     - how far away the next food is
     - whether a ghost collision is imminent
     - whether a ghost is one step away
+
+    The distance to the next food comes from a NearestTargetFinder that the
+    extractor keeps for the food grid it last saw, so asking again for each
+    legal action is a lookup, and a grid with a few dots eaten only repairs
+    the finder's distance field.
     """
 
+    def __init__(self):
+        self.foodFinder = None
+        self.foodGrid = None
+
+    def closestFood(self, pos, food, walls):
+        "closestFood(pos, food, walls), answered by the extractor's finder."
+        if self.foodFinder is None or self.foodFinder.walls is not walls:
+            self.foodFinder = nearestTarget.NearestTargetFinder(walls, food.asList(), cacheDistances=True)
+        elif food is not self.foodGrid:
+            self.foodFinder.setTargets(food.asList())
+        self.foodGrid = food
+        # returns None if no food can be reached
+        return self.foodFinder.getDistance((int(pos[0]), int(pos[1])))
+
     def getFeatures(self, state, action):
         # extract the grid of food and wall locations and get the ghost locations
         food = state.getFood()
@@ -94,7 +114,7 @@ class SimpleExtractor(FeatureExtractor):
         if not features["#-of-ghosts-1-step-away"] and food[next_x][next_y]:
             features["eats-food"] = 1.0
 
-        dist = closestFood((next_x, next_y), food, walls)
+        dist = self.closestFood((next_x, next_y), food, walls)
         if dist is not None:
             # make the distance a number less than one otherwise the update
             # will diverge wildly
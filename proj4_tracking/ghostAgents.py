@@ -34,9 +34,86 @@ class GhostAgent( Agent ):
         "Returns a Counter encoding a distribution over actions from the provided state."
         util.raiseNotDefined()
 
+    def getActionDistribution( self, state ):
+        """
+        The distribution of getDistribution as a tuple of (action, probability)
+        pairs, which callers must not change.
+        """
+        return tuple( self.getDistribution( state ).items() )
+
+class DistributionTable:
+    """
+    The action distributions of ghosts, worked out once for each maze.
+
+    A ghost's legal actions follow from its position and heading, so the
+    distribution of a ghost that defines distributionKey depends only on that
+    key (its position, heading and whatever else it looks at, e.g. Pacman's
+    position).  computeDistribution is called the first time a key is seen and
+    the result kept as a tuple of (action, probability) pairs.  A particle
+    filter asks for it once for every particle at a position; after the first,
+    the table answers.
+    """
+    def __init__( self, size=1 << 18 ):
+        self.size = size
+        self.walls = None
+        self.entries = {}
+        self.lookups = self.hits = 0
+
+    def lookup( self, agent, state ):
+        "agent.getActionDistribution(state)."
+        return self.lookupAll( [agent], state )[0]
+
+    def lookupAll( self, agents, state ):
+        """
+        The getActionDistribution of each of agents in state, e.g. of all the
+        ghosts at once; the maze and the end of the game are checked once.
+        """
+        if state.isWin() or state.isLose():
+            return [()] * len( agents )
+        walls = state.getWalls()
+        if walls is not self.walls:
+            self.walls = walls
+            self.entries = {}
+        entries = self.entries
+        distributions = []
+        for agent in agents:
+            distributionKey = getattr( agent, 'distributionKey', None )
+            if distributionKey is None:
+                distributions.append( agent.getActionDistribution( state ) )
+                continue
+            self.lookups += 1
+            key = ( agent.__class__, distributionKey( state ) )
+            distribution = entries.get( key )
+            if distribution is None:
+                distribution = tuple( agent.computeDistribution( state ).items() )
+                if len( entries ) >= self.size: entries.clear()
+                entries[key] = distribution
+            else:
+                self.hits += 1
+            distributions.append( distribution )
+        return distributions
+
+    def hitRate( self ):
+        "The fraction of lookups that found the distribution in the table."
+        if self.lookups == 0: return 0.0
+        return self.hits / float( self.lookups )
+
+# The table RandomGhost and DirectionalGhost use
+distributionTable = DistributionTable()
+
 class RandomGhost( GhostAgent ):
     "A ghost that chooses a legal action uniformly at random."
     def getDistribution( self, state ):
+        return util.Counter( self.getActionDistribution( state ) )
+
+    def getActionDistribution( self, state ):
+        return distributionTable.lookup( self, state )
+
+    def distributionKey( self, state ):
+        configuration = state.getGhostState( self.index ).configuration
+        return configuration.pos, configuration.direction
+
+    def computeDistribution( self, state ):
         dist = util.Counter()
         for a in state.getLegalActions( self.index ): dist[a] = 1.0
         dist.normalize()
@@ -50,6 +127,18 @@ class DirectionalGhost( GhostAgent ):
         self.prob_scaredFlee = prob_scaredFlee
 
     def getDistribution( self, state ):
+        return util.Counter( self.getActionDistribution( state ) )
+
+    def getActionDistribution( self, state ):
+        return distributionTable.lookup( self, state )
+
+    def distributionKey( self, state ):
+        ghostState = state.getGhostState( self.index )
+        configuration = ghostState.configuration
+        return ( configuration.pos, configuration.direction, ghostState.scaredTimer > 0,
+                 state.getPacmanPosition(), self.prob_attack, self.prob_scaredFlee )
+
+    def computeDistribution( self, state ):
         # Read variables from state
         ghostState = state.getGhostState( self.index )
         legalActions = state.getLegalActions( self.index )